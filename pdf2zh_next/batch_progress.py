@@ -0,0 +1,98 @@
+from collections.abc import Callable
+from pathlib import Path
+
+from rich.progress import BarColumn
+from rich.progress import Progress
+from rich.progress import TaskProgressColumn
+from rich.progress import TextColumn
+from rich.progress import TimeElapsedColumn
+from rich.progress import TimeRemainingColumn
+
+# Longest file name shown in a progress row
+MAX_NAME_LENGTH = 40
+
+
+def _short_name(file: str | Path) -> str:
+    name = Path(file).name
+    if len(name) > MAX_NAME_LENGTH:
+        return name[: MAX_NAME_LENGTH - 1] + "…"
+    return name
+
+
+class BatchProgress:
+    """
+    Rich progress view of files translated concurrently: a row per file with its
+    current stage, and a row for all files.
+
+    Use it as a context manager and feed the events of every file to the handler
+    returned by ``handler(file)``.
+    """
+
+    def __init__(self, files: list[str | Path]):
+        self.progress = Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            TimeElapsedColumn(),
+            TimeRemainingColumn(),
+        )
+        self.file_count = len(files)
+        self.finished_count = 0
+        self.failed_count = 0
+        self.file_progress: dict[str, float] = {str(file): 0.0 for file in files}
+        self.total_task = self.progress.add_task(
+            self._total_description(), total=100 * max(1, self.file_count)
+        )
+        self.file_tasks = {
+            str(file): self.progress.add_task(
+                f"{_short_name(file)}: waiting", total=100
+            )
+            for file in files
+        }
+
+    def __enter__(self):
+        self.progress.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.progress.stop()
+
+    def _total_description(self) -> str:
+        description = f"All files ({self.finished_count}/{self.file_count})"
+        if self.failed_count:
+            description += f", {self.failed_count} failed"
+        return description
+
+    def _update_file(self, file: str, completed: float, status: str):
+        self.file_progress[file] = completed
+        self.progress.update(
+            self.file_tasks[file],
+            completed=completed,
+            description=f"{_short_name(file)}: {status}",
+        )
+        self.progress.update(
+            self.total_task,
+            completed=sum(self.file_progress.values()),
+            description=self._total_description(),
+        )
+
+    def handler(self, file: str | Path) -> Callable[[dict], None]:
+        """Progress event handler of one file."""
+        file = str(file)
+
+        def progress_handler(event: dict):
+            if event["type"] in ("progress_start", "progress_update", "progress_end"):
+                self._update_file(
+                    file,
+                    event.get("overall_progress", self.file_progress[file]),
+                    event.get("stage", ""),
+                )
+            elif event["type"] == "finish":
+                self.finished_count += 1
+                self._update_file(file, 100, "done")
+            elif event["type"] == "error":
+                self.finished_count += 1
+                self.failed_count += 1
+                self._update_file(file, 100, "failed")
+
+        return progress_handler
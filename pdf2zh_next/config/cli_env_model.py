@@ -76,10 +76,16 @@ __cli_env_settings_model_fields = {
             default_factory=v.default_factory,
             alias=v.alias,
             discriminator=v.discriminator,
+            json_schema_extra=v.json_schema_extra,
         ),
     )
     for k, v in SettingsModel.model_fields.items()
-    if k not in ("translate_engine_settings", "term_extraction_engine_settings")
+    if k
+    not in (
+        "translate_engine_settings",
+        "term_extraction_engine_settings",
+        "failover_engine_settings",
+    )
 }
 __cli_env_settings_model_fields.update(__translation_flag_fields)
 
@@ -124,10 +130,31 @@ def to_settings_model(self) -> SettingsModel:
                 )
             break
 
+    # Failover engines, referenced by name and configured by their detail settings
+    failover_engine_settings = []
+    if self.translation.failover_engines:
+        metadata_map = {x.cli_flag_name: x for x in TRANSLATION_ENGINE_METADATA}
+        for engine_name in self.translation.failover_engines.split(","):
+            engine_name = engine_name.strip().lower()
+            if not engine_name:
+                continue
+            metadata = metadata_map.get(engine_name)
+            if metadata is None:
+                raise ValueError(f"Unknown failover translation engine: {engine_name}")
+            if metadata.cli_detail_field_name:
+                failover_engine_settings.append(
+                    metadata.setting_model_type(
+                        **getattr(self, metadata.cli_detail_field_name).model_dump()
+                    )
+                )
+            else:
+                failover_engine_settings.append(metadata.setting_model_type())
+
     return SettingsModel(
         **self.model_dump(exclude=__exclude_fields),
         translate_engine_settings=translate_engine_settings,
         term_extraction_engine_settings=term_extraction_engine_settings,
+        failover_engine_settings=failover_engine_settings,
     )
 
 
@@ -16,6 +16,25 @@ from pdf2zh_next.config.translate_engine_model import TRANSLATION_ENGINE_SETTING
 
 log = logging.getLogger(__name__)
 
+PLACEHOLDER_SCHEMES = ("standard", "compact")
+
+# json_schema_extra of settings that do not change how a translator is built,
+# of settings that do not change the outputs of a translation, and of both
+NOT_TRANSLATOR = {"builds_translator": False}
+NOT_OUTPUT = {"changes_output": False}
+JOB_ONLY = NOT_TRANSLATOR | NOT_OUTPUT
+
+
+def get_fields_without(model: type[BaseModel], marker: str) -> frozenset[str]:
+    """Names of the fields of model whose json_schema_extra sets marker to False."""
+    return frozenset(
+        name
+        for name, field in model.model_fields.items()
+        if isinstance(field.json_schema_extra, dict)
+        and field.json_schema_extra.get(marker) is False
+    )
+
+
 # Very Important!
 # Only the following fields can be used for Field:
 # default
@@ -23,6 +42,7 @@ log = logging.getLogger(__name__)
 # default_factory
 # alias
 # discriminator
+# json_schema_extra
 #
 # If you want to use other fields, please go to `pdf2zh_next/config/cli_env_model.py`
 # and add the corresponding forwarding statement at `__cli_env_settings_model_fields`!
@@ -56,6 +76,18 @@ class BasicSettings(BaseModel):
         description="Restore offline assets package from the specified file",
     )
     version: bool = Field(default=False, description="Show version then exit")
+    estimate: bool = Field(
+        default=False,
+        description="Report the segments, tokens, expected cache hit rate and duration of the translation of the input files as a table and as JSON, without translating them",
+    )
+    parallel_files: int = Field(
+        default=1,
+        description="Number of input files translated at the same time. The files share the QPS limit of each translation service",
+    )
+    progress_interval: float = Field(
+        default=0.1,
+        description="Seconds during which progress updates of a stage are coalesced before they leave the translation process, 0 sends every update",
+    )
 
 
 class GUISettings(BaseModel):
@@ -84,19 +116,32 @@ class TranslationSettings(BaseModel):
     """Translation related settings"""
 
     min_text_length: int = Field(
-        default=5, description="Minimum text length to translate"
+        default=5,
+        description="Minimum text length to translate",
+        json_schema_extra=NOT_TRANSLATOR,
     )
     rpc_doclayout: str | None = Field(
         default=None,
         description="RPC service host address for document layout analysis",
+        json_schema_extra=JOB_ONLY,
     )
     lang_in: str = Field(default="en", description="Source language code")
     lang_out: str = Field(default="zh", description="Target language code")
     output: str | None = Field(
-        default=None, description="Output directory for translated files"
+        default=None,
+        description="Output directory for translated files",
+        json_schema_extra=JOB_ONLY,
+    )
+    qps: int = Field(
+        default=4,
+        description="QPS limit for translation service",
+        json_schema_extra=NOT_OUTPUT,
+    )
+    ignore_cache: bool = Field(
+        default=False,
+        description="Ignore translation cache",
+        json_schema_extra=NOT_OUTPUT,
     )
-    qps: int = Field(default=4, description="QPS limit for translation service")
-    ignore_cache: bool = Field(default=False, description="Ignore translation cache")
     custom_system_prompt: str | None = Field(
         default=None,
         description='Custom system prompt for translation. It is mainly used to add the `/no_think` instruction of Qwen 3 in the prompt. e.g. --custom-system-prompt "/no_think You are a professional, authentic machine translation engine."',
@@ -104,29 +149,118 @@ class TranslationSettings(BaseModel):
     glossaries: str | None = Field(
         default=None,
         description="Glossary file list.",
+        json_schema_extra=NOT_TRANSLATOR,
     )
     save_auto_extracted_glossary: bool = Field(
-        default=False, description="save automatically extracted glossary"
+        default=False,
+        description="save automatically extracted glossary",
+        json_schema_extra=NOT_TRANSLATOR,
     )
     pool_max_workers: int | None = Field(
         default=None,
         description="Maximum number of workers for translation pool. If not set, will use qps as the number of workers",
+        json_schema_extra=NOT_OUTPUT,
     )
     term_qps: int | None = Field(
         default=None,
         description="QPS limit for term extraction translation service. If not set, will follow qps.",
+        json_schema_extra=NOT_OUTPUT,
     )
     term_pool_max_workers: int | None = Field(
         default=None,
         description="Maximum number of workers for term extraction translation pool. If not set or 0, will follow pool_max_workers.",
+        json_schema_extra=NOT_OUTPUT,
     )
     no_auto_extract_glossary: bool = Field(
         default=False,
         description="Disable auto extract glossary",
+        json_schema_extra=NOT_TRANSLATOR,
     )
     primary_font_family: str | None = Field(
         default=None,
         description="Override primary font family for translated text. Choices: 'serif' for serif fonts, 'sans-serif' for sans-serif fonts, 'script' for script/italic fonts. If not specified, uses automatic font selection based on original text properties.",
+        json_schema_extra=NOT_TRANSLATOR,
+    )
+    max_retry_attempts: int | None = Field(
+        default=None,
+        description="Maximum attempts per translation request, including the first one. If not set, will use the default of the translation engine.",
+        json_schema_extra=NOT_OUTPUT,
+    )
+    circuit_breaker_threshold: int | None = Field(
+        default=None,
+        description="Number of consecutive failed requests after which the translation service is considered unavailable and the translation is aborted, unless a failover engine is available. If not set, will use the default of the translation engine.",
+        json_schema_extra=NOT_OUTPUT,
+    )
+    circuit_breaker_cooldown: int | None = Field(
+        default=None,
+        description="Seconds to reject requests to an unavailable translation service before probing it again. If not set, will use the default of the translation engine.",
+        json_schema_extra=NOT_OUTPUT,
+    )
+    retry_budget_ratio: float = Field(
+        default=0.2,
+        description="Maximum ratio of retries to successful requests, shared by all translators of a process",
+        json_schema_extra=NOT_OUTPUT,
+    )
+    hedge_requests: bool = Field(
+        default=False,
+        description="Send a duplicate request when a translation request takes longer than the observed p95 latency, and use the first result. The duplicate goes to the first failover engine if one is configured, otherwise to the same engine.",
+        json_schema_extra=NOT_OUTPUT,
+    )
+    failover_engines: str | None = Field(
+        default=None,
+        description="Comma separated translation engines to continue with when the translation service is unavailable, e.g. 'deepseek,siliconflowfree'. The engines use the same detailed settings as when selected directly, e.g. --deepseek-api-key.",
+    )
+    translator_pool_ttl: int = Field(
+        default=600,
+        description="Seconds an idle translator is kept for reuse by later translations in the same process, 0 to disable reuse",
+        json_schema_extra=JOB_ONLY,
+    )
+    health_check_ttl: int = Field(
+        default=3600,
+        description="Seconds a successful health check of a translation engine is remembered, also across processes. 0 to check on every translation",
+        json_schema_extra=JOB_ONLY,
+    )
+    lazy_health_check: bool = Field(
+        default=False,
+        description="Skip the health check when creating a translator, the first translation request validates the engine instead",
+        json_schema_extra=JOB_ONLY,
+    )
+    placeholder_scheme: str | None = Field(
+        default=None,
+        description="Placeholders of formulas and rich text sent to the engine: 'standard' ({v1}, <style id='1'>...</style>) or 'compact' ({1}, <b1>...</b1>). Defaults to the engine's scheme",
+    )
+    prompt_cache_layout: bool = Field(
+        default=False,
+        description="Send the instructions, glossary and custom system prompt as a system message identical for every segment, so that providers can cache the prompt prefix",
+    )
+    worker_processes: int = Field(
+        default=1,
+        description="Number of idle translation subprocesses kept warm for later translations, so that they do not load models and translators again. 0 to start a new subprocess for every file",
+        json_schema_extra=JOB_ONLY,
+    )
+    worker_max_tasks: int = Field(
+        default=20,
+        description="Number of files a translation subprocess translates before it is replaced, to free the memory it accumulated. 0 for no limit",
+        json_schema_extra=JOB_ONLY,
+    )
+    memory_limit: int = Field(
+        default=0,
+        description="Maximum memory in MB a translation subprocess may use. Near the limit the document is translated again in smaller parts, above it the translation fails. 0 for no limit",
+        json_schema_extra=JOB_ONLY,
+    )
+    no_skip_untranslatable_segments: bool = Field(
+        default=False,
+        description="Send every segment to the translation engine, including numbers, URLs, code, placeholders and text already in the target language",
+    )
+    no_result_cache: bool = Field(
+        default=False,
+        description="Translate documents again instead of reusing the outputs of an identical document translated with the same settings",
+        json_schema_extra=JOB_ONLY,
+    )
+    result_cache_max_size: int = Field(
+        default=1024,
+        description="Maximum size in MB of the outputs kept for reuse, the least recently used outputs are removed first. 0 to keep no outputs",
+        json_schema_extra=JOB_ONLY,
     )
 
 
@@ -174,6 +308,15 @@ class PDFSettings(BaseModel):
     max_pages_per_part: int | None = Field(
         default=None, description="Maximum pages per part for split translation"
     )
+    parallel_parts: int = Field(
+        default=1,
+        description="Split each document into up to this many parts translated at the same time in separate worker processes, then merge the outputs in page order",
+    )
+    incremental: bool = Field(
+        default=False,
+        description="Translate only the pages whose content changed since an earlier translation with the same settings, e.g. of a revised paper, and reuse the translated pages of that translation for the others",
+        json_schema_extra=NOT_OUTPUT,
+    )
     translate_table_text: bool = Field(
         default=True, description="Translate table text (experimental)"
     )
@@ -235,6 +378,10 @@ class SettingsModel(BaseModel):
         description="Term extraction translation engine settings",
         discriminator="translate_engine_type",
     )
+    failover_engine_settings: list[TRANSLATION_ENGINE_SETTING_TYPE] = Field(
+        default_factory=list,
+        description="Failover translation engine settings, in order of preference",
+    )
 
     def clone(self) -> SettingsModel:
         return self.model_copy(deep=True)
@@ -287,6 +434,34 @@ class SettingsModel(BaseModel):
         main_engine_type = self.translate_engine_settings.translate_engine_type
         main_metadata = TRANSLATION_ENGINE_METADATA_MAP.get(main_engine_type)
 
+        # Validate and transform failover engines
+        failover_engine_settings = []
+        for failover_settings in self.failover_engine_settings:
+            failover_engine_type = failover_settings.translate_engine_type
+            failover_metadata = TRANSLATION_ENGINE_METADATA_MAP.get(
+                failover_engine_type
+            )
+            if (
+                main_metadata
+                and main_metadata.support_llm
+                and not (failover_metadata and failover_metadata.support_llm)
+            ):
+                raise ValueError(
+                    f"Failover engine {failover_engine_type} must support LLM "
+                    f"because the translation engine {main_engine_type} does"
+                )
+            failover_settings.validate_settings()
+            if hasattr(failover_settings, "transform"):
+                failover_settings = failover_settings.transform()
+                failover_settings.validate_settings()
+            if failover_settings == self.translate_engine_settings:
+                log.warning(
+                    f"Failover engine {failover_engine_type} is the same as the translation engine, ignored"
+                )
+                continue
+            failover_engine_settings.append(failover_settings)
+        self.failover_engine_settings = failover_engine_settings
+
         if self.term_extraction_engine_settings is not None:
             term_engine_type = (
                 self.term_extraction_engine_settings.translate_engine_type
@@ -355,6 +530,12 @@ class SettingsModel(BaseModel):
         if self.pdf.max_pages_per_part and self.pdf.max_pages_per_part < 0:
             raise ValueError("max_pages_per_part must be greater than 0")
 
+        if self.pdf.parallel_parts < 1:
+            raise ValueError("parallel_parts must be greater than or equal to 1")
+
+        if self.pdf.incremental and self.pdf.pages:
+            raise ValueError("incremental cannot be used together with pages")
+
         # Validate and store watermark mode
         watermark_output_mode_maps = {
             "nowatermark": "no_watermark",
@@ -386,6 +567,58 @@ class SettingsModel(BaseModel):
         ):
             raise ValueError("term_pool_max_workers must be greater than or equal to 0")
 
+        if (
+            self.translation.max_retry_attempts is not None
+            and self.translation.max_retry_attempts < 1
+        ):
+            raise ValueError("max_retry_attempts must be greater than 0")
+
+        if (
+            self.translation.circuit_breaker_threshold is not None
+            and self.translation.circuit_breaker_threshold < 1
+        ):
+            raise ValueError("circuit_breaker_threshold must be greater than 0")
+
+        if (
+            self.translation.circuit_breaker_cooldown is not None
+            and self.translation.circuit_breaker_cooldown < 0
+        ):
+            raise ValueError(
+                "circuit_breaker_cooldown must be greater than or equal to 0"
+            )
+
+        if self.translation.retry_budget_ratio < 0:
+            raise ValueError("retry_budget_ratio must be greater than or equal to 0")
+
+        if self.translation.placeholder_scheme not in (None, *PLACEHOLDER_SCHEMES):
+            raise ValueError(
+                f"placeholder_scheme must be one of {', '.join(PLACEHOLDER_SCHEMES)}"
+            )
+
+        if self.translation.translator_pool_ttl < 0:
+            raise ValueError("translator_pool_ttl must be greater than or equal to 0")
+
+        if self.translation.health_check_ttl < 0:
+            raise ValueError("health_check_ttl must be greater than or equal to 0")
+
+        if self.basic.parallel_files < 1:
+            raise ValueError("parallel_files must be greater than or equal to 1")
+
+        if self.basic.progress_interval < 0:
+            raise ValueError("progress_interval must be greater than or equal to 0")
+
+        if self.translation.worker_processes < 0:
+            raise ValueError("worker_processes must be greater than or equal to 0")
+
+        if self.translation.worker_max_tasks < 0:
+            raise ValueError("worker_max_tasks must be greater than or equal to 0")
+
+        if self.translation.memory_limit < 0:
+            raise ValueError("memory_limit must be greater than or equal to 0")
+
+        if self.translation.result_cache_max_size < 0:
+            raise ValueError("result_cache_max_size must be greater than or equal to 0")
+
         if self.translation.min_text_length < 0:
             raise ValueError("min_text_length must be greater than or equal to 0")
 
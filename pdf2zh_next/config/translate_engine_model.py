@@ -36,6 +36,41 @@ def _clean_url(value: str | None) -> str | None:
     return cleaned.rstrip("/")
 
 
+def split_list(value: str | None) -> list[str]:
+    """Split a comma separated setting into its non-empty items"""
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _clean_url_list(value: str | None) -> str | None:
+    """Clean a comma separated list of URLs for OpenAI-compatible services"""
+    if value is None:
+        return None
+    return ",".join(_clean_url(url) for url in split_list(value)) or None
+
+
+def _check_key_url_weights(
+    api_keys: str | None, base_urls: str | None, weights: str | None
+) -> str | None:
+    """Check that comma separated API keys, base URLs and weights can be paired"""
+    key_count = len(split_list(api_keys))
+    url_count = len(split_list(base_urls))
+    if key_count > 1 and url_count > 1 and key_count != url_count:
+        raise ValueError(
+            "The number of API keys and base URLs must match when both are lists"
+        )
+    weights = _clean_string(weights)
+    if not weights:
+        return None
+    weight_list = split_list(weights)
+    if len(weight_list) != max(key_count, url_count, 1):
+        raise ValueError("The number of weights must match the number of API keys")
+    for weight in weight_list:
+        _check_if_positive_float(weight, field="Weight")
+    return weights
+
+
 def _check_if_positive_float(value: str | None, field: str = "Value") -> str | None:
     """Check if a string can be parsed as a positive float"""
     if value is None:
@@ -79,10 +114,12 @@ class OpenAISettings(BaseModel):
 
     openai_model: str = Field(default="gpt-4o-mini", description="OpenAI model to use")
     openai_base_url: str | None = Field(
-        default=None, description="Base URL for OpenAI API"
+        default=None,
+        description="Base URL for OpenAI API, comma separated to spread requests across several endpoints",
     )
     openai_api_key: str | None = Field(
-        default=None, description="API key for OpenAI service"
+        default=None,
+        description="API key for OpenAI service, comma separated to spread requests across several keys",
     )
     openai_timeout: str | None = Field(
         default=None, description="Timeout (seconds) for OpenAI service"
@@ -106,12 +143,19 @@ class OpenAISettings(BaseModel):
     openai_send_reasoning_effort: bool | None = Field(
         default=None, description="Send reasoning effort to OpenAI service"
     )
+    openai_weights: str | None = Field(
+        default=None,
+        description="Comma separated weights of the API keys (or base URLs) when several are given, e.g. '2,1'",
+    )
 
     def validate_settings(self) -> None:
         if not self.openai_api_key:
             raise ValueError("OpenAI API key is required")
         self.openai_api_key = _clean_string(self.openai_api_key)
-        self.openai_base_url = _clean_url(self.openai_base_url)
+        self.openai_base_url = _clean_url_list(self.openai_base_url)
+        self.openai_weights = _check_key_url_weights(
+            self.openai_api_key, self.openai_base_url, self.openai_weights
+        )
         self.openai_model = _clean_string(self.openai_model)
         self.openai_timeout = _check_if_positive_float(
             _clean_string(self.openai_timeout),
@@ -230,10 +274,20 @@ class OllamaSettings(BaseModel):
     num_predict: int | None = Field(
         default=2000, description="The max number of token to predict."
     )
+    ollama_keep_alive: str | None = Field(
+        default="30m",
+        description="How long Ollama keeps the model loaded after a request, e.g. 30m, or -1 to keep it loaded",
+    )
+    ollama_num_parallel: int | None = Field(
+        default=None,
+        description="Number of requests the Ollama server handles in parallel (its OLLAMA_NUM_PARALLEL). Defaults to the OLLAMA_NUM_PARALLEL environment variable",
+    )
 
     def validate_settings(self) -> None:
         if not self.ollama_host:
             raise ValueError("Ollama host is required")
+        if self.ollama_num_parallel is not None and self.ollama_num_parallel < 1:
+            raise ValueError("Ollama num parallel must be at least 1")
         self.ollama_host = _clean_string(self.ollama_host)
         self.ollama_model = _clean_string(self.ollama_model)
 
@@ -666,10 +720,12 @@ class OpenAICompatibleSettings(BaseModel):
         default="gpt-4o-mini", description="OpenAI Compatible model to use"
     )
     openai_compatible_base_url: str | None = Field(
-        default=None, description="Base URL for OpenAI Compatible service"
+        default=None,
+        description="Base URL for OpenAI Compatible service, comma separated to spread requests across several endpoints",
     )
     openai_compatible_api_key: str | None = Field(
-        default=None, description="API key for OpenAI Compatible service"
+        default=None,
+        description="API key for OpenAI Compatible service, comma separated to spread requests across several keys",
     )
     openai_compatible_timeout: str | None = Field(
         default=None, description="Timeout (seconds) for OpenAI Compatible service"
@@ -690,6 +746,10 @@ class OpenAICompatibleSettings(BaseModel):
     openai_compatible_enable_json_mode: bool | None = Field(
         default=None, description="Enable JSON mode for OpenAI Compatible service"
     )
+    openai_compatible_weights: str | None = Field(
+        default=None,
+        description="Comma separated weights of the API keys (or base URLs) when several are given, e.g. '2,1'",
+    )
 
     def validate_settings(self) -> None:
         if not self.openai_compatible_api_key:
@@ -699,7 +759,14 @@ class OpenAICompatibleSettings(BaseModel):
         if not self.openai_compatible_model:
             raise ValueError("OpenAI Compatible model is required")
         self.openai_compatible_api_key = _clean_string(self.openai_compatible_api_key)
-        self.openai_compatible_base_url = _clean_url(self.openai_compatible_base_url)
+        self.openai_compatible_base_url = _clean_url_list(
+            self.openai_compatible_base_url
+        )
+        self.openai_compatible_weights = _check_key_url_weights(
+            self.openai_compatible_api_key,
+            self.openai_compatible_base_url,
+            self.openai_compatible_weights,
+        )
         self.openai_compatible_model = _clean_string(self.openai_compatible_model)
         self.openai_compatible_timeout = _check_if_positive_float(
             _clean_string(self.openai_compatible_timeout), field="Timeout"
@@ -738,6 +805,7 @@ class OpenAICompatibleSettings(BaseModel):
             openai_send_temprature=self.openai_compatible_send_temperature,
             openai_send_reasoning_effort=self.openai_compatible_send_reasoning_effort,
             openai_enable_json_mode=self.openai_compatible_enable_json_mode,
+            openai_weights=self.openai_compatible_weights,
         )
 
 
@@ -827,10 +895,16 @@ class ClaudeCodeSettings(BaseModel):
     claude_code_model: str = Field(
         default="sonnet", description="Claude Code model to use"
     )
+    claude_code_max_processes: int = Field(
+        default=4,
+        description="Number of long-lived Claude Code CLI processes serving translations",
+    )
 
     def validate_settings(self):
         if not self.claude_code_path:
             raise ValueError("Claude Code path is required")
+        if self.claude_code_max_processes < 1:
+            raise ValueError("Claude Code max processes must be at least 1")
 
 
 ## Please add the translator configuration class above this location.
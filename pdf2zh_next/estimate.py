@@ -0,0 +1,262 @@
+import json
+import math
+import re
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+
+import pymupdf
+from babeldoc.format.pdf.document_il.midend.il_translator_llm_only import (
+    PROMPT_TEMPLATE,
+)
+
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.page_parts import selected_pages
+from pdf2zh_next.translator import get_translator
+from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.latency_history import get_latency_history
+from pdf2zh_next.translator.segment_classifier import SegmentClassifier
+from pdf2zh_next.translator.segment_classifier import estimate_tokens
+
+# Latency assumed for engines without history, in seconds
+DEFAULT_REQUEST_LATENCY = 2.0
+# Rough time of parsing, layout detection and rendering of a page, in seconds
+PROCESSING_SECONDS_PER_PAGE = 0.5
+# Babeldoc sends LLM engines batches of paragraphs, closed once they hold more
+# than this many tokens or this many paragraphs
+LLM_BATCH_TOKENS = 200
+LLM_BATCH_PARAGRAPHS = 6
+# JSON wrapping every paragraph of an LLM batch, in tokens
+LLM_PARAGRAPH_OVERHEAD_TOKENS = 20
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class Estimate:
+    """Expected work and duration of the translation of a document."""
+
+    file: str
+    pages: int
+    segments: int
+    skipped_segments: int
+    cached_segments: int
+    requests: int
+    prompt_tokens: int
+    completion_tokens: int
+    cache_hit_ratio: float
+    latency_seconds: float
+    latency_source: str
+    translation_seconds: float
+    processing_seconds: float
+    predicted_seconds: float
+
+
+def extract_segments(settings: SettingsModel, file: Path) -> tuple[int, list[str]]:
+    """
+    Text blocks of the pages to translate, as an approximation of the paragraphs
+    babeldoc finds with its layout model.
+    :return: number of pages to translate and the segments
+    """
+    segments = []
+    with pymupdf.open(file) as doc:
+        pages = selected_pages(doc.page_count, settings.parse_pages())
+        for page_number in pages:
+            for block in doc[page_number].get_text("blocks"):
+                # Image blocks have type 1
+                if block[6] != 0:
+                    continue
+                text = _WHITESPACE.sub(" ", block[4]).strip()
+                if len(text) >= settings.translation.min_text_length:
+                    segments.append(text)
+    return len(pages), segments
+
+
+def _count_llm_requests(
+    segments: list[str], template_tokens: int
+) -> tuple[int, int, int]:
+    """Requests, prompt and completion tokens of the batches babeldoc would send."""
+    requests = prompt_tokens = completion_tokens = 0
+    batch_tokens = batch_size = 0
+    for segment in segments:
+        tokens = estimate_tokens(segment)
+        if batch_size == 0:
+            requests += 1
+            prompt_tokens += template_tokens
+        batch_tokens += tokens
+        batch_size += 1
+        prompt_tokens += tokens + LLM_PARAGRAPH_OVERHEAD_TOKENS
+        completion_tokens += tokens + LLM_PARAGRAPH_OVERHEAD_TOKENS
+        if batch_tokens > LLM_BATCH_TOKENS or batch_size >= LLM_BATCH_PARAGRAPHS:
+            batch_tokens = batch_size = 0
+    return requests, prompt_tokens, completion_tokens
+
+
+def estimate_file(
+    settings: SettingsModel, file: Path, translator: BaseTranslator
+) -> Estimate:
+    """
+    Estimate the translation of a document without sending any request: the
+    segments are looked up in the translation cache, the duration follows from
+    the QPS limit, the worker count and the latency of the engine in earlier jobs.
+
+    Babeldoc caches the translations of LLM engines by whole batch prompts, which
+    depend on the neighbouring paragraphs, so no segment of an LLM engine is
+    counted as cached.
+    """
+    page_count, segments = extract_segments(settings, file)
+    support_llm = (
+        getattr(settings.translate_engine_settings, "support_llm", "no") == "yes"
+    )
+
+    skipped = 0
+    if not support_llm and not settings.translation.no_skip_untranslatable_segments:
+        classifier = SegmentClassifier(
+            settings.translation.lang_in, settings.translation.lang_out
+        )
+        translatable = [s for s in segments if classifier.classify(s) is None]
+        skipped = len(segments) - len(translatable)
+    else:
+        translatable = segments
+
+    cached = {}
+    if not (settings.translation.ignore_cache or support_llm):
+        cached = translator.cache.get_many(translatable)
+    uncached = [s for s in translatable if s not in cached]
+    cached_count = len(translatable) - len(uncached)
+
+    if support_llm:
+        template = PROMPT_TEMPLATE.template
+        if settings.translation.custom_system_prompt:
+            template += settings.translation.custom_system_prompt
+        requests, prompt_tokens, completion_tokens = _count_llm_requests(
+            uncached, estimate_tokens(template)
+        )
+    else:
+        requests = len(uncached)
+        prompt_tokens = completion_tokens = sum(estimate_tokens(s) for s in uncached)
+
+    latency = get_latency_history().get(translator.endpoint_key)
+    latency_source = "history"
+    if latency is None:
+        latency, latency_source = DEFAULT_REQUEST_LATENCY, "default"
+    qps = settings.translation.qps or 4
+    workers = settings.translation.pool_max_workers or qps
+    requests_per_second = min(qps, workers / latency) if latency > 0 else qps
+    translation_seconds = requests / requests_per_second
+    processing_seconds = page_count * PROCESSING_SECONDS_PER_PAGE
+    return Estimate(
+        file=str(file),
+        pages=page_count,
+        segments=len(segments),
+        skipped_segments=skipped,
+        cached_segments=cached_count,
+        requests=requests,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        cache_hit_ratio=round(cached_count / len(translatable), 4)
+        if translatable
+        else 0.0,
+        latency_seconds=round(latency, 3),
+        latency_source=latency_source,
+        translation_seconds=round(translation_seconds, 1),
+        processing_seconds=round(processing_seconds, 1),
+        predicted_seconds=round(translation_seconds + processing_seconds, 1),
+    )
+
+
+def total_estimate(settings: SettingsModel, estimates: list[Estimate]) -> Estimate:
+    """
+    Estimate of a batch. The files share the QPS limit, so their translation
+    takes as long as translating them one after another, their processing runs
+    ``parallel_files`` at a time.
+    """
+    translatable = sum(e.segments - e.skipped_segments for e in estimates)
+    cached = sum(e.cached_segments for e in estimates)
+    translation_seconds = sum(e.translation_seconds for e in estimates)
+    processing_seconds = sum(e.processing_seconds for e in estimates) / max(
+        1, min(settings.basic.parallel_files, len(estimates))
+    )
+    return Estimate(
+        file="total",
+        pages=sum(e.pages for e in estimates),
+        segments=sum(e.segments for e in estimates),
+        skipped_segments=sum(e.skipped_segments for e in estimates),
+        cached_segments=cached,
+        requests=sum(e.requests for e in estimates),
+        prompt_tokens=sum(e.prompt_tokens for e in estimates),
+        completion_tokens=sum(e.completion_tokens for e in estimates),
+        cache_hit_ratio=round(cached / translatable, 4) if translatable else 0.0,
+        latency_seconds=estimates[0].latency_seconds if estimates else 0.0,
+        latency_source=estimates[0].latency_source if estimates else "default",
+        translation_seconds=round(translation_seconds, 1),
+        processing_seconds=round(processing_seconds, 1),
+        predicted_seconds=round(translation_seconds + processing_seconds, 1),
+    )
+
+
+def estimate_files(settings: SettingsModel) -> dict:
+    """Estimate the translation of the input files, as a JSON-serializable dict."""
+    settings = settings.model_copy(deep=True)
+    # Only the cache parameters and the endpoint of the translator are needed
+    settings.translation.lazy_health_check = True
+    settings.translation.translator_pool_ttl = 0
+    translator = get_translator(settings)
+    estimates = []
+    for file in sorted(settings.basic.input_files):
+        estimates.append(estimate_file(settings, Path(file), translator))
+    return {
+        "files": [asdict(e) for e in estimates],
+        "total": asdict(total_estimate(settings, estimates)),
+    }
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(math.ceil(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def print_estimate(result: dict):
+    """Print an estimate as JSON on stdout and as a table on stderr."""
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Translation estimate")
+    for column in (
+        "File",
+        "Pages",
+        "Segments",
+        "Skipped",
+        "Cached",
+        "Cache hit",
+        "Requests",
+        "Prompt tokens",
+        "Completion tokens",
+        "Time",
+    ):
+        table.add_column(column, justify="left" if column == "File" else "right")
+    rows = result["files"] + [result["total"]]
+    for i, row in enumerate(rows):
+        table.add_row(
+            Path(row["file"]).name if i < len(rows) - 1 else "Total",
+            str(row["pages"]),
+            str(row["segments"]),
+            str(row["skipped_segments"]),
+            str(row["cached_segments"]),
+            f"{row['cache_hit_ratio']:.1%}",
+            str(row["requests"]),
+            str(row["prompt_tokens"]),
+            str(row["completion_tokens"]),
+            _format_seconds(row["predicted_seconds"]),
+            end_section=i == len(rows) - 2,
+        )
+    console = Console(stderr=True)
+    console.print(table)
+    total = result["total"]
+    console.print(
+        f"Request latency {total['latency_seconds']}s ({total['latency_source']}), "
+        "segments are text blocks, babeldoc may split the pages differently, "
+        "cache hits of LLM engines are not counted"
+    )
+    print(json.dumps(result, indent=2, ensure_ascii=False))
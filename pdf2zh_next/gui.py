@@ -41,6 +41,9 @@ from pdf2zh_next.i18n import update_current_languages
 
 logger = logging.getLogger(__name__)
 
+# Seconds between the progress bar updates of a stage
+GUI_PROGRESS_INTERVAL = 0.25
+
 
 class SaveMode(Enum):
     """Enum for configuration save behavior."""
@@ -936,7 +939,9 @@ async def _run_translation_task(
 
     try:
         settings.basic.input_files = set()
-        async for event in do_translate_async_stream(settings, file_path):
+        async for event in do_translate_async_stream(
+            settings, file_path, progress_interval=GUI_PROGRESS_INTERVAL
+        ):
             if event["type"] in (
                 "progress_start",
                 "progress_update",
@@ -1,17 +1,20 @@
 import asyncio
+import functools
 import logging
 import logging.handlers
 import multiprocessing
 import multiprocessing.connection
 import multiprocessing.queues
-import queue
+import shutil
+import tempfile
 import threading
+import time
 import traceback
 from collections.abc import AsyncGenerator
 from functools import partial
-from logging.handlers import QueueHandler
 from pathlib import Path
 
+import pymupdf
 from babeldoc.format.pdf.high_level import async_translate as babeldoc_translate
 from babeldoc.format.pdf.translation_config import TranslationConfig as BabelDOCConfig
 from babeldoc.format.pdf.translation_config import (
@@ -19,12 +22,31 @@ from babeldoc.format.pdf.translation_config import (
 )
 from babeldoc.glossary import Glossary
 from babeldoc.main import create_progress_handler
-from rich.logging import RichHandler
 
+from pdf2zh_next.batch_progress import BatchProgress
 from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.incremental import DEFAULT_PAGE_CACHE_DIR
+from pdf2zh_next.incremental import PAGE_STEM
+from pdf2zh_next.incremental import get_page_keys
+from pdf2zh_next.incremental import split_result
+from pdf2zh_next.ipc import FrameChannel
+from pdf2zh_next.ipc import ProtocolError
+from pdf2zh_next.memory_watchdog import MemoryWatchdog
+from pdf2zh_next.page_parts import PagePart
+from pdf2zh_next.page_parts import extract_part
+from pdf2zh_next.page_parts import merge_finish_events
+from pdf2zh_next.page_parts import plan_parts
+from pdf2zh_next.result_cache import ResultCache
+from pdf2zh_next.result_cache import get_result_cache
+from pdf2zh_next.result_cache import get_result_cache_key
+from pdf2zh_next.translator import HostRateBudget
 from pdf2zh_next.translator import get_term_translator
 from pdf2zh_next.translator import get_translator
+from pdf2zh_next.translator import release_translators
+from pdf2zh_next.translator import set_host_rate_budget
 from pdf2zh_next.utils import asynchronize
+from pdf2zh_next.worker_pool import WorkerExitedError
+from pdf2zh_next.worker_pool import WorkerPool
 
 
 # Custom exception classes for structured error handling
@@ -88,6 +110,18 @@ class IPCError(TranslationError):
         return super().__str__()
 
 
+class ServiceUnavailableError(TranslationError):
+    """Error raised when the circuit of a translation service opened during translation."""
+
+    def __init__(self, message, endpoint_key=None):
+        super().__init__(message)
+        self.endpoint_key = endpoint_key
+
+    def __reduce__(self):
+        """Support for pickling the exception when passing between processes."""
+        return self.__class__, (str(self), self.endpoint_key)
+
+
 class SubprocessCrashError(TranslationError):
     """Error occurring when the subprocess crashes unexpectedly."""
 
@@ -105,29 +139,60 @@ class SubprocessCrashError(TranslationError):
         return super().__str__()
 
 
+class MemoryLimitError(TranslationError):
+    """Error raised when the translation subprocess exceeded its memory limit."""
+
+    def __init__(self, message, peak_rss_mb=None, limit_mb=None):
+        super().__init__(message)
+        self.peak_rss_mb = peak_rss_mb
+        self.limit_mb = limit_mb
+
+    def __reduce__(self):
+        """Support for pickling the exception when passing between processes."""
+        return self.__class__, (str(self), self.peak_rss_mb, self.limit_mb)
+
+
+class _MemoryPressureError(Exception):
+    """The translation subprocess came near its memory limit."""
+
+    def __init__(self, peak_rss_mb: float):
+        super().__init__(f"Translation subprocess used {peak_rss_mb} MB of memory")
+        self.peak_rss_mb = peak_rss_mb
+
+
 logger = logging.getLogger(__name__)
 
+# Fewest pages per part a translation near its memory limit is split into. Scanned
+# documents can need much memory per page, so short documents are split as well.
+MIN_DEGRADED_PAGES_PER_PART = 4
+
+
+def _init_worker(host_rate_budget: HostRateBudget):
+    set_host_rate_budget(host_rate_budget)
+    logging.getLogger("asyncio").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("openai").setLevel(logging.WARNING)
+    logging.getLogger("pdfminer").setLevel(logging.WARNING)
+    logging.getLogger("httpcore").setLevel(logging.WARNING)
+    logging.getLogger("peewee").setLevel(logging.WARNING)
+
+
+# Worker processes of the translations started by this process, documents
+# translated at the same time share the provider budgets of the host
+_worker_pool = WorkerPool(initializer=_init_worker, initargs=(HostRateBudget(),))
+
 
 def _translate_wrapper(
+    progress_channel: FrameChannel,
     settings: SettingsModel,
     file: Path,
-    pipe_progress_send: multiprocessing.connection.Connection,
     pipe_cancel_message_recv: multiprocessing.connection.Connection,
-    logger_queue: multiprocessing.Queue,
 ):
     logger = logging.getLogger(__name__)
     cancel_event = threading.Event()
+    config = None
+    progress_channel.flush_interval = settings.basic.progress_interval
     try:
-        logging.getLogger("asyncio").setLevel(logging.WARNING)
-        logging.getLogger("httpx").setLevel(logging.WARNING)
-        logging.getLogger("openai").setLevel(logging.WARNING)
-        logging.getLogger("pdfminer").setLevel(logging.WARNING)
-        logging.getLogger("httpcore").setLevel(logging.WARNING)
-        logging.getLogger("peewee").setLevel(logging.WARNING)
-
-        queue_handler = QueueHandler(logger_queue)
-        logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
-
         config = create_babeldoc_config(settings, file)
 
         def cancel_recv_thread():
@@ -142,9 +207,60 @@ def _translate_wrapper(
         cancel_t = threading.Thread(target=cancel_recv_thread, daemon=True)
         cancel_t.start()
 
+        # Babeldoc swallows errors of single paragraphs, so an unavailable
+        # translation service would otherwise only show up in the output.
+        opened_circuits = []
+
+        translators = [config.translator, config.term_extraction_translator]
+        translators += getattr(config.translator, "failover_translators", [])
+
+        def on_circuit_open(breaker):
+            if all(
+                translator.is_available()
+                for translator in (
+                    config.translator,
+                    config.term_extraction_translator,
+                )
+                if hasattr(translator, "is_available")
+            ):
+                logger.warning(
+                    f"Translation service {breaker.endpoint_key} is unavailable, "
+                    "continuing with failover engines"
+                )
+                return
+            if not opened_circuits:
+                logger.error(
+                    f"Translation service {breaker.endpoint_key} is unavailable, "
+                    "aborting translation"
+                )
+                config.cancel_translation()
+            opened_circuits.append(breaker)
+
+        circuit_breakers = {
+            translator.circuit_breaker
+            for translator in translators
+            if hasattr(translator, "circuit_breaker")
+        }
+        for breaker in circuit_breakers:
+            breaker.add_open_listener(on_circuit_open)
+            if breaker.is_open:
+                on_circuit_open(breaker)
+
+        def send_service_unavailable_error():
+            breaker = opened_circuits[0]
+            error = ServiceUnavailableError(
+                message=f"Translation service {breaker.endpoint_key} is unavailable "
+                f"after {breaker.consecutive_failures} consecutive failed requests",
+                endpoint_key=breaker.endpoint_key,
+            )
+            progress_channel.send(error)
+
         async def translate_wrapper_async():
             try:
                 async for event in babeldoc_translate(config):
+                    if opened_circuits:
+                        # Let babeldoc wind down the cancelled translation
+                        continue
                     logger.debug(f"sub process generate event: {event}")
                     if event["type"] == "error":
                         # Convert babeldoc error to structured exception
@@ -153,7 +269,7 @@ def _translate_wrapper(
                             message=f"Babeldoc translation error: {error_msg}",
                             original_error=error_msg,
                         )
-                        pipe_progress_send.send(error)
+                        progress_channel.send(error)
                         break
                     # Send normal progress events as before
                     if event["type"] == "finish":
@@ -178,6 +294,36 @@ def _translate_wrapper(
                                 )
                                 else 0,
                             }
+                            tokens_per_second = getattr(
+                                config.translator, "tokens_per_second", None
+                            )
+                            if tokens_per_second:
+                                logger.info(
+                                    f"{config.translator.name} generated {tokens_per_second:.1f} tokens/s"
+                                )
+                                token_usage["main"]["tokens_per_second"] = round(
+                                    tokens_per_second, 1
+                                )
+                        transport_stats = getattr(
+                            config.translator, "transport_stats", None
+                        )
+                        if transport_stats is not None:
+                            event["transport_stats"] = transport_stats.as_dict()
+                            logger.info(
+                                f"{config.translator.name} HTTP transport: {event['transport_stats']}"
+                            )
+                        skipped_segments = getattr(
+                            config.translator, "skipped_segments", None
+                        )
+                        if skipped_segments:
+                            event["skipped_segments"] = {
+                                "total": sum(skipped_segments.values()),
+                                "saved_tokens": config.translator.skipped_token_count.value,
+                                "reasons": dict(skipped_segments),
+                            }
+                            logger.info(
+                                f"Skipped untranslatable segments: {event['skipped_segments']}"
+                            )
 
                         # Term extraction translator
                         if (
@@ -241,12 +387,25 @@ def _translate_wrapper(
                             main_usage["cache_hit_prompt"] -= term_usage[
                                 "cache_hit_prompt"
                             ]
+                        for usage_name, usage in token_usage.items():
+                            if usage["prompt"] > 0:
+                                usage["cache_hit_ratio"] = round(
+                                    usage["cache_hit_prompt"] / usage["prompt"], 4
+                                )
+                                logger.info(
+                                    f"{usage_name} translator prompt cache hit ratio: {usage['cache_hit_ratio']:.1%}"
+                                )
 
                         event["token_usage"] = token_usage
-                        pipe_progress_send.send(event)
+                        progress_channel.send(event)
                         break
-                    pipe_progress_send.send(event)
+                    progress_channel.send(event)
+                if opened_circuits:
+                    send_service_unavailable_error()
             except Exception as e:
+                if opened_circuits:
+                    send_service_unavailable_error()
+                    return
                 # Capture non-babeldoc errors during translation
                 tb_str = traceback.format_exc()
                 if not cancel_event.is_set():
@@ -256,10 +415,13 @@ def _translate_wrapper(
                     traceback_str=tb_str,
                 )
                 try:
-                    pipe_progress_send.send(error)
+                    progress_channel.send(error)
                 except Exception as pipe_err:
                     if not cancel_event.is_set():
                         logger.error(f"Failed to send error through pipe: {pipe_err}")
+            finally:
+                for breaker in circuit_breakers:
+                    breaker.remove_open_listener(on_circuit_open)
 
         # Run the async translation in the subprocess's event loop
         try:
@@ -273,7 +435,7 @@ def _translate_wrapper(
                 message=f"Failed to run translation process: {e}", traceback_str=tb_str
             )
             try:
-                pipe_progress_send.send(error)
+                progress_channel.send(error)
             except Exception as pipe_err:
                 if not cancel_event.is_set():
                     logger.error(f"Failed to send error through pipe: {pipe_err}")
@@ -286,127 +448,186 @@ def _translate_wrapper(
                 message=f"Translation subprocess initialization error: {e}",
                 traceback_str=tb_str,
             )
-            pipe_progress_send.send(error)
+            progress_channel.send(error)
         except Exception as pipe_err:
             if not cancel_event.is_set():
                 logger.error(f"Failed to send error through pipe: {pipe_err}")
     finally:
+        if config is not None:
+            release_translators(
+                settings, config.translator, config.term_extraction_translator
+            )
         logger.debug("sub process send close")
         try:
-            pipe_progress_send.send(None)
-            pipe_progress_send.close()
-            logger.debug("sub process close pipe progress send")
+            progress_channel.send(None)
+            progress_channel.close()
+            logger.debug("sub process flushed progress channel")
         except Exception as e:
             if not cancel_event.is_set():
-                logger.error(f"Error closing progress pipe: {e}")
+                logger.error(f"Error closing progress channel: {e}")
 
-        try:
-            logging.getLogger().removeHandler(queue_handler)
-            logging.getLogger().addHandler(RichHandler())
-            logger_queue.put(None)
-            logger_queue.close()
-        except Exception as e:
-            if not cancel_event.is_set():
-                logger.error(f"Error closing logger queue: {e}")
 
+def _progress_coalesce_key(args: asynchronize.Args) -> tuple | None:
+    """Pending progress updates of the same stage are replaced by the latest one."""
+    event = args.args[0] if args.args else None
+    if isinstance(event, dict) and event.get("type") == "progress_update":
+        return ("progress_update", event.get("stage"), event.get("part_index"))
+    return None
 
-async def _translate_in_subprocess(
+
+def _progress_stage_key(event: dict) -> tuple:
+    return event.get("stage"), event.get("part_index")
+
+
+class ProgressThrottle:
+    """
+    Passes the progress updates of a stage at most once per ``interval`` seconds.
+
+    Updates in between are held back, a newer one replacing the older, and are
+    passed before the next other event. The end of a stage replaces its held
+    back update. All other events pass at once.
+    """
+
+    def __init__(self, interval: float, clock=time.monotonic):
+        self.interval = interval
+        self.clock = clock
+        self.last_passed: dict[tuple, float] = {}
+        self.pending: dict[tuple, dict] = {}
+        self.dropped_count = 0
+
+    def push(self, event: dict) -> list[dict]:
+        """:return: the events to pass on, in order"""
+        event_type = event.get("type")
+        if event_type != "progress_update":
+            if event_type == "progress_end":
+                if self.pending.pop(_progress_stage_key(event), None) is not None:
+                    self.dropped_count += 1
+            events = [*self.pending.values(), event]
+            self.pending.clear()
+            return events
+        key = _progress_stage_key(event)
+        now = self.clock()
+        last_passed = self.last_passed.get(key)
+        if last_passed is None or now - last_passed >= self.interval:
+            self.pending.pop(key, None)
+            self.last_passed[key] = now
+            return [event]
+        if key in self.pending:
+            self.dropped_count += 1
+        self.pending[key] = event
+        return []
+
+
+async def _translate_in_worker(
     settings: SettingsModel,
     file: Path,
+    degradable: bool = False,
 ):
+    """
+    Translate a document in a worker process of the pool.
+    :param degradable: raise _MemoryPressureError when the worker process comes
+        near the memory limit, so that the document can be translated in smaller parts
+    """
     # 30 minutes timeout
-    cb = asynchronize.AsyncCallback(timeout=30 * 60)
+    cb = asynchronize.AsyncCallback(
+        timeout=30 * 60, coalesce_key=_progress_coalesce_key
+    )
 
-    (pipe_progress_recv, pipe_progress_send) = multiprocessing.Pipe(duplex=False)
     (pipe_cancel_message_recv, pipe_cancel_message_send) = multiprocessing.Pipe(
         duplex=False
     )
-    logger_queue = multiprocessing.Queue()
-    cancel_event = threading.Event()
 
-    def recv_thread():
-        while True:
-            if cancel_event.is_set():
-                break
-            try:
-                event = pipe_progress_recv.recv()
-                if event is None:
-                    logger.debug("recv none event")
-                    cb.finished_callback_without_args()
-                    break
+    _worker_pool.configure(
+        settings.translation.worker_processes, settings.translation.worker_max_tasks
+    )
+    worker = _worker_pool.acquire()
+
+    memory_watchdog = None
+    limit_mb = settings.translation.memory_limit
+    if limit_mb:
+
+        def on_memory_soft_limit(rss):
+            if degradable:
+                cb.error_callback(_MemoryPressureError(memory_watchdog.peak_rss_mb))
+            else:
+                logger.warning(
+                    f"Translation of {file} uses {rss / 1024 / 1024:.0f} MB of memory, "
+                    f"near the limit of {limit_mb} MB"
+                )
 
-                # Handle different types of messages from the subprocess
-                if isinstance(event, TranslationError):
-                    # Received a structured error object
-                    logger.error(f"Received error from subprocess: {event}")
-                    cb.error_callback(event)
-                    break
-                elif isinstance(event, dict):
-                    # Process normal progress events
-                    cb.step_callback(event)
-                else:
-                    # Unexpected message type
-                    logger.warning(
-                        f"Unexpected message type from subprocess: {type(event)}"
-                    )
-                    error = IPCError(f"Unexpected message type: {type(event)}")
-                    cb.error_callback(error)
-                    break
-            except EOFError:
-                logger.debug("recv eof error")
-                error = IPCError("Connection to subprocess was closed unexpectedly")
-                cb.error_callback(error)
-                break
-            except Exception as e:
-                if not cancel_event.is_set():
-                    logger.error(f"Error receiving event: {e}")
-                error = IPCError(f"IPC error: {e}", details=str(e))
-                cb.error_callback(error)
-                break
+        def on_memory_limit(rss):
+            logger.error(
+                f"Translation of {file} uses {rss / 1024 / 1024:.0f} MB of memory, "
+                "stopping its subprocess"
+            )
+            cb.error_callback(
+                MemoryLimitError(
+                    f"Translation subprocess exceeded the memory limit of {limit_mb} MB "
+                    f"(peak {memory_watchdog.peak_rss_mb} MB)",
+                    peak_rss_mb=memory_watchdog.peak_rss_mb,
+                    limit_mb=limit_mb,
+                )
+            )
+            worker.kill()
 
-    def log_thread():
-        while True:
-            try:
-                record = logger_queue.get()
-                if record is None:
-                    logger.info("Listener stopped.")
-                    break
-                logger.handle(record)
-            except KeyboardInterrupt:
-                logger.info("Listener stopped.")
-                break
-            except queue.Empty:
-                logger.info("Listener stopped.")
-                break
-            except Exception:
-                logger.error("Failure in listener_process")
-                break
+        memory_watchdog = MemoryWatchdog(
+            worker.pid,
+            limit_mb * 1024 * 1024,
+            on_soft_limit=on_memory_soft_limit,
+            on_limit=on_memory_limit,
+        )
 
-    recv_t = threading.Thread(target=recv_thread)
-    recv_t.start()
-    log_t = threading.Thread(target=log_thread)
-    log_t.start()
+    def on_message(message):
+        # Called in the thread reading the channel of the worker
+        if cb.is_finished():
+            return
+        if message is None:
+            logger.debug("recv none event")
+            cb.finished_callback_without_args()
+        elif isinstance(message, TranslationError):
+            # Received a structured error object
+            logger.error(f"Received error from subprocess: {message}")
+            cb.error_callback(message)
+        elif isinstance(message, dict):
+            # Process normal progress events
+            cb.step_callback(message)
+        elif isinstance(message, WorkerExitedError):
+            # The worker exited without finishing the job
+            error = SubprocessCrashError(
+                f"Translation subprocess crashed with exit code {message.exit_code}",
+                exit_code=message.exit_code,
+            )
+            cb.error_callback(error)
+        elif isinstance(message, ProtocolError):
+            logger.error(f"Error receiving event: {message}")
+            cb.error_callback(IPCError(f"IPC error: {message}", details=str(message)))
+        else:
+            # Unexpected message type
+            logger.warning(f"Unexpected message type from subprocess: {type(message)}")
+            error = IPCError(f"Unexpected message type: {type(message)}")
+            cb.error_callback(error)
 
-    translate_process = multiprocessing.Process(
-        target=_translate_wrapper,
-        args=(
+    cancel_flag = False
+    try:
+        worker.submit(
+            _translate_wrapper,
             settings,
             file,
-            pipe_progress_send,
             pipe_cancel_message_recv,
-            logger_queue,
-        ),
-    )
-    translate_process.start()
-    cancel_flag = False
-    try:
+            on_message=on_message,
+        )
+        if memory_watchdog is not None:
+            memory_watchdog.start()
         async for event in cb:
             # Check for errors before yielding events
             if cb.has_error():
                 # Let AsyncCallback.__anext__ raise the error
                 # This will break out of the loop
                 break
-            yield event.args[0]
+            event = event.args[0]
+            if event["type"] == "finish" and memory_watchdog is not None:
+                event["peak_rss_mb"] = memory_watchdog.peak_rss_mb
+            yield event
     except asyncio.CancelledError:
         cancel_flag = True
         logger.info("Process Translation cancelled")
@@ -425,62 +646,29 @@ async def _translate_in_subprocess(
         except Exception as e:
             logger.debug(f"Failed to close pipe_cancel_message_send: {e}")
 
-        try:
-            pipe_progress_send.send(None)
-        except (OSError, BrokenPipeError) as e:
-            logger.debug(f"Failed to send None to pipe_progress_send: {e}")
-
-        logger.debug("set cancel event")
-        cancel_event.set()
-
-        # 关闭接收端管道以中断 recv_thread 中的阻塞接收
-        try:
-            pipe_progress_recv.close()
-            logger.debug("closed pipe_progress_recv")
-        except Exception as e:
-            logger.debug(f"Failed to close pipe_progress_recv: {e}")
-
-        # 终止子进程，使用超时防止卡住
-        translate_process.join(timeout=2)
-        logger.debug("join translate process")
-        if translate_process.is_alive():
-            logger.info("Translate process did not finish in time, terminate it")
-            translate_process.terminate()
-            translate_process.join(timeout=1)
-        if translate_process.is_alive():
-            logger.info("Translate process did not finish in time, killing it")
-            try:
-                translate_process.kill()
-                translate_process.join(timeout=1)
-                logger.info("Translate process killed")
-            except Exception as e:
-                logger.exception(f"Error killing translate process: {e}")
-
-        # 等待接收线程，使用超时防止卡住
-        logger.debug("join recv thread")
-        recv_t.join(timeout=2)
-        if recv_t.is_alive():
-            logger.warning("Recv thread did not finish in time")
-
-        # 等待日志线程，使用超时防止卡住
-        log_t.join(timeout=1)
-        if log_t.is_alive():
-            logger.warning("Log thread did not finish in time")
-
-        # 尝试关闭日志队列
-        try:
-            logger_queue.put(None)
-            logger_queue.close()
-        except Exception as e:
-            logger.debug(f"Failed to close logger_queue: {e}")
+        # Release the channel reader if it waits for room in the callback
+        cb.close()
+
+        # 等待任务结束，超时则终止工作进程
+        job_finished = worker.wait_job(timeout=2)
+        logger.debug("wait translate job")
+        memory_exhausted = False
+        if memory_watchdog is not None:
+            memory_watchdog.stop()
+            memory_exhausted = memory_watchdog.soft_limit_reached
+        # A cancelled job may leave babeldoc threads behind, and a worker near its
+        # memory limit would start the next job with that memory, do not reuse them
+        _worker_pool.release(
+            worker, reusable=job_finished and not cancel_flag and not memory_exhausted
+        )
 
-        logger.debug("translate process exit code: %s", translate_process.exitcode)
+        logger.debug("translate process exit code: %s", worker.exitcode)
         if not cancel_flag:
             # Check if the process crashed but no error was captured through IPC
-            if translate_process.exitcode not in (0, None) and not cb.has_error():
+            if worker.exitcode not in (0, None) and not cb.has_error():
                 error = SubprocessCrashError(
-                    f"Translation subprocess crashed with exit code {translate_process.exitcode}",
-                    exit_code=translate_process.exitcode,
+                    f"Translation subprocess crashed with exit code {worker.exitcode}",
+                    exit_code=worker.exitcode,
                 )
                 # We need to raise the error as we're outside the async for loop now
                 raise error
@@ -492,6 +680,274 @@ async def _translate_in_subprocess(
                 raise cb.error
 
 
+def _smaller_pages_per_part(settings: SettingsModel, page_count: int) -> int | None:
+    """
+    Maximum pages per part of a translation using less memory than one with
+    settings, None if the parts cannot be smaller.
+    """
+    pages_per_part = min(settings.pdf.max_pages_per_part or page_count, page_count)
+    smaller = max(MIN_DEGRADED_PAGES_PER_PART, pages_per_part // 2)
+    return smaller if smaller < pages_per_part else None
+
+
+async def _translate_in_subprocess(
+    settings: SettingsModel,
+    file: Path,
+):
+    """
+    Translate a document in a worker process. With a memory limit, a translation
+    whose worker comes near the limit is cancelled and started again with fewer
+    pages per part, as babeldoc plans the parts before it translates them.
+    Paragraphs translated before are taken from the translation cache.
+    """
+    peak_rss_mb = 0.0
+    page_count = None
+    while True:
+        smaller_pages_per_part = None
+        if settings.translation.memory_limit:
+            if page_count is None:
+                with pymupdf.open(file) as doc:
+                    page_count = doc.page_count
+            smaller_pages_per_part = _smaller_pages_per_part(settings, page_count)
+        try:
+            async for event in _translate_in_worker(
+                settings, file, degradable=smaller_pages_per_part is not None
+            ):
+                if event["type"] == "finish" and "peak_rss_mb" in event:
+                    event["peak_rss_mb"] = max(event["peak_rss_mb"], peak_rss_mb)
+                yield event
+            return
+        except _MemoryPressureError as e:
+            peak_rss_mb = max(peak_rss_mb, e.peak_rss_mb)
+            logger.warning(
+                f"Translation of {file} came near the memory limit of "
+                f"{settings.translation.memory_limit} MB, translating it again "
+                f"in parts of {smaller_pages_per_part} pages"
+            )
+            settings = settings.model_copy(deep=True)
+            settings.pdf.max_pages_per_part = smaller_pages_per_part
+
+
+def _part_event(event: dict, part: PagePart, part_count: int, progress: list[float]):
+    """Rewrite an event of a part as an event of its document."""
+    event = dict(event)
+    if "part_index" in event:
+        event["part_index"] = part.index + 1
+        event["total_parts"] = part_count
+    if "overall_progress" in event:
+        progress[part.index] = event["overall_progress"]
+        event["overall_progress"] = sum(progress) / part_count
+    return event
+
+
+async def _translate_in_parallel_parts(
+    settings: SettingsModel,
+    file: Path,
+):
+    """
+    Translate the pages of a document in parts at the same time, each part in a
+    worker process of its own, and merge the outputs of the parts in page order.
+    """
+    with pymupdf.open(file) as doc:
+        page_count = doc.page_count
+    parts = plan_parts(page_count, settings.parse_pages(), settings.pdf.parallel_parts)
+    if not parts:
+        logger.info(f"{file} is too short to split, translating it in one part")
+        async for event in _translate_in_subprocess(settings, file):
+            yield event
+        return
+
+    logger.info(f"Translating {file} in {len(parts)} parts at the same time")
+    start_time = time.monotonic()
+    events: asyncio.Queue = asyncio.Queue()
+    finish_events: dict[int, dict] = {}
+    progress = [0.0] * len(parts)
+
+    async def translate_part(part: PagePart, part_settings: SettingsModel, part_file):
+        try:
+            async for event in _translate_in_subprocess(part_settings, part_file):
+                await events.put((part, event))
+        except BaseException as e:
+            await events.put((part, e))
+            raise
+        finally:
+            await events.put((part, None))
+
+    with tempfile.TemporaryDirectory(prefix="pdf2zh_parts_") as working_dir:
+        tasks = []
+        try:
+            with pymupdf.open(file) as doc:
+                for part in parts:
+                    part_dir = Path(working_dir) / f"part_{part.index}"
+                    part_dir.mkdir()
+                    part_file = part_dir / f"{file.stem}.part{part.index}.pdf"
+                    extract_part(doc, part, part_file)
+                    part_settings = settings.model_copy(deep=True)
+                    part_settings.pdf.pages = part.pages_setting()
+                    part_settings.pdf.parallel_parts = 1
+                    part_settings.translation.output = str(part_dir)
+                    if part.index > 0:
+                        part_settings.pdf.watermark_output_mode = "no_watermark"
+                    if part_settings.translation.worker_processes:
+                        # Keep a warm worker for every part
+                        part_settings.translation.worker_processes = max(
+                            part_settings.translation.worker_processes, len(parts)
+                        )
+                    tasks.append(
+                        asyncio.create_task(
+                            translate_part(part, part_settings, part_file)
+                        )
+                    )
+            running = len(tasks)
+            while running:
+                part, event = await events.get()
+                if event is None:
+                    running -= 1
+                elif isinstance(event, BaseException):
+                    raise event
+                elif event["type"] == "finish":
+                    finish_events[part.index] = event
+                else:
+                    yield _part_event(event, part, len(parts), progress)
+        finally:
+            # Stop the other parts if one failed or the translation was cancelled
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if len(finish_events) != len(parts):
+            raise TranslationError(
+                f"{len(parts) - len(finish_events)} parts of {file} did not finish"
+            )
+        output_dir = Path(settings.translation.output or Path.cwd())
+        finish_event = await asyncio.to_thread(
+            merge_finish_events,
+            file,
+            output_dir,
+            settings.translation.lang_out,
+            [finish_events[part.index] for part in parts],
+            time.monotonic() - start_time,
+        )
+    logger.info(f"Merged the outputs of {len(parts)} parts of {file}")
+    yield finish_event
+
+
+async def _translate_incrementally(
+    settings: SettingsModel,
+    file: Path,
+):
+    """
+    Translate the pages of a document whose content changed since an earlier
+    translation with the same settings, reuse the translated pages of earlier
+    translations for the others, and assemble the outputs in page order.
+    """
+    start_time = time.monotonic()
+    page_cache = ResultCache(
+        DEFAULT_PAGE_CACHE_DIR,
+        settings.translation.result_cache_max_size * 1024 * 1024,
+    )
+    page_keys = await asyncio.to_thread(get_page_keys, settings, file)
+    translate_func = _translate_in_subprocess
+    if settings.pdf.parallel_parts > 1:
+        translate_func = _translate_in_parallel_parts
+
+    with tempfile.TemporaryDirectory(prefix="pdf2zh_pages_") as working_dir:
+        working_dir = Path(working_dir)
+        page_events: dict[int, dict] = {}
+        if not settings.translation.ignore_cache:
+            for index, key in enumerate(page_keys):
+                event = await asyncio.to_thread(
+                    page_cache.load, key, Path(f"{index}.pdf"), working_dir / "reused"
+                )
+                if event is not None:
+                    page_events[index] = event
+        reused_count = len(page_events)
+        changed = [i for i in range(len(page_keys)) if i not in page_events]
+        logger.info(
+            f"Reusing {reused_count} of {len(page_keys)} translated pages of {file}"
+        )
+
+        run_event = None
+        if changed:
+            run_settings = settings.model_copy(deep=True)
+            run_settings.pdf.pages = PagePart(
+                0, 0, len(page_keys) - 1, changed
+            ).pages_setting()
+            run_settings.pdf.only_include_translated_page = True
+            run_settings.translation.output = str(working_dir / "translated")
+            async for event in translate_func(run_settings, file):
+                if event["type"] == "finish":
+                    run_event = event
+                    break
+                yield event
+            if run_event is None:
+                raise TranslationError(f"Translation of {file} did not finish")
+            results = await asyncio.to_thread(
+                split_result,
+                run_event["translate_result"],
+                len(changed),
+                working_dir / "split",
+            )
+            if results is None:
+                logger.warning(
+                    f"The outputs of {file} do not match its changed pages, "
+                    "translating the whole document"
+                )
+                async for event in translate_func(settings, file):
+                    yield event
+                return
+            for index, result in zip(changed, results, strict=True):
+                page_events[index] = {"type": "finish", "translate_result": result}
+                await asyncio.to_thread(
+                    page_cache.store,
+                    page_keys[index],
+                    Path(f"{PAGE_STEM}.pdf"),
+                    page_events[index],
+                    evict=False,
+                )
+            await asyncio.to_thread(page_cache.evict)
+
+        output_dir = Path(settings.translation.output or Path.cwd())
+        finish_event = await asyncio.to_thread(
+            merge_finish_events,
+            file,
+            output_dir,
+            settings.translation.lang_out,
+            [page_events[index] for index in range(len(page_keys))],
+            time.monotonic() - start_time,
+        )
+        finish_event["reused_pages"] = reused_count
+        if run_event is not None:
+            # Counters and the glossary belong to the translation of the changed pages
+            for name, value in run_event.items():
+                finish_event.setdefault(name, value)
+            run_result = run_event["translate_result"]
+            merged = finish_event["translate_result"]
+            for name in (
+                "peak_memory_usage",
+                "total_valid_character_count",
+                "total_valid_text_token_count",
+            ):
+                setattr(merged, name, getattr(run_result, name, None))
+            if run_result.auto_extracted_glossary_path:
+                merged.auto_extracted_glossary_path = Path(
+                    shutil.copyfile(
+                        run_result.auto_extracted_glossary_path,
+                        output_dir
+                        / f"{file.stem}.{settings.translation.lang_out}.glossary.csv",
+                    )
+                )
+    yield finish_event
+
+
+@functools.cache
+def _get_doc_layout_model():
+    """Layout model of this process, loaded once and shared by its translations."""
+    from babeldoc.docvision.doclayout import DocLayoutModel
+
+    return DocLayoutModel.load_available()
+
+
 def _get_glossaries(settings: SettingsModel) -> list[Glossary] | None:
     glossaries = []
     if not settings.translation.glossaries:
@@ -559,7 +1015,7 @@ def create_babeldoc_config(settings: SettingsModel, file: Path) -> BabelDOCConfi
         font=None,
         pages=settings.pdf.pages,
         output_dir=settings.translation.output,
-        doc_layout_model=None,
+        doc_layout_model=_get_doc_layout_model(),
         translator=translator,
         debug=settings.basic.debug,
         lang_in=settings.translation.lang_in,
@@ -621,8 +1077,14 @@ def _rename_stage_in_event(event: dict):
 
 
 async def do_translate_async_stream(
-    settings: SettingsModel, file: Path | str
+    settings: SettingsModel, file: Path | str, progress_interval: float = 0
 ) -> AsyncGenerator[dict, None]:
+    """
+    Translate a file and yield its events.
+    :param progress_interval: seconds between the progress updates of a stage
+        this consumer gets, see ProgressThrottle. 0 yields every update that
+        leaves the translation process.
+    """
     settings.validate_settings()
     if isinstance(file, str):
         file = Path(file)
@@ -637,22 +1099,49 @@ async def do_translate_async_stream(
     if not file.exists():
         raise FileNotFoundError(f"file {file} not found")
 
+    result_cache = get_result_cache(settings)
+    if result_cache is not None:
+        result_cache_key = await asyncio.to_thread(get_result_cache_key, settings, file)
+        if not settings.translation.ignore_cache:
+            output_dir = Path(settings.translation.output or Path.cwd())
+            cached_event = await asyncio.to_thread(
+                result_cache.load, result_cache_key, file, output_dir
+            )
+            if cached_event is not None:
+                logger.info(f"reuse the translated outputs of {file}")
+                yield cached_event
+                return
+
     # 开始翻译
     translate_func = partial(_translate_in_subprocess, settings, file)
+    if settings.pdf.incremental:
+        translate_func = partial(_translate_incrementally, settings, file)
+    elif settings.pdf.parallel_parts > 1:
+        translate_func = partial(_translate_in_parallel_parts, settings, file)
 
     if settings.basic.debug:
         babeldoc_config = create_babeldoc_config(settings, file)
         logger.debug("debug mode, translate in main process")
         translate_func = partial(babeldoc_translate, translation_config=babeldoc_config)
+        # Events do not pass the coalescing of the subprocess channel
+        progress_interval = max(progress_interval, settings.basic.progress_interval)
     else:
         logger.info("translate in subprocess")
+    throttle = ProgressThrottle(progress_interval) if progress_interval > 0 else None
 
     try:
         async for event in translate_func():
             _rename_stage_in_event(event)
-            yield event
-            if settings.basic.debug:
-                logger.debug(event)
+            if event["type"] == "finish" and result_cache is not None:
+                # Consumers stop at the finish event, store the outputs first
+                await asyncio.to_thread(
+                    result_cache.store, result_cache_key, file, event
+                )
+            events = [event] if throttle is None else throttle.push(event)
+            for passed_event in events:
+                yield passed_event
+                if settings.basic.debug:
+                    logger.debug(passed_event)
             if event["type"] == "finish":
                 break
     except TranslationError as e:
@@ -671,10 +1160,132 @@ async def do_translate_async_stream(
             or getattr(e, "traceback_str", "")
             or "",
         }
+        if isinstance(e, MemoryLimitError):
+            error_event["peak_rss_mb"] = e.peak_rss_mb
+            error_event["memory_limit_mb"] = e.limit_mb
         yield error_event
         raise  # Re-raise the exception so that the caller can handle it if needed
 
 
+async def _translate_file_with_progress(
+    settings: SettingsModel,
+    file: str | Path,
+    progress_handler,
+    ignore_error: bool,
+) -> int:
+    """Translate one input file, returning the number of errors encountered."""
+    error_count = 0
+    try:
+        async for event in do_translate_async_stream(settings, file):
+            progress_handler(event)
+            if settings.basic.debug:
+                logger.debug(event)
+            if event["type"] == "finish":
+                result = event["translate_result"]
+                logger.info("Translation Result:")
+                logger.info(f"  Original PDF: {result.original_pdf_path}")
+                logger.info(f"  Time Cost: {result.total_seconds:.2f}s")
+                logger.info(f"  Mono PDF: {result.mono_pdf_path or 'None'}")
+                logger.info(f"  Dual PDF: {result.dual_pdf_path or 'None'}")
+
+                token_usage = event.get("token_usage", {})
+                if token_usage:
+                    logger.info("Token Usage:")
+                    total_usage = {
+                        "total": 0,
+                        "prompt": 0,
+                        "cache_hit_prompt": 0,
+                        "completion": 0,
+                    }
+                    if "main" in token_usage:
+                        main_usage = token_usage["main"]
+                        logger.info(
+                            f"  Main Translator: Total {main_usage['total']}, Prompt {main_usage['prompt']}, Cache Hit Prompt {main_usage['cache_hit_prompt']}, Completion {main_usage['completion']}"
+                        )
+                        total_usage["total"] += main_usage["total"]
+                        total_usage["prompt"] += main_usage["prompt"]
+                        total_usage["cache_hit_prompt"] += main_usage[
+                            "cache_hit_prompt"
+                        ]
+                        total_usage["completion"] += main_usage["completion"]
+                    if "term" in token_usage:
+                        term_usage = token_usage["term"]
+                        logger.info(
+                            f"  Term Translator: Total {term_usage['total']}, Prompt {term_usage['prompt']}, Cache Hit Prompt {term_usage['cache_hit_prompt']}, Completion {term_usage['completion']}"
+                        )
+                        total_usage["total"] += term_usage["total"]
+                        total_usage["prompt"] += term_usage["prompt"]
+                        total_usage["cache_hit_prompt"] += term_usage[
+                            "cache_hit_prompt"
+                        ]
+                        total_usage["completion"] += term_usage["completion"]
+                    logger.info(
+                        f"  Total Token Usage: Total {total_usage['total']}, Prompt {total_usage['prompt']}, Cache Hit Prompt {total_usage['cache_hit_prompt']}, Completion {total_usage['completion']}"
+                    )
+                break
+            if event["type"] == "error":
+                error_msg = event.get("error", "Unknown error")
+                error_type = event.get("error_type", "UnknownError")
+                details = event.get("details", "")
+
+                logger.error(f"Error translating file {file}: {error_msg}")
+                logger.error(f"Error type: {error_type}")
+                if details:
+                    logger.error(f"Error details: {details}")
+
+                error_count += 1
+                if not ignore_error:
+                    raise RuntimeError(f"Translation error: {error_msg}")
+                break
+    except TranslationError as e:
+        # Already logged in do_translate_async_stream
+        error_count += 1
+        if not ignore_error:
+            raise
+    except Exception as e:
+        logger.error(f"Error translating file {file}: {e}")
+        error_count += 1
+        if not ignore_error:
+            raise
+
+    return error_count
+
+
+async def _translate_files_in_parallel(
+    settings: SettingsModel, input_files: list[str], ignore_error: bool
+) -> int:
+    """Translate up to ``parallel_files`` input files at the same time."""
+    if settings.translation.worker_processes:
+        # Keep a warm worker for every file slot
+        settings.translation.worker_processes = max(
+            settings.translation.worker_processes, settings.basic.parallel_files
+        )
+    semaphore = asyncio.Semaphore(settings.basic.parallel_files)
+    batch_progress = BatchProgress(input_files)
+
+    async def translate(file: str) -> int:
+        async with semaphore:
+            logger.info(f"translate file: {file}")
+            return await _translate_file_with_progress(
+                settings.model_copy(deep=True),
+                file,
+                batch_progress.handler(file),
+                ignore_error,
+            )
+
+    with batch_progress:
+        tasks = [asyncio.create_task(translate(file)) for file in input_files]
+        try:
+            error_counts = await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the other files as a sequential translation would
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    return sum(error_counts)
+
+
 async def do_translate_file_async(
     settings: SettingsModel, ignore_error: bool = False
 ) -> int:
@@ -694,84 +1305,20 @@ async def do_translate_file_async(
     assert len(input_files) >= 1, "At least one input file is required"
     settings.basic.input_files = set()
 
+    if settings.basic.parallel_files > 1 and len(input_files) > 1:
+        return await _translate_files_in_parallel(
+            settings, list(input_files), ignore_error
+        )
+
     error_count = 0
 
     for file in input_files:
         logger.info(f"translate file: {file}")
         # 开始翻译
         with progress_context:
-            try:
-                async for event in do_translate_async_stream(settings, file):
-                    progress_handler(event)
-                    if settings.basic.debug:
-                        logger.debug(event)
-                    if event["type"] == "finish":
-                        result = event["translate_result"]
-                        logger.info("Translation Result:")
-                        logger.info(f"  Original PDF: {result.original_pdf_path}")
-                        logger.info(f"  Time Cost: {result.total_seconds:.2f}s")
-                        logger.info(f"  Mono PDF: {result.mono_pdf_path or 'None'}")
-                        logger.info(f"  Dual PDF: {result.dual_pdf_path or 'None'}")
-
-                        token_usage = event.get("token_usage", {})
-                        if token_usage:
-                            logger.info("Token Usage:")
-                            total_usage = {
-                                "total": 0,
-                                "prompt": 0,
-                                "cache_hit_prompt": 0,
-                                "completion": 0,
-                            }
-                            if "main" in token_usage:
-                                main_usage = token_usage["main"]
-                                logger.info(
-                                    f"  Main Translator: Total {main_usage['total']}, Prompt {main_usage['prompt']}, Cache Hit Prompt {main_usage['cache_hit_prompt']}, Completion {main_usage['completion']}"
-                                )
-                                total_usage["total"] += main_usage["total"]
-                                total_usage["prompt"] += main_usage["prompt"]
-                                total_usage["cache_hit_prompt"] += main_usage[
-                                    "cache_hit_prompt"
-                                ]
-                                total_usage["completion"] += main_usage["completion"]
-                            if "term" in token_usage:
-                                term_usage = token_usage["term"]
-                                logger.info(
-                                    f"  Term Translator: Total {term_usage['total']}, Prompt {term_usage['prompt']}, Cache Hit Prompt {term_usage['cache_hit_prompt']}, Completion {term_usage['completion']}"
-                                )
-                                total_usage["total"] += term_usage["total"]
-                                total_usage["prompt"] += term_usage["prompt"]
-                                total_usage["cache_hit_prompt"] += term_usage[
-                                    "cache_hit_prompt"
-                                ]
-                                total_usage["completion"] += term_usage["completion"]
-                            logger.info(
-                                f"  Total Token Usage: Total {total_usage['total']}, Prompt {total_usage['prompt']}, Cache Hit Prompt {total_usage['cache_hit_prompt']}, Completion {total_usage['completion']}"
-                            )
-                        break
-                    if event["type"] == "error":
-                        error_msg = event.get("error", "Unknown error")
-                        error_type = event.get("error_type", "UnknownError")
-                        details = event.get("details", "")
-
-                        logger.error(f"Error translating file {file}: {error_msg}")
-                        logger.error(f"Error type: {error_type}")
-                        if details:
-                            logger.error(f"Error details: {details}")
-
-                        error_count += 1
-                        if not ignore_error:
-                            raise RuntimeError(f"Translation error: {error_msg}")
-                        break
-            except TranslationError as e:
-                # Already logged in do_translate_async_stream
-                error_count += 1
-                if not ignore_error:
-                    raise
-            except Exception as e:
-                logger.error(f"Error translating file {file}: {e}")
-                error_count += 1
-                if not ignore_error:
-                    raise
+            error_count += await _translate_file_with_progress(
+                settings, file, progress_handler, ignore_error
+            )
 
     return error_count
 
@@ -0,0 +1,130 @@
+import hashlib
+from pathlib import Path
+
+import pymupdf
+from babeldoc.format.pdf.translation_config import TranslateResult
+
+from pdf2zh_next.result_cache import get_settings_digest
+
+DEFAULT_PAGE_CACHE_DIR = Path("~/.cache/pdf2zh_next/pages").expanduser()
+
+# Name of the outputs of a single page in the page cache
+PAGE_STEM = "page"
+
+
+def _rounded(values) -> tuple:
+    # Regenerated documents move content by rounding errors
+    return tuple(round(v, 1) for v in values)
+
+
+def page_fingerprint(page: pymupdf.Page) -> str:
+    """
+    SHA-256 of the content of a page as it is extracted for translation: the
+    text with its fonts and positions, the images and the vector graphics.
+    Unchanged pages of a regenerated document keep their fingerprints.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((_rounded(page.rect), page.rotation)).encode())
+    text = page.get_text(
+        "dict", flags=pymupdf.TEXTFLAGS_DICT & ~pymupdf.TEXT_PRESERVE_IMAGES
+    )
+    for block in text["blocks"]:
+        for line in block.get("lines", []):
+            for span in line["spans"]:
+                digest.update(
+                    repr(
+                        (
+                            span["text"],
+                            span["font"],
+                            round(span["size"], 1),
+                            span["color"],
+                            span["flags"],
+                            _rounded(span["bbox"]),
+                        )
+                    ).encode()
+                )
+    for image in page.get_image_info(hashes=True):
+        digest.update(image["digest"])
+        digest.update(repr(_rounded(image["bbox"])).encode())
+    for drawing in page.get_drawings():
+        digest.update(
+            repr(
+                (
+                    _rounded(drawing["rect"]),
+                    len(drawing["items"]),
+                    drawing.get("color"),
+                    drawing.get("fill"),
+                    drawing.get("width"),
+                )
+            ).encode()
+        )
+    return digest.hexdigest()
+
+
+def get_page_keys(settings, file: Path) -> list[str]:
+    """Keys of the translated pages of a document in the page cache."""
+    settings_digest = get_settings_digest(settings, page_level=True)
+    with pymupdf.open(file) as doc:
+        return [
+            hashlib.sha256(
+                f"{settings_digest}:{page_fingerprint(page)}".encode()
+            ).hexdigest()
+            for page in doc
+        ]
+
+
+def _split_pdf(path: Path, page_count: int, output_dirs: list[Path], name: str):
+    """Split a document into page_count documents of the same number of pages."""
+    paths = []
+    with pymupdf.open(path) as doc:
+        if doc.page_count < page_count or doc.page_count % page_count:
+            return None
+        # Alternating dual outputs have two pages per page of the document
+        step = doc.page_count // page_count
+        for i, output_dir in enumerate(output_dirs):
+            page_doc = pymupdf.open()
+            page_doc.insert_pdf(doc, from_page=i * step, to_page=(i + 1) * step - 1)
+            page_doc.save(output_dir / name, garbage=3, deflate=True)
+            page_doc.close()
+            paths.append(output_dir / name)
+    return paths
+
+
+def split_result(
+    result: TranslateResult, page_count: int, output_dir: Path
+) -> list[TranslateResult] | None:
+    """
+    Split the outputs of a translation of page_count pages, translated with
+    only_include_translated_page, into a result for every page.
+    :return: the results in page order, None if the outputs do not match the pages
+    """
+    page_dirs = [output_dir / str(i) for i in range(page_count)]
+    for page_dir in page_dirs:
+        page_dir.mkdir(parents=True, exist_ok=True)
+    results = [TranslateResult(None, None) for _ in page_dirs]
+    for kind in ("mono", "dual"):
+        path = getattr(result, f"{kind}_pdf_path")
+        if not path:
+            continue
+        paths = _split_pdf(Path(path), page_count, page_dirs, f"{PAGE_STEM}.{kind}.pdf")
+        if paths is None:
+            return None
+        no_watermark_path = getattr(result, f"no_watermark_{kind}_pdf_path")
+        no_watermark_paths = paths
+        if no_watermark_path and Path(no_watermark_path) != Path(path):
+            no_watermark_paths = _split_pdf(
+                Path(no_watermark_path),
+                page_count,
+                page_dirs,
+                f"{PAGE_STEM}.no_watermark.{kind}.pdf",
+            )
+            if no_watermark_paths is None:
+                return None
+        for page_result, page_path, no_watermark_page_path in zip(
+            results, paths, no_watermark_paths, strict=True
+        ):
+            setattr(page_result, f"{kind}_pdf_path", page_path)
+            setattr(
+                page_result, f"no_watermark_{kind}_pdf_path", no_watermark_page_path
+            )
+    return results
@@ -0,0 +1,321 @@
+import importlib
+import logging
+import pickle
+import struct
+import threading
+import time
+from pathlib import Path
+from pathlib import PurePath
+
+import msgpack
+from babeldoc.format.pdf.translation_config import TranslateResult
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of a frame changes
+PROTOCOL_VERSION = 1
+# Every frame starts with the protocol version and the frame kind
+FRAME_HEADER = struct.Struct("<BB")
+
+FRAME_PROGRESS = 1
+FRAME_STAGE_SUMMARY = 2
+FRAME_FINISH = 3
+FRAME_ERROR = 4
+FRAME_LOG = 5
+FRAME_EVENT = 6
+FRAME_END = 7
+FRAME_JOB_DONE = 8
+
+PROGRESS_TYPES = ("progress_start", "progress_update", "progress_end")
+PROGRESS_FIELDS = (
+    "stage",
+    "stage_progress",
+    "stage_current",
+    "stage_total",
+    "overall_progress",
+    "part_index",
+    "total_parts",
+)
+STAGE_SUMMARY_FIELDS = ("stages", "part_index", "total_parts")
+LOG_FIELDS = (
+    "name",
+    "levelno",
+    "levelname",
+    "pathname",
+    "lineno",
+    "funcName",
+    "msg",
+    "created",
+    "msecs",
+    "process",
+    "processName",
+    "thread",
+    "threadName",
+    "exc_text",
+)
+
+# Extension types for values msgpack has no type for
+_EXT_PATH = 1
+_EXT_PICKLE = 2
+
+# Seconds a progress update may wait for newer updates of its stage
+PROGRESS_FLUSH_INTERVAL = 0.1
+
+
+class ProtocolError(Exception):
+    """A frame could not be decoded."""
+
+
+def _default(obj):
+    if isinstance(obj, PurePath):
+        return msgpack.ExtType(_EXT_PATH, str(obj).encode("utf-8"))
+    # Rare values, such as custom objects in events, keep their pickle
+    return msgpack.ExtType(_EXT_PICKLE, pickle.dumps(obj))
+
+
+def _ext_hook(code: int, data: bytes):
+    if code == _EXT_PATH:
+        return Path(data.decode("utf-8"))
+    if code == _EXT_PICKLE:
+        return pickle.loads(data)  # noqa: S301, frames only come from our workers
+    return msgpack.ExtType(code, data)
+
+
+def _pack(value) -> bytes:
+    return msgpack.packb(value, default=_default, use_bin_type=True)
+
+
+def _unpack(data: bytes):
+    return msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+
+
+def _frame(kind: int, payload=None) -> bytes:
+    header = FRAME_HEADER.pack(PROTOCOL_VERSION, kind)
+    return header if payload is None else header + _pack(payload)
+
+
+def _encode_event(event: dict) -> bytes:
+    event_type = event.get("type")
+    keys = event.keys() - {"type"}
+    if event_type in PROGRESS_TYPES and keys == set(PROGRESS_FIELDS):
+        return _frame(
+            FRAME_PROGRESS,
+            [PROGRESS_TYPES.index(event_type)]
+            + [event[field] for field in PROGRESS_FIELDS],
+        )
+    if (
+        event_type == "stage_summary"
+        and keys == set(STAGE_SUMMARY_FIELDS)
+        and all(stage.keys() == {"name", "percent"} for stage in event["stages"])
+    ):
+        return _frame(
+            FRAME_STAGE_SUMMARY,
+            [
+                [[stage["name"], stage["percent"]] for stage in event["stages"]],
+                event["part_index"],
+                event["total_parts"],
+            ],
+        )
+    if event_type == "finish" and isinstance(
+        event.get("translate_result"), TranslateResult
+    ):
+        rest = {k: v for k, v in event.items() if k not in ("type", "translate_result")}
+        return _frame(FRAME_FINISH, [vars(event["translate_result"]), rest])
+    return _frame(FRAME_EVENT, event)
+
+
+def _encode_error(error: BaseException) -> bytes:
+    reduced = error.__reduce__()
+    if len(reduced) == 2 and reduced[0] is type(error):
+        cls = type(error)
+        return _frame(FRAME_ERROR, [cls.__module__, cls.__qualname__, list(reduced[1])])
+    return _frame(FRAME_ERROR, [None, None, error])
+
+
+def _encode_log(record: logging.LogRecord) -> bytes:
+    if record.exc_info and not record.exc_text:
+        record.exc_text = logging.Formatter().formatException(record.exc_info)
+    values = [getattr(record, field, None) for field in LOG_FIELDS]
+    # Send the formatted message, its arguments may not be serializable
+    values[LOG_FIELDS.index("msg")] = record.getMessage()
+    return _frame(FRAME_LOG, values)
+
+
+def encode(message) -> bytes:
+    """
+    Encode a message of a worker: an event dict, an error, a log record, or None
+    for the end of the job.
+    """
+    if message is None:
+        return _frame(FRAME_END)
+    if isinstance(message, dict):
+        return _encode_event(message)
+    if isinstance(message, BaseException):
+        return _encode_error(message)
+    if isinstance(message, logging.LogRecord):
+        return _encode_log(message)
+    raise TypeError(f"Cannot encode {type(message)}")
+
+
+def _decode_error(module: str | None, qualname: str | None, args):
+    if module is None:
+        return args
+    cls = importlib.import_module(module)
+    for name in qualname.split("."):
+        cls = getattr(cls, name)
+    if not (isinstance(cls, type) and issubclass(cls, BaseException)):
+        raise ProtocolError(f"{module}.{qualname} is not an exception")
+    return cls(*args)
+
+
+def _decode_translate_result(fields: dict) -> TranslateResult:
+    result = TranslateResult.__new__(TranslateResult)
+    result.__dict__.update(fields)
+    return result
+
+
+def decode(frame: bytes) -> tuple[int, object]:
+    """
+    Decode a frame.
+    :return: the frame kind and the message, as passed to encode
+    """
+    if len(frame) < FRAME_HEADER.size:
+        raise ProtocolError("Truncated frame")
+    version, kind = FRAME_HEADER.unpack_from(frame)
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError(
+            f"Unsupported protocol version {version}, expected {PROTOCOL_VERSION}"
+        )
+    payload = frame[FRAME_HEADER.size :]
+    try:
+        if kind in (FRAME_END, FRAME_JOB_DONE):
+            return kind, None
+        value = _unpack(payload)
+        if kind == FRAME_PROGRESS:
+            event = {"type": PROGRESS_TYPES[value[0]]}
+            event.update(zip(PROGRESS_FIELDS, value[1:], strict=True))
+            return kind, event
+        if kind == FRAME_STAGE_SUMMARY:
+            stages, part_index, total_parts = value
+            return kind, {
+                "type": "stage_summary",
+                "stages": [{"name": name, "percent": p} for name, p in stages],
+                "part_index": part_index,
+                "total_parts": total_parts,
+            }
+        if kind == FRAME_FINISH:
+            fields, rest = value
+            return kind, {
+                "type": "finish",
+                "translate_result": _decode_translate_result(fields),
+                **rest,
+            }
+        if kind == FRAME_ERROR:
+            return kind, _decode_error(*value)
+        if kind == FRAME_LOG:
+            record = logging.makeLogRecord(dict(zip(LOG_FIELDS, value, strict=True)))
+            return kind, record
+        if kind == FRAME_EVENT:
+            return kind, value
+    except ProtocolError:
+        raise
+    except Exception as e:
+        raise ProtocolError(f"Malformed frame of kind {kind}: {e}") from e
+    raise ProtocolError(f"Unknown frame kind {kind}")
+
+
+def _progress_key(event: dict) -> tuple | None:
+    if event.get("type") == "progress_update":
+        return event.get("stage"), event.get("part_index")
+    return None
+
+
+class FrameChannel:
+    """
+    Sending end of the channel from a worker process to its parent.
+
+    Events, errors, log records and the end of a job share the channel in the
+    order they are sent. A progress update is held back for up to
+    ``flush_interval`` seconds and replaced by newer updates of its stage in the
+    meantime. Any other message sends the held back updates first.
+
+    ``send`` and ``close`` let the channel stand in for a Connection.
+    """
+
+    def __init__(self, conn, flush_interval: float = PROGRESS_FLUSH_INTERVAL):
+        self.conn = conn
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.pending: dict[tuple, bytes] = {}
+        self.first_pending_at = 0.0
+        self.timer: threading.Timer | None = None
+        self.frame_count = 0
+        self.coalesced_count = 0
+
+    def _send_frame(self, frame: bytes):
+        self.conn.send_bytes(frame)
+        self.frame_count += 1
+
+    def _flush_locked(self):
+        for frame in self.pending.values():
+            self._send_frame(frame)
+        self.pending.clear()
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.debug(f"Failed to flush progress frames: {e}")
+
+    def send(self, message):
+        frame = encode(message)
+        with self.lock:
+            key = _progress_key(message) if isinstance(message, dict) else None
+            if key is None:
+                self._flush_locked()
+                self._send_frame(frame)
+                return
+            now = time.monotonic()
+            if key in self.pending:
+                self.coalesced_count += 1
+            elif not self.pending:
+                self.first_pending_at = now
+            self.pending[key] = frame
+            if now - self.first_pending_at >= self.flush_interval:
+                self._flush_locked()
+            elif self.timer is None:
+                self.timer = threading.Timer(
+                    self.flush_interval, self._flush_from_timer
+                )
+                self.timer.daemon = True
+                self.timer.start()
+
+    def send_job_done(self):
+        with self.lock:
+            self._flush_locked()
+            self._send_frame(_frame(FRAME_JOB_DONE))
+
+    def close(self):
+        # The channel outlives a job, the worker closes the connection
+        self.flush()
+
+
+class FrameLogHandler(logging.Handler):
+    """Sends the log records of a worker process over its channel."""
+
+    def __init__(self, channel: FrameChannel):
+        super().__init__()
+        self.channel = channel
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.channel.send(record)
+        except Exception:
+            self.handleError(record)
@@ -106,6 +106,16 @@ async def main() -> int:
         print(f"pdf2zh-next version: {__version__}")
         return 0
 
+    if settings.basic.estimate:
+        from pdf2zh_next.estimate import estimate_files
+        from pdf2zh_next.estimate import print_estimate
+
+        assert len(settings.basic.input_files) >= 1, (
+            "At least one input file is required"
+        )
+        print_estimate(estimate_files(settings))
+        return 0
+
     logger.info("Warmup babeldoc assets...")
     babeldoc.assets.assets.warmup()
 
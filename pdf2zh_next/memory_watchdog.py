@@ -0,0 +1,104 @@
+import logging
+import threading
+from collections.abc import Callable
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two measurements of the memory of the watched process
+POLL_INTERVAL = 0.5
+# Share of the limit from which the memory of the process is considered near it
+SOFT_LIMIT_RATIO = 0.8
+
+
+def get_rss(pid: int) -> int | None:
+    """
+    Resident memory in bytes of a process and its child processes.
+    :return: None if the process does not exist anymore
+    """
+    try:
+        process = psutil.Process(pid)
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                # The child exited in the meantime
+                continue
+        return rss
+    except psutil.Error:
+        return None
+
+
+class MemoryWatchdog:
+    """
+    Measures the resident memory of a process in a thread of this process.
+
+    on_soft_limit is called once when the memory reaches SOFT_LIMIT_RATIO of the
+    limit, on_limit when it exceeds the limit, after which the watchdog stops.
+    Both are called in the thread of the watchdog with the memory in bytes.
+    """
+
+    def __init__(
+        self,
+        pid: int,
+        limit: int,
+        on_soft_limit: Callable[[int], None] | None = None,
+        on_limit: Callable[[int], None] | None = None,
+        interval: float = POLL_INTERVAL,
+        soft_limit_ratio: float = SOFT_LIMIT_RATIO,
+    ):
+        self.pid = pid
+        self.limit = limit
+        self.soft_limit = int(limit * soft_limit_ratio)
+        self.on_soft_limit = on_soft_limit
+        self.on_limit = on_limit
+        self.interval = interval
+        self.peak_rss = 0
+        self.soft_limit_reached = False
+        self.limit_exceeded = False
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def peak_rss_mb(self) -> float:
+        return round(self.peak_rss / 1024 / 1024, 1)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=self.interval * 4)
+
+    def check(self) -> bool:
+        """
+        Measure the memory once and call the handlers.
+        :return: False if the watchdog has nothing left to watch
+        """
+        rss = get_rss(self.pid)
+        if rss is None:
+            return False
+        self.peak_rss = max(self.peak_rss, rss)
+        if rss > self.limit:
+            self.limit_exceeded = True
+            if self.on_limit is not None:
+                self.on_limit(rss)
+            return False
+        if rss >= self.soft_limit and not self.soft_limit_reached:
+            self.soft_limit_reached = True
+            if self.on_soft_limit is not None:
+                self.on_soft_limit(rss)
+        return True
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                if not self.check():
+                    break
+            except Exception as e:
+                logger.error(f"Error in memory watchdog of process {self.pid}: {e}")
+                break
+            self.stop_event.wait(self.interval)
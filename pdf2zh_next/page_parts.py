@@ -0,0 +1,215 @@
+import csv
+import logging
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+
+import pymupdf
+from babeldoc.format.pdf.translation_config import TranslateResult
+
+logger = logging.getLogger(__name__)
+
+# Fewer pages per part do not pay for the extra process and model loading
+MIN_PAGES_PER_PART = 10
+
+# Counters of the finish event whose values are added up over the parts
+SUMMED_EVENT_FIELDS = ("token_usage", "transport_stats", "skipped_segments")
+
+
+@dataclass
+class PagePart:
+    """Consecutive pages of a document translated by one worker process."""
+
+    index: int
+    # First and last page of the part, 0-based and inclusive
+    start_page: int
+    end_page: int
+    # Pages of the document to translate, 0-based
+    pages: list[int] = field(default_factory=list)
+
+    @property
+    def page_count(self) -> int:
+        return self.end_page - self.start_page + 1
+
+    def pages_setting(self) -> str | None:
+        """The pages to translate in the extracted part, as in the pages setting."""
+        if len(self.pages) == self.page_count:
+            return None
+        ranges = []
+        for page in self.pages:
+            page = page - self.start_page + 1
+            if ranges and ranges[-1][1] == page - 1:
+                ranges[-1][1] = page
+            else:
+                ranges.append([page, page])
+        return ",".join(
+            str(start) if start == end else f"{start}-{end}" for start, end in ranges
+        )
+
+
+def selected_pages(
+    page_count: int, page_ranges: list[tuple[int, int]] | None
+) -> list[int]:
+    """0-based pages selected by SettingsModel.parse_pages, all pages for None."""
+    if page_ranges is None:
+        return list(range(page_count))
+    pages = set()
+    for start, end in page_ranges:
+        end = page_count if end == -1 else min(end, page_count)
+        pages.update(range(start - 1, end))
+    return sorted(pages)
+
+
+def plan_parts(
+    page_count: int,
+    page_ranges: list[tuple[int, int]] | None,
+    part_count: int,
+    min_pages: int = MIN_PAGES_PER_PART,
+) -> list[PagePart]:
+    """
+    Split a document into up to ``part_count`` parts with about the same number
+    of pages to translate, at least ``min_pages`` each.
+
+    The parts cover the whole document, pages that are not translated go with the
+    part before them, so the outputs can be concatenated.
+    :return: the parts in page order, an empty list if splitting does not pay
+    """
+    pages = selected_pages(page_count, page_ranges)
+    part_count = min(part_count, len(pages) // max(1, min_pages))
+    if part_count < 2:
+        return []
+    size, remainder = divmod(len(pages), part_count)
+    groups = []
+    start = 0
+    for i in range(part_count):
+        end = start + size + (1 if i < remainder else 0)
+        groups.append(pages[start:end])
+        start = end
+    parts = []
+    for i, group in enumerate(groups):
+        start_page = 0 if i == 0 else group[0]
+        end_page = groups[i + 1][0] - 1 if i + 1 < part_count else page_count - 1
+        parts.append(PagePart(i, start_page, end_page, group))
+    return parts
+
+
+def extract_part(doc: pymupdf.Document, part: PagePart, path: Path):
+    """Save the pages of a part as a document of its own."""
+    part_doc = pymupdf.open()
+    # Links and annotations may point to pages of other parts
+    part_doc.insert_pdf(
+        doc, from_page=part.start_page, to_page=part.end_page, links=0, annots=0
+    )
+    part_doc.save(path, garbage=3, deflate=True)
+    part_doc.close()
+
+
+def merge_pdfs(paths: list[Path], output_path: Path) -> Path:
+    """Concatenate documents in the given order."""
+    merged = pymupdf.open()
+    for path in paths:
+        with pymupdf.open(path) as doc:
+            merged.insert_pdf(doc)
+    # Objects shared by the parts, such as fonts, are stored once
+    merged.save(output_path, garbage=3, deflate=True)
+    merged.close()
+    return output_path
+
+
+def _merge_glossaries(paths: list[Path], output_path: Path) -> Path:
+    header = None
+    rows = {}
+    for path in paths:
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            part_header = next(reader, None)
+            header = header or part_header
+            for row in reader:
+                rows.setdefault(tuple(row), None)
+    with output_path.open("w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(header)
+        writer.writerows(rows)
+    return output_path
+
+
+def sum_counters(total: dict, counters: dict) -> dict:
+    """Add the numbers of counters to total, nested dicts are added recursively."""
+    for key, value in counters.items():
+        if isinstance(value, dict):
+            sum_counters(total.setdefault(key, {}), value)
+        elif isinstance(value, int | float) and not isinstance(value, bool):
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def merge_finish_events(
+    file: Path,
+    output_dir: Path,
+    lang_out: str,
+    events: list[dict],
+    total_seconds: float,
+) -> dict:
+    """
+    Merge the finish events of the parts of a document, in page order, into the
+    finish event of the document. The outputs are named as babeldoc names them.
+    """
+    results: list[TranslateResult] = [event["translate_result"] for event in events]
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def merge(kind: str, watermarked: bool) -> Path | None:
+        paths = []
+        for result in results:
+            path = getattr(result, f"{kind}_pdf_path")
+            if not watermarked:
+                path = getattr(result, f"no_watermark_{kind}_pdf_path") or path
+            if path:
+                paths.append(Path(path))
+        if not paths:
+            return None
+        infix = "" if watermarked else ".no_watermark"
+        return merge_pdfs(
+            paths, output_dir / f"{file.stem}{infix}.{lang_out}.{kind}.pdf"
+        )
+
+    merged = TranslateResult(merge("mono", True), merge("dual", True))
+    first = results[0]
+    # Only the first part carries the watermark
+    if first.no_watermark_mono_pdf_path not in (None, first.mono_pdf_path):
+        merged.no_watermark_mono_pdf_path = merge("mono", False)
+    if first.no_watermark_dual_pdf_path not in (None, first.dual_pdf_path):
+        merged.no_watermark_dual_pdf_path = merge("dual", False)
+
+    glossaries = [
+        Path(result.auto_extracted_glossary_path)
+        for result in results
+        if result.auto_extracted_glossary_path
+    ]
+    if glossaries:
+        merged.auto_extracted_glossary_path = _merge_glossaries(
+            glossaries, output_dir / f"{file.stem}.{lang_out}.glossary.csv"
+        )
+    merged.original_pdf_path = str(file)
+    merged.total_seconds = total_seconds
+    # The parts ran at the same time
+    memory = [getattr(result, "peak_memory_usage", None) for result in results]
+    merged.peak_memory_usage = sum(m for m in memory if m) or None
+    for name in ("total_valid_character_count", "total_valid_text_token_count"):
+        counts = [getattr(result, name, None) for result in results]
+        setattr(merged, name, sum(c for c in counts if c) or None)
+
+    finish_event = {"type": "finish", "translate_result": merged}
+    for name in SUMMED_EVENT_FIELDS:
+        parts = [event[name] for event in events if event.get(name)]
+        if parts:
+            finish_event[name] = {}
+            for counters in parts:
+                sum_counters(finish_event[name], counters)
+    for usage in finish_event.get("token_usage", {}).values():
+        usage.pop("cache_hit_ratio", None)
+        if usage.get("prompt"):
+            usage["cache_hit_ratio"] = round(
+                usage.get("cache_hit_prompt", 0) / usage["prompt"], 4
+            )
+    return finish_event
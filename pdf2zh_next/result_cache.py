@@ -0,0 +1,253 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+from babeldoc import __version__ as babeldoc_version
+from babeldoc.format.pdf.translation_config import TranslateResult
+from pydantic import BaseModel
+
+from pdf2zh_next.config.model import PDFSettings
+from pdf2zh_next.config.model import TranslationSettings
+from pdf2zh_next.config.model import get_fields_without
+from pdf2zh_next.const import __version__
+from pdf2zh_next.translator.fingerprint import _CREDENTIAL_FIELD_SUFFIXES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_CACHE_DIR = Path("~/.cache/pdf2zh_next/results").expanduser()
+
+# Bump when the layout of an entry changes
+RESULT_CACHE_VERSION = 1
+ENTRY_FILE = "result.json"
+
+# Settings that change how a document is translated, not its outputs
+_NON_OUTPUT_TRANSLATION_FIELDS = get_fields_without(
+    TranslationSettings, "changes_output"
+)
+_NON_OUTPUT_PDF_FIELDS = get_fields_without(PDFSettings, "changes_output")
+
+# PDF settings that choose the pages of a document
+_PAGE_SELECTION_FIELDS = {"pages", "only_include_translated_page"}
+
+# Outputs of a TranslateResult kept in an entry
+RESULT_PATH_FIELDS = (
+    "mono_pdf_path",
+    "dual_pdf_path",
+    "no_watermark_mono_pdf_path",
+    "no_watermark_dual_pdf_path",
+    "auto_extracted_glossary_path",
+)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _engine_payload(engine_settings: BaseModel | None) -> dict | None:
+    if engine_settings is None:
+        return None
+    # Any account of a provider translates alike
+    return {
+        name: value
+        for name, value in engine_settings.model_dump(mode="json").items()
+        if not name.endswith(_CREDENTIAL_FIELD_SUFFIXES)
+    }
+
+
+def get_settings_digest(settings, page_level: bool = False) -> str:
+    """
+    Get the SHA-256 of the settings that affect the outputs of a translation,
+    including the contents of the glossaries.
+    :param page_level: leave out the settings that choose the pages of a
+        document, for keys of single translated pages
+    """
+    glossaries = []
+    for glossary in (settings.translation.glossaries or "").split(","):
+        if glossary.strip():
+            path = Path(glossary.strip())
+            glossaries.append(_hash_file(path) if path.is_file() else glossary)
+    exclude_pdf = _NON_OUTPUT_PDF_FIELDS
+    if page_level:
+        exclude_pdf = exclude_pdf | _PAGE_SELECTION_FIELDS
+    payload = json.dumps(
+        {
+            "version": RESULT_CACHE_VERSION,
+            "pdf2zh_next": __version__,
+            "babeldoc": babeldoc_version,
+            "translation": settings.translation.model_dump(
+                mode="json", exclude=_NON_OUTPUT_TRANSLATION_FIELDS | {"glossaries"}
+            ),
+            "glossaries": glossaries,
+            "pdf": settings.pdf.model_dump(mode="json", exclude=exclude_pdf),
+            "engine": _engine_payload(settings.translate_engine_settings),
+            "term_engine": _engine_payload(settings.term_extraction_engine_settings),
+            "failover_engines": [
+                _engine_payload(engine) for engine in settings.failover_engine_settings
+            ],
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_result_cache_key(settings, file: Path) -> str:
+    """
+    Get the key of the outputs of a document: the SHA-256 of its bytes and of the
+    settings that affect the outputs.
+    """
+    key = f"{get_settings_digest(settings)}:{_hash_file(file)}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Outputs of translated documents, for documents translated again with the same
+    settings.
+
+    An entry is a directory with the output files and a result.json. The
+    modification time of result.json is the last use of the entry, the least
+    recently used entries are removed once the cache holds more than
+    ``max_size`` bytes. Entries are written to a temporary directory and renamed,
+    so processes can share the cache.
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def load(self, key: str, file: Path, output_dir: Path) -> dict | None:
+        """
+        Copy the outputs of an entry to output_dir, named after file.
+        :return: the finish event of the entry, None if there is no entry
+        """
+        entry_dir = self._entry_dir(key)
+        try:
+            entry = json.loads((entry_dir / ENTRY_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        start_time = time.monotonic()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        result = TranslateResult(None, None)
+        copied: dict[str, Path] = {}
+        try:
+            for name, stored_name in entry["paths"].items():
+                if stored_name is None:
+                    setattr(result, name, None)
+                    continue
+                if stored_name not in copied:
+                    output_name = file.stem + stored_name.removeprefix(entry["stem"])
+                    copied[stored_name] = output_dir / output_name
+                    shutil.copyfile(entry_dir / stored_name, copied[stored_name])
+                setattr(result, name, copied[stored_name])
+        except (OSError, KeyError) as e:
+            logger.warning(f"Removing broken result cache entry {key}: {e}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+        result.original_pdf_path = str(file)
+        result.total_seconds = time.monotonic() - start_time
+        result.peak_memory_usage = None
+        result.total_valid_character_count = entry.get("total_valid_character_count")
+        result.total_valid_text_token_count = entry.get("total_valid_text_token_count")
+        # Mark the entry as used
+        os.utime(entry_dir / ENTRY_FILE)
+        return {
+            "type": "finish",
+            "translate_result": result,
+            "token_usage": {},
+            "result_cache_hit": True,
+        }
+
+    def store(self, key: str, file: Path, finish_event: dict, evict: bool = True):
+        """
+        Keep the outputs of a finish event.
+        :param evict: make room for the outputs, otherwise the caller calls evict
+            after storing a batch of entries
+        """
+        if self.max_size <= 0:
+            return
+        result = finish_event["translate_result"]
+        entry_dir = self._entry_dir(key)
+        if entry_dir.exists():
+            return
+        temp_dir = self.cache_dir / f"tmp-{uuid.uuid4().hex}"
+        temp_dir.mkdir(parents=True)
+        try:
+            paths = {}
+            stored: dict[Path, str] = {}
+            for name in RESULT_PATH_FIELDS:
+                path = getattr(result, name, None)
+                if not path:
+                    paths[name] = None
+                    continue
+                path = Path(path)
+                if path not in stored:
+                    stored[path] = path.name
+                    shutil.copyfile(path, temp_dir / path.name)
+                paths[name] = stored[path]
+            entry = {
+                "stem": file.stem,
+                "paths": paths,
+                "total_valid_character_count": getattr(
+                    result, "total_valid_character_count", None
+                ),
+                "total_valid_text_token_count": getattr(
+                    result, "total_valid_text_token_count", None
+                ),
+            }
+            (temp_dir / ENTRY_FILE).write_text(json.dumps(entry), encoding="utf-8")
+            entry_dir.parent.mkdir(parents=True, exist_ok=True)
+            temp_dir.replace(entry_dir)
+        except OSError as e:
+            # Another process stored the same entry, or the outputs are gone
+            logger.debug(f"Failed to store result cache entry {key}: {e}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+        if evict:
+            self.evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for entry_file in self.cache_dir.glob(f"*/*/{ENTRY_FILE}"):
+            entry_dir = entry_file.parent
+            try:
+                last_used = entry_file.stat().st_mtime
+                size = sum(f.stat().st_size for f in entry_dir.iterdir())
+            except OSError:
+                # Removed by another process
+                continue
+            entries.append((last_used, size, entry_dir))
+        return entries
+
+    def evict(self):
+        """Remove the least recently used entries beyond the size limit."""
+        entries = sorted(self._entries())
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in entries:
+            if total_size <= self.max_size:
+                break
+            logger.debug(f"Removing least recently used result {entry_dir.name}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+
+
+def get_result_cache(settings) -> ResultCache | None:
+    """The result cache of the settings, None if it is disabled."""
+    if settings.translation.no_result_cache or settings.basic.debug:
+        return None
+    return ResultCache(
+        DEFAULT_RESULT_CACHE_DIR,
+        settings.translation.result_cache_max_size * 1024 * 1024,
+    )
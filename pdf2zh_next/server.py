@@ -46,6 +46,8 @@ class TranslationRequest(BaseModel):
 
 UPLOAD_DIR = Path("uploads")
 OUTPUT_DIR = Path("outputs")
+# Seconds between the progress updates of a stage recorded in the task logs
+TASK_PROGRESS_INTERVAL = 0.5
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 
@@ -830,7 +832,9 @@ async def run_experimental_translation(task_id, file_path, ui_inputs):
     # Run translation
     mono_pdf_path = None
     dual_pdf_path = None
-    async for event in do_translate_async_stream(settings, file_path):
+    async for event in do_translate_async_stream(
+        settings, file_path, progress_interval=TASK_PROGRESS_INTERVAL
+    ):
         # Log the event
         if isinstance(event, dict):
             event_type = event.get("type")
@@ -1,15 +1,31 @@
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import CircuitBreaker
+from pdf2zh_next.translator.circuit_breaker import CircuitOpenError
+from pdf2zh_next.translator.rate_limiter.host_rate_budget import HostRateBudget
 from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.rate_limiter.shared_qps_rate_limiter import (
+    SharedQPSRateLimiter,
+)
 from pdf2zh_next.translator.utils import get_rate_limiter
+from pdf2zh_next.translator.utils import get_shared_rate_limiter
 from pdf2zh_next.translator.utils import get_term_translator
 from pdf2zh_next.translator.utils import get_translator
+from pdf2zh_next.translator.utils import release_translators
+from pdf2zh_next.translator.utils import set_host_rate_budget
 
 __all__ = [
     "BaseTranslator",
     "BaseRateLimiter",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "HostRateBudget",
     "QPSRateLimiter",
+    "SharedQPSRateLimiter",
     "get_rate_limiter",
+    "get_shared_rate_limiter",
     "get_translator",
     "get_term_translator",
+    "release_translators",
+    "set_host_rate_budget",
 ]
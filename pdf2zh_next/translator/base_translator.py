@@ -1,15 +1,102 @@
+import collections
+import concurrent.futures
 import contextlib
 import logging
 import re
+import threading
+import time
 from abc import ABC
 from abc import abstractmethod
+from pathlib import Path
+
+from babeldoc.glossary import Glossary
+from babeldoc.utils.atomic_integer import AtomicInteger
 
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.cache import TranslationCache
+from pdf2zh_next.translator.circuit_breaker import CLOSED
+from pdf2zh_next.translator.circuit_breaker import DEFAULT_MAX_RETRY_ATTEMPTS
+from pdf2zh_next.translator.circuit_breaker import CircuitOpenError
+from pdf2zh_next.translator.circuit_breaker import get_circuit_breaker
+from pdf2zh_next.translator.circuit_breaker import get_retry_budget
+from pdf2zh_next.translator.fingerprint import get_endpoint_key
+from pdf2zh_next.translator.http_client import is_shared_http_client
+from pdf2zh_next.translator.latency_history import get_latency_history
+from pdf2zh_next.translator.segment_classifier import SegmentClassifier
+from pdf2zh_next.translator.segment_classifier import estimate_tokens
+from pdf2zh_next.translator.text_splitter import split_text
 
 logger = logging.getLogger(__name__)
 
+# Hedging starts once this many request latencies have been observed.
+HEDGE_MIN_SAMPLES = 20
+HEDGE_LATENCY_WINDOW = 200
+HEDGE_PERCENTILE = 0.95
+
+# Glossary entries put in the system message of the prompt cache layout
+MAX_SYSTEM_PROMPT_GLOSSARY_ENTRIES = 1000
+# First rules section of the BabelDOC LLM prompts, of il_translator and of
+# il_translator_llm_only, and the sections that follow their stable role and rules
+LLM_PROMPT_RULES_SECTIONS = ("\n\n## Rules", "\n\n## Structure Rules")
+LLM_PROMPT_VARIABLE_SECTIONS = ("\n\n## Glossary", "\n\n## Context", "\n\n## Output")
+# Lines of the BabelDOC LLM prompts after which the texts to translate follow
+LLM_PROMPT_INPUT_MARKERS = (
+    "Now translate the following text:",
+    "## Here is the input:",
+)
+# Placeholders of the examples in the BabelDOC LLM prompts, in the standard scheme,
+# and their form in the compact scheme
+COMPACT_PROMPT_EXAMPLES = (
+    (re.compile(r"{v(\d+)}"), r"{\1}"),
+    (re.compile(r"<style id='(\d+)'>(.*?)</style>"), r"<b\1>\2</b\1>"),
+    (re.compile(r"<style>"), "<b1>"),
+    (re.compile(r"</style>"), "</b1>"),
+)
+
+
+def split_llm_prompt(prompt: str) -> tuple[str, str] | None:
+    """
+    Split a BabelDOC LLM prompt into its stable role and rules, and the rest.
+    :return: None if the prompt has no such layout
+    """
+    starts = [
+        start
+        for section in LLM_PROMPT_RULES_SECTIONS
+        if (start := prompt.find(section)) >= 0
+    ]
+    if not starts:
+        return None
+    rules = min(starts)
+    ends = [
+        end
+        for section in LLM_PROMPT_VARIABLE_SECTIONS
+        if (end := prompt.find(section, rules)) >= 0
+    ]
+    if not ends:
+        return None
+    end = min(ends)
+    return prompt[:end].strip(), prompt[end:].strip()
+
+
+def use_compact_placeholders(prompt: str) -> str:
+    """
+    Rewrite the placeholder examples of a BabelDOC LLM prompt in the compact
+    placeholder scheme. The texts to translate are left as they are.
+    """
+    starts = [
+        start + len(marker)
+        for marker in LLM_PROMPT_INPUT_MARKERS
+        if (start := prompt.find(marker)) >= 0
+    ]
+    if not starts:
+        return prompt
+    end = min(starts)
+    instructions = prompt[:end]
+    for pattern, replacement in COMPACT_PROMPT_EXAMPLES:
+        instructions = pattern.sub(replacement, instructions)
+    return instructions + prompt[end:]
+
 
 class BaseTranslator(ABC):
     # Due to cache limitations, name should be within 20 characters.
@@ -18,6 +105,20 @@ class BaseTranslator(ABC):
 
     name = "base"
     lang_map = {}
+    # Defaults of the fail-fast mechanisms, engines override them as class attributes
+    # and users through the translation settings.
+    max_retry_attempts = DEFAULT_MAX_RETRY_ATTEMPTS
+    circuit_breaker_threshold = 5
+    circuit_breaker_cooldown = 30
+    # Request size limits of the engine. Longer texts are split into chunks that are
+    # translated in parallel, engines that batch texts group at most this many.
+    max_chars_per_request: int | None = None
+    max_items_per_batch: int | None = None
+    # Engines whose do_translate groups segments into batch requests take the rate
+    # limiter slot and report to the circuit breaker once per batch, see send_batch
+    batches_requests = False
+    # "standard" or "compact" placeholders, users override it through the translation settings
+    placeholder_scheme = "standard"
 
     def __init__(
         self,
@@ -40,6 +141,12 @@ class BaseTranslator(ABC):
         self.lang_in = lang_in
         self.lang_out = lang_out
         self.rate_limiter = rate_limiter
+        self.prompt_cache_layout = settings.translation.prompt_cache_layout
+        self.custom_system_prompt = settings.translation.custom_system_prompt
+        self.glossary_files = settings.translation.glossaries
+        self._system_prompt = None
+        if settings.translation.placeholder_scheme:
+            self.placeholder_scheme = settings.translation.placeholder_scheme
 
         self.cache = TranslationCache(
             self.name,
@@ -48,18 +155,139 @@ class BaseTranslator(ABC):
                 "lang_out": lang_out,
             },
         )
+        if self.placeholder_scheme != "standard":
+            # Cached translations contain the placeholders of their scheme
+            self.add_cache_impact_parameters(
+                "placeholder_scheme", self.placeholder_scheme
+            )
+        if self.prompt_cache_layout:
+            self.add_cache_impact_parameters("prompt_cache_layout", True)
+
+        translation_settings = settings.translation
+        if translation_settings.max_retry_attempts:
+            self.max_retry_attempts = translation_settings.max_retry_attempts
+        if translation_settings.circuit_breaker_threshold:
+            self.circuit_breaker_threshold = (
+                translation_settings.circuit_breaker_threshold
+            )
+        if translation_settings.circuit_breaker_cooldown is not None:
+            self.circuit_breaker_cooldown = (
+                translation_settings.circuit_breaker_cooldown
+            )
+        if settings.translate_engine_settings is not None:
+            endpoint_key = get_endpoint_key(settings.translate_engine_settings)
+        else:
+            endpoint_key = self.name
+        self.endpoint_key = endpoint_key
+        self.circuit_breaker = get_circuit_breaker(endpoint_key)
+        self.circuit_breaker.configure(
+            self.circuit_breaker_threshold, self.circuit_breaker_cooldown
+        )
+        self.retry_budget = get_retry_budget()
+        self.retry_budget.configure(translation_settings.retry_budget_ratio)
+
+        # Secondary translators, set by get_translator when failover engines are configured
+        self.failover_translators: list[BaseTranslator] = []
+        self.hedge_requests = translation_settings.hedge_requests
+        self.hedge_max_workers = 2 * (
+            translation_settings.pool_max_workers or translation_settings.qps or 4
+        )
+        self.hedge_executor = None
+        self.chunk_max_workers = translation_settings.pool_max_workers or 4
+        self.chunk_executor = None
+        self.latency_lock = threading.Lock()
+        self.latency_window: list[float] = []
+        # Latency of the successful requests of the current job, see record_job_latency
+        self.job_latency_total = 0.0
+        self.job_latency_count = 0
 
         self.translate_call_count = 0
         self.translate_cache_call_count = 0
+        self.hedged_request_count = 0
+        self.failover_request_count = 0
+
+        self.segment_classifier = None
+        if not translation_settings.no_skip_untranslatable_segments:
+            self.segment_classifier = SegmentClassifier(
+                self.lang_in, self.lang_out, self._get_placeholder_patterns()
+            )
+        self.skipped_segment_lock = threading.Lock()
+        self.skipped_segments = collections.Counter()
+        self.skipped_token_count = AtomicInteger()
+
+    def close(self):
+        """
+        Release the API clients and threads of the translator and of its failover
+        translators, once the translator is not used anymore.
+        """
+        if self.hedge_executor is not None:
+            self.hedge_executor.shutdown(wait=False)
+        if self.chunk_executor is not None:
+            self.chunk_executor.shutdown(wait=False)
+        client_pool = getattr(self, "client_pool", None)
+        clients = (
+            [pooled.client for pooled in client_pool.clients] if client_pool else []
+        )
+        clients.append(getattr(self, "client", None))
+        for client in {id(c): c for c in clients if c is not None}.values():
+            if is_shared_http_client(client) or not hasattr(client, "close"):
+                continue
+            try:
+                client.close()
+            except Exception as e:
+                logger.debug(f"Failed to close client of {self.name}: {e}")
+        for translator in self.failover_translators:
+            translator.close()
 
     def __del__(self):
         with contextlib.suppress(Exception):
+            if self.hedge_executor is not None:
+                self.hedge_executor.shutdown(wait=False)
+            if self.chunk_executor is not None:
+                self.chunk_executor.shutdown(wait=False)
             logger.info(
                 f"{self.name} translate call count: {self.translate_call_count}"
             )
             logger.info(
                 f"{self.name} translate cache call count: {self.translate_cache_call_count}",
             )
+            if self.hedged_request_count:
+                logger.info(
+                    f"{self.name} hedged request count: {self.hedged_request_count}"
+                )
+            if self.failover_request_count:
+                logger.info(
+                    f"{self.name} failover request count: {self.failover_request_count}"
+                )
+            if self.skipped_segments:
+                logger.info(
+                    f"{self.name} skipped segments: {dict(self.skipped_segments)}"
+                )
+
+    def reset_job_counters(self):
+        """
+        Reset the per-job counters of a translator reused by a new job, so that its token usage is reported separately.
+        """
+        self.translate_call_count = 0
+        self.translate_cache_call_count = 0
+        self.hedged_request_count = 0
+        self.failover_request_count = 0
+        for name in (
+            "token_count",
+            "prompt_token_count",
+            "completion_token_count",
+            "cache_hit_prompt_token_count",
+            "eval_count",
+            "eval_duration_ns",
+            "transport_stats",
+            "skipped_segments",
+            "skipped_token_count",
+        ):
+            counter = getattr(self, name, None)
+            if counter is not None:
+                setattr(self, name, type(counter)())
+        for translator in self.failover_translators:
+            translator.reset_job_counters()
 
     def add_cache_impact_parameters(self, k: str, v):
         """
@@ -75,6 +303,8 @@ class BaseTranslator(ABC):
         :param text: text to translate
         :return: translated text
         """
+        if self._skip_untranslatable(text):
+            return text
         self.translate_call_count += 1
         if not (self.ignore_cache or ignore_cache):
             try:
@@ -84,9 +314,20 @@ class BaseTranslator(ABC):
                     return cache
             except Exception as e:
                 logger.debug(f"try get cache failed, ignore it: {e}")
-        self.rate_limiter.wait(rate_limit_params)
-        translation = self.do_translate(text, rate_limit_params)
-        if not (self.ignore_cache or ignore_cache):
+        if self.max_chars_per_request and len(text) > self.max_chars_per_request:
+            chunks = self._split_text(text)
+            if len(chunks) > 1:
+                translation = self._translate_chunks(
+                    chunks, ignore_cache, rate_limit_params
+                )
+                if not (self.ignore_cache or ignore_cache):
+                    self.cache.set(text, translation)
+                return translation
+        translation, translator = self._translate_with_failover(
+            self.do_translate, "translate", text, ignore_cache, rate_limit_params
+        )
+        # Translations of failover engines are cached by the failover translator
+        if not (self.ignore_cache or ignore_cache) and translator is self:
             self.cache.set(text, translation)
         return translation
 
@@ -97,6 +338,9 @@ class BaseTranslator(ABC):
         :return: translated text
         """
         self.translate_call_count += 1
+        if self.placeholder_scheme == "compact":
+            # BabelDOC shows the model examples of the standard placeholders
+            text = use_compact_placeholders(text)
         if not (self.ignore_cache or ignore_cache):
             try:
                 cache = self.cache.get(text)
@@ -105,12 +349,266 @@ class BaseTranslator(ABC):
                     return cache
             except Exception as e:
                 logger.debug(f"try get cache failed, ignore it: {e}")
-        self.rate_limiter.wait(rate_limit_params)
-        translation = self.do_llm_translate(text, rate_limit_params)
-        if not (self.ignore_cache or ignore_cache):
+        translation, translator = self._translate_with_failover(
+            self.do_llm_translate,
+            "llm_translate",
+            text,
+            ignore_cache,
+            rate_limit_params,
+        )
+        # Translations of failover engines are cached by the failover translator
+        if not (self.ignore_cache or ignore_cache) and translator is self:
             self.cache.set(text, translation)
         return translation
 
+    def check_health(self):
+        """
+        Send a short translation request to this engine to validate its settings,
+        bypassing the segment classifier, the cache and the failover engines.
+        """
+        self.translate_call_count += 1
+        self._before_request()
+        self._timed_call(self.do_translate, "Hello")
+
+    def _get_placeholder_patterns(self) -> list[str]:
+        """Regexes of the formula and rich text placeholders, with any id."""
+        return [
+            self.get_formular_placeholder(r"\d+")[1],
+            self.get_rich_text_left_placeholder(r"\d+")[1],
+            self.get_rich_text_right_placeholder(r"\d+")[1],
+        ]
+
+    def _skip_untranslatable(self, text) -> bool:
+        """
+        Whether the segment is returned unchanged, without a request to the engine.
+        """
+        if self.segment_classifier is None or not isinstance(text, str):
+            return False
+        reason = self.segment_classifier.classify(text)
+        if reason is None:
+            return False
+        with self.skipped_segment_lock:
+            self.skipped_segments[reason] += 1
+        self.skipped_token_count.inc(estimate_tokens(text))
+        return True
+
+    def _split_text(self, text: str) -> list[tuple[str, str]]:
+        """
+        Split text longer than max_chars_per_request, keeping placeholders whole.
+        """
+        formular, left, right = self._get_placeholder_patterns()
+        return split_text(
+            text,
+            self.max_chars_per_request,
+            atomic_patterns=[formular, left, right],
+            paired_patterns=[(left, right)],
+        )
+
+    def _translate_chunks(
+        self, chunks, ignore_cache=False, rate_limit_params: dict = None
+    ) -> str:
+        if self.chunk_executor is None:
+            self.chunk_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.chunk_max_workers,
+                thread_name_prefix=f"{self.name}-chunk",
+            )
+        logger.debug(f"Translate a text of {self.name} in {len(chunks)} chunks")
+        futures = [
+            self.chunk_executor.submit(
+                self.translate, chunk, ignore_cache, rate_limit_params
+            )
+            for chunk, _ in chunks
+        ]
+        return "".join(
+            future.result() + separator
+            for future, (_, separator) in zip(futures, chunks, strict=True)
+        )
+
+    def is_available(self) -> bool:
+        """
+        Whether requests can currently be served, by this engine or a failover engine.
+        """
+        return not self.circuit_breaker.is_open or any(
+            not translator.circuit_breaker.is_open
+            for translator in self.failover_translators
+        )
+
+    def _get_failover_translator(self, exclude=()):
+        for translator in self.failover_translators:
+            if translator not in exclude and not translator.circuit_breaker.is_open:
+                return translator
+        return None
+
+    def _translate_with_failover(
+        self, func, method_name, text, ignore_cache, rate_limit_params: dict = None
+    ):
+        """
+        Translate with this engine, and continue with the failover engines once its circuit is open.
+        :return: translation and the translator that produced it
+        """
+        try:
+            return self._translate_with_hedging(
+                func, method_name, text, ignore_cache, rate_limit_params
+            )
+        except NotImplementedError:
+            raise
+        except Exception as e:
+            if not self.circuit_breaker.is_open and not isinstance(e, CircuitOpenError):
+                raise
+            tried = []
+            while (failover := self._get_failover_translator(tried)) is not None:
+                tried.append(failover)
+                logger.debug(
+                    f"{self.name} is unavailable, fail over to {failover.name}"
+                )
+                self.failover_request_count += 1
+                try:
+                    translation = getattr(failover, method_name)(
+                        text, ignore_cache, rate_limit_params
+                    )
+                    return translation, failover
+                except Exception:
+                    if not failover.circuit_breaker.is_open:
+                        raise
+            raise
+
+    def _get_hedge_delay(self) -> float | None:
+        if not self.hedge_requests:
+            return None
+        with self.latency_lock:
+            if len(self.latency_window) < HEDGE_MIN_SAMPLES:
+                return None
+            latencies = sorted(self.latency_window)
+        return latencies[int(len(latencies) * HEDGE_PERCENTILE)]
+
+    def _record_latency(self, latency: float):
+        with self.latency_lock:
+            self.job_latency_total += latency
+            self.job_latency_count += 1
+            if not self.hedge_requests:
+                return
+            self.latency_window.append(latency)
+            if len(self.latency_window) > HEDGE_LATENCY_WINDOW:
+                del self.latency_window[0]
+
+    def _timed_call(self, func, text, rate_limit_params: dict = None):
+        start = time.monotonic()
+        translation = self._call_with_circuit_breaker(func, text, rate_limit_params)
+        self._record_latency(time.monotonic() - start)
+        return translation
+
+    def record_job_latency(self):
+        """Add the request latency of the current job to the latency history."""
+        with self.latency_lock:
+            total, count = self.job_latency_total, self.job_latency_count
+            self.job_latency_total = 0.0
+            self.job_latency_count = 0
+        get_latency_history().record(self.endpoint_key, total, count)
+
+    def end_job(self):
+        """
+        Called when the job using the translator has finished, before the
+        translator is returned to the translator pool. Subclasses may override
+        this to save state for later jobs, and must call the parent method.
+        """
+        self.record_job_latency()
+        for translator in self.failover_translators:
+            translator.end_job()
+
+    def _hedge_call(self, func, text, rate_limit_params: dict = None):
+        self._before_request(rate_limit_params)
+        return self._call_with_circuit_breaker(func, text, rate_limit_params)
+
+    def _translate_with_hedging(
+        self, func, method_name, text, ignore_cache, rate_limit_params: dict = None
+    ):
+        """
+        Send the request, and a duplicate once it takes longer than the observed p95 latency.
+        The first successful result wins, the slower request is left to finish in the background.
+        :return: translation and the translator that produced it
+        """
+        self._before_request(rate_limit_params)
+        hedge_delay = self._get_hedge_delay()
+        if hedge_delay is None:
+            return self._timed_call(func, text, rate_limit_params), self
+
+        if self.hedge_executor is None:
+            self.hedge_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.hedge_max_workers,
+                thread_name_prefix=f"{self.name}-hedge",
+            )
+        primary = self.hedge_executor.submit(
+            self._timed_call, func, text, rate_limit_params
+        )
+        try:
+            return primary.result(timeout=hedge_delay), self
+        except concurrent.futures.TimeoutError:
+            pass
+
+        hedge_translator = self._get_failover_translator()
+        if hedge_translator is not None:
+            hedge = self.hedge_executor.submit(
+                getattr(hedge_translator, method_name),
+                text,
+                ignore_cache,
+                rate_limit_params,
+            )
+        elif self.circuit_breaker.state == CLOSED:
+            hedge_translator = self
+            hedge = self.hedge_executor.submit(
+                self._hedge_call, func, text, rate_limit_params
+            )
+        else:
+            return primary.result(), self
+        self.hedged_request_count += 1
+
+        futures = {primary: self, hedge: hedge_translator}
+        for future in concurrent.futures.as_completed(futures):
+            if future.exception() is None:
+                return future.result(), futures[future]
+        return primary.result(), self
+
+    def _before_request(self, rate_limit_params: dict = None):
+        """
+        Check the endpoint's circuit breaker and wait for a rate limiter slot.
+        """
+        if self.batches_requests:
+            # Done once for the whole batch request by send_batch
+            return
+        self.circuit_breaker.before_request()
+        self.rate_limiter.wait(rate_limit_params)
+
+    def _call_with_circuit_breaker(self, func, text, rate_limit_params: dict = None):
+        """
+        Call func and report its outcome to the endpoint's circuit breaker and the retry budget.
+        """
+        if self.batches_requests:
+            # The outcome of the batch request is reported by send_batch
+            return func(text, rate_limit_params)
+        return self._report_outcome(func, text, rate_limit_params)
+
+    def _report_outcome(self, func, *args):
+        try:
+            result = func(*args)
+        except NotImplementedError:
+            raise
+        except Exception:
+            self.circuit_breaker.record_failure()
+            raise
+        self.circuit_breaker.record_success()
+        self.retry_budget.record_success()
+        return result
+
+    def send_batch(self, send, texts: list[str]) -> list[str]:
+        """
+        Send one batch request of an engine with batches_requests: the batch takes a
+        single rate limiter slot and its outcome counts once for the circuit breaker.
+        :param send: function sending the request, returns the translated texts
+        """
+        self.circuit_breaker.before_request()
+        self.rate_limiter.wait()
+        return self._report_outcome(send, texts)
+
     def do_llm_translate(self, text, rate_limit_params: dict = None):
         """
         Actual translate text, override this method
@@ -154,6 +652,12 @@ class BaseTranslator(ABC):
         :param placeholder_id: placeholder id
         :return formated placeholder and regex placeholder
         """
+        if self.placeholder_scheme == "compact":
+            # Also recover full-width braces and spaces added by the model
+            return (
+                "{" + str(placeholder_id) + "}",
+                f"[{{｛]\\s*{placeholder_id}\\s*[}}｝]",
+            )
         return "{v" + str(placeholder_id) + "}", f"{{\\s*v\\s*{placeholder_id}\\s*}}"
 
     def get_rich_text_left_placeholder(self, placeholder_id: int):
@@ -162,6 +666,11 @@ class BaseTranslator(ABC):
         :param placeholder_id: placeholder id
         :return the start label of rich text and regex start label
         """
+        if self.placeholder_scheme == "compact":
+            return (
+                f"<b{placeholder_id}>",
+                f"[<＜]\\s*b\\s*{placeholder_id}\\s*[>＞]",
+            )
         return (
             f"<style id='{placeholder_id}'>",
             f"<\\s*style\\s*id\\s*=\\s*'\\s*{placeholder_id}\\s*'\\s*>",
@@ -172,14 +681,80 @@ class BaseTranslator(ABC):
         get rich text placeholder
         :return the end label of rich text and regex end label
         """
+        if self.placeholder_scheme == "compact":
+            return (
+                f"</b{placeholder_id}>",
+                f"[<＜]\\s*[/／]\\s*b\\s*{placeholder_id}\\s*[>＞]",
+            )
         return "</style>", r"<\s*\/\s*style\s*>"
 
+    def _load_glossary_entries(self) -> list[tuple[str, str]]:
+        entries = []
+        if not self.glossary_files:
+            return entries
+        for file in self.glossary_files.split(","):
+            try:
+                glossary = Glossary.from_csv(Path(file), target_lang_out=self.lang_out)
+            except Exception as e:
+                logger.warning(f"Failed to load glossary {file} for the prompt: {e}")
+                continue
+            entries.extend((entry.source, entry.target) for entry in glossary.entries)
+        if len(entries) > MAX_SYSTEM_PROMPT_GLOSSARY_ENTRIES:
+            logger.warning(
+                f"Only the first {MAX_SYSTEM_PROMPT_GLOSSARY_ENTRIES} of {len(entries)} glossary entries are put in the system prompt"
+            )
+            entries = entries[:MAX_SYSTEM_PROMPT_GLOSSARY_ENTRIES]
+        return entries
+
+    def system_prompt(self) -> str:
+        """
+        The system message of the prompt cache layout, identical for every segment.
+        """
+        if self._system_prompt is not None:
+            return self._system_prompt
+        parts = [
+            self.custom_system_prompt.strip()
+            if self.custom_system_prompt
+            else "You are a professional,authentic machine translation engine.",
+            f"Treat the user message as plain text input and translate it into {self.lang_out}, output translation ONLY. If translation is unnecessary (e.g. proper nouns, codes, {'{{1}}, etc. '}), return the original text. NO explanations. NO notes.",
+        ]
+        if entries := self._load_glossary_entries():
+            parts.append(
+                "Always use the Target Term of this glossary for its Source Term:\n"
+                "| Source Term | Target Term |\n|-------------|-------------|\n"
+                + "\n".join(f"| {source} | {target} |" for source, target in entries)
+            )
+        self._system_prompt = "\n\n".join(parts)
+        return self._system_prompt
+
+    def llm_messages(self, text: str) -> list[dict]:
+        """
+        Chat messages of a prompt built by BabelDOC for llm_translate.
+        """
+        if self.prompt_cache_layout and (split := split_llm_prompt(text)):
+            system, user = split
+            return [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ]
+        return [
+            {
+                "role": "user",
+                "content": text,
+            },
+        ]
+
     def prompt(self, text):
         """
         concatent the prompt
         :param text: input text
         :return: the whole prompt for LLM translator
         """
+        if self.prompt_cache_layout:
+            return [
+                {"role": "system", "content": self.system_prompt()},
+                {"role": "user", "content": text},
+            ]
         return [
             {
                 "role": "user",
@@ -87,6 +87,26 @@ class TranslationCache:
         )
         return result.translation if result else None
 
+    def get_many(self, original_texts: list[str]) -> dict[str, str]:
+        """Translations of the cached texts among original_texts, in few queries."""
+        translations = {}
+        texts = list(dict.fromkeys(original_texts))
+        # Stay below the number of variables sqlite allows in a query
+        for i in range(0, len(texts), 500):
+            query = _TranslationCache.select(
+                _TranslationCache.original_text, _TranslationCache.translation
+            ).where(
+                (_TranslationCache.translate_engine == self.translate_engine)
+                & (
+                    _TranslationCache.translate_engine_params
+                    == self.translate_engine_params
+                )
+                & (_TranslationCache.original_text.in_(texts[i : i + 500]))
+            )
+            for row in query:
+                translations[row.original_text] = row.translation
+        return translations
+
     def set(self, original_text: str, translation: str):
         try:
             _TranslationCache.create(
@@ -0,0 +1,225 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from tenacity import RetryCallState
+from tenacity.stop import stop_base
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_MAX_RETRY_ATTEMPTS = 5
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected because the endpoint's circuit is open."""
+
+    def __init__(self, endpoint_key: str, retry_after: float = 0.0):
+        super().__init__(
+            f"Translation service {endpoint_key} is unavailable, "
+            f"requests are rejected for {retry_after:.0f}s"
+        )
+        self.endpoint_key = endpoint_key
+        self.retry_after = retry_after
+
+    def __reduce__(self):
+        return self.__class__, (self.endpoint_key, self.retry_after)
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker shared by every translator that calls the same provider endpoint.
+
+    closed:    requests pass; ``failure_threshold`` consecutive failures open the circuit.
+    open:      requests are rejected with CircuitOpenError for ``recovery_timeout`` seconds.
+    half_open: a single probe request passes; its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        endpoint_key: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ):
+        self.endpoint_key = endpoint_key
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.lock = threading.Lock()
+        self._state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.open_listeners: list[Callable[[CircuitBreaker], None]] = []
+
+    @property
+    def state(self) -> str:
+        with self.lock:
+            return self._current_state()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def _current_state(self) -> str:
+        if (
+            self._state == OPEN
+            and time.monotonic() - self.opened_at >= self.recovery_timeout
+        ):
+            self._state = HALF_OPEN
+            self.probe_in_flight = False
+        return self._state
+
+    def configure(
+        self,
+        failure_threshold: int | None = None,
+        recovery_timeout: float | None = None,
+    ):
+        with self.lock:
+            if failure_threshold is not None:
+                self.failure_threshold = failure_threshold
+            if recovery_timeout is not None:
+                self.recovery_timeout = recovery_timeout
+
+    def before_request(self):
+        """
+        Check whether a request may be sent.
+        :raises CircuitOpenError: the circuit is open, or a half-open probe is already in flight
+        """
+        with self.lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return
+            retry_after = max(
+                self.recovery_timeout - (time.monotonic() - self.opened_at), 0.0
+            )
+        raise CircuitOpenError(self.endpoint_key, retry_after)
+
+    def record_success(self):
+        with self.lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit of {self.endpoint_key} closed")
+            self._state = CLOSED
+            self.consecutive_failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            state = self._current_state()
+            self.consecutive_failures += 1
+            if state == HALF_OPEN or (
+                state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._state = OPEN
+                self.opened_at = time.monotonic()
+                self.probe_in_flight = False
+                listeners = list(self.open_listeners)
+            else:
+                return
+        logger.warning(
+            f"Circuit of {self.endpoint_key} opened after "
+            f"{self.consecutive_failures} consecutive failures"
+        )
+        for listener in listeners:
+            try:
+                listener(self)
+            except Exception as e:
+                logger.error(f"Error in circuit breaker listener: {e}")
+
+    def add_open_listener(self, listener: Callable[["CircuitBreaker"], None]):
+        with self.lock:
+            self.open_listeners.append(listener)
+
+    def remove_open_listener(self, listener: Callable[["CircuitBreaker"], None]):
+        with self.lock:
+            if listener in self.open_listeners:
+                self.open_listeners.remove(listener)
+
+
+class RetryBudget:
+    """
+    Caps retries to a ratio of successful requests across all translators of the process.
+
+    Every success deposits ``ratio`` tokens, every retry withdraws one. The budget
+    starts full and holds at most ``burst`` tokens, so that a cold process can
+    still retry while a long running one cannot save up retries. During an
+    outage there are no successes, so the budget runs dry after a handful of retries
+    instead of every worker sleeping through its own retry loop.
+    """
+
+    def __init__(self, ratio: float = 0.2, burst: int = 10):
+        self.ratio = ratio
+        self.burst = burst
+        self.lock = threading.Lock()
+        self.tokens = float(burst)
+
+    def configure(self, ratio: float | None = None):
+        with self.lock:
+            if ratio is not None and ratio >= 0:
+                self.ratio = ratio
+
+    def record_success(self):
+        with self.lock:
+            self.tokens = min(self.tokens + self.ratio, float(self.burst))
+
+    def try_acquire(self) -> bool:
+        with self.lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+_retry_budget = RetryBudget()
+
+
+def get_circuit_breaker(
+    endpoint_key: str,
+    failure_threshold: int = 5,
+    recovery_timeout: float = 30.0,
+) -> CircuitBreaker:
+    """Get the process-wide circuit breaker of an endpoint, creating it on first use."""
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(endpoint_key)
+        if breaker is None:
+            breaker = CircuitBreaker(endpoint_key, failure_threshold, recovery_timeout)
+            _circuit_breakers[endpoint_key] = breaker
+    return breaker
+
+
+def get_retry_budget() -> RetryBudget:
+    return _retry_budget
+
+
+class stop_translator_retry(stop_base):  # noqa: N801
+    """
+    Tenacity stop condition for translator methods.
+
+    Stops at the translator's ``max_retry_attempts``, when the endpoint's circuit is
+    open, or when the process-wide retry budget is exhausted. Tenacity only evaluates
+    the stop condition before a retry, so a budget token is withdrawn per retry.
+    """
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        translator = retry_state.args[0] if retry_state.args else None
+        max_attempts = getattr(
+            translator, "max_retry_attempts", DEFAULT_MAX_RETRY_ATTEMPTS
+        )
+        if retry_state.attempt_number >= max_attempts:
+            return True
+        breaker = getattr(translator, "circuit_breaker", None)
+        if breaker is not None and breaker.is_open:
+            logger.warning(f"Circuit of {breaker.endpoint_key} is open, stop retrying")
+            return True
+        if not get_retry_budget().try_acquire():
+            logger.warning("Retry budget exhausted, stop retrying")
+            return True
+        return False
@@ -0,0 +1,166 @@
+import contextlib
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from pdf2zh_next.config.translate_engine_model import split_list
+from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def pair_keys_and_urls(
+    api_keys: str | None, base_urls: str | None
+) -> list[tuple[str | None, str | None]]:
+    """Pair comma separated API keys and base URLs.
+
+    A single key is used for every URL and a single URL for every key,
+    otherwise keys and URLs are paired by position.
+    """
+    keys = split_list(api_keys) or [None]
+    urls = split_list(base_urls) or [None]
+    if len(keys) == 1:
+        return [(keys[0], url) for url in urls]
+    if len(urls) == 1:
+        return [(key, urls[0]) for key in keys]
+    if len(keys) != len(urls):
+        raise ValueError(
+            "The number of API keys and base URLs must match when both are lists"
+        )
+    return list(zip(keys, urls, strict=True))
+
+
+class PooledClient:
+    def __init__(
+        self,
+        client: Any,
+        name: str,
+        weight: float = 1.0,
+        rate_limiter: BaseRateLimiter | None = None,
+    ):
+        self.client = client
+        self.name = name
+        self.weight = weight
+        self.rate_limiter = rate_limiter
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.request_count = 0
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+
+class ClientPool:
+    """
+    Spreads requests across several API clients (keys and/or endpoints) of one engine.
+
+    The healthy client with the fewest in-flight requests relative to its weight is
+    picked. A failing client is put aside for a cooldown that doubles with every
+    consecutive failure, up to ``max_cooldown`` seconds.
+    """
+
+    def __init__(
+        self,
+        clients: list[PooledClient],
+        base_cooldown: float = 5.0,
+        max_cooldown: float = 60.0,
+    ):
+        if not clients:
+            raise ValueError("ClientPool needs at least one client")
+        self.clients = clients
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.lock = threading.Lock()
+        self.next_index = 0
+
+    @classmethod
+    def from_keys_and_urls(
+        cls,
+        api_keys: str | None,
+        base_urls: str | None,
+        weights: str | None,
+        client_factory: Callable[[str | None, str | None], Any],
+        qps: int | None = None,
+    ) -> "ClientPool":
+        """Create a pool from comma separated settings.
+
+        :param client_factory: creates one API client from an api key and a base url
+        :param qps: total qps of the engine, shared between clients by weight
+        """
+        pairs = pair_keys_and_urls(api_keys, base_urls)
+        weight_list = [float(w) for w in split_list(weights)] or [1.0] * len(pairs)
+        if len(weight_list) != len(pairs):
+            raise ValueError("The number of weights must match the number of API keys")
+        total_weight = sum(weight_list)
+        clients = []
+        for i, ((api_key, base_url), weight) in enumerate(
+            zip(pairs, weight_list, strict=True)
+        ):
+            rate_limiter = None
+            if qps and len(pairs) > 1:
+                rate_limiter = QPSRateLimiter(
+                    max(1, round(qps * weight / total_weight))
+                )
+            clients.append(
+                PooledClient(
+                    client_factory(api_key, base_url),
+                    name=f"#{i}" + (f" {base_url}" if base_url else ""),
+                    weight=weight,
+                    rate_limiter=rate_limiter,
+                )
+            )
+        return cls(clients)
+
+    def __len__(self):
+        return len(self.clients)
+
+    def _select(self) -> PooledClient:
+        now = time.monotonic()
+        healthy = [c for c in self.clients if c.is_healthy(now)]
+        if not healthy:
+            # Every client is cooling down, use the one that recovers first
+            return min(self.clients, key=lambda c: c.unhealthy_until)
+        # Start the scan at a rotating index so that ties are broken round robin
+        count = len(healthy)
+        start = self.next_index % count
+        self.next_index += 1
+        ordered = healthy[start:] + healthy[:start]
+        return min(ordered, key=lambda c: (c.in_flight + 1) / c.weight)
+
+    @contextlib.contextmanager
+    def acquire(self, rate_limit_params: dict = None):
+        """
+        Pick a client for one request, and record the outcome of the request.
+        """
+        with self.lock:
+            pooled = self._select()
+            pooled.in_flight += 1
+            pooled.request_count += 1
+        try:
+            if pooled.rate_limiter:
+                pooled.rate_limiter.wait(rate_limit_params)
+            yield pooled.client
+        except Exception:
+            with self.lock:
+                pooled.consecutive_failures += 1
+                cooldown = min(
+                    self.base_cooldown * 2 ** (pooled.consecutive_failures - 1),
+                    self.max_cooldown,
+                )
+                pooled.unhealthy_until = time.monotonic() + cooldown
+            if len(self.clients) > 1:
+                logger.warning(
+                    f"Client {pooled.name} failed, put aside for {cooldown:.0f}s"
+                )
+            raise
+        else:
+            with self.lock:
+                pooled.consecutive_failures = 0
+                pooled.unhealthy_until = 0.0
+        finally:
+            with self.lock:
+                pooled.in_flight -= 1
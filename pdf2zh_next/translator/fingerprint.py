@@ -0,0 +1,111 @@
+import hashlib
+import json
+
+from pydantic import BaseModel
+
+from pdf2zh_next.config.model import TranslationSettings
+from pdf2zh_next.config.model import get_fields_without
+
+# Field name suffixes that identify where an engine sends its requests
+# and which account the requests are billed to.
+_ENDPOINT_FIELD_SUFFIXES = ("_base_url", "_host", "_url", "_endpoint")
+_CREDENTIAL_FIELD_SUFFIXES = ("_api_key", "_apikey", "_auth_key", "_secret_id")
+
+
+def _short_hash(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+def get_endpoint_key(translator_config: BaseModel) -> str:
+    """Get a key identifying the provider endpoint (and account) of an engine.
+
+    Two engine settings that only differ in model, temperature, prompt, etc.
+    share the same endpoint key, because they draw from the same provider quota.
+    Credentials are hashed so the key can safely appear in logs.
+
+    Args:
+        translator_config: Concrete translation engine settings instance.
+
+    Returns:
+        A stable string key, e.g. ``OpenAI|https://api.deepseek.com/v1|1a2b...``.
+    """
+    engine_type = (
+        getattr(translator_config, "translate_engine_type", None)
+        or type(translator_config).__name__
+    )
+
+    endpoints = []
+    credentials = []
+    for field_name in sorted(type(translator_config).model_fields):
+        value = getattr(translator_config, field_name, None)
+        if not value or not isinstance(value, str):
+            continue
+        if field_name.endswith(_ENDPOINT_FIELD_SUFFIXES):
+            endpoints.append(value.strip().rstrip("/"))
+        elif field_name.endswith(_CREDENTIAL_FIELD_SUFFIXES):
+            credentials.append(value.strip())
+
+    endpoint = ",".join(endpoints) or "default"
+    credential = _short_hash(",".join(credentials)) if credentials else "anonymous"
+    return f"{engine_type}|{endpoint}|{credential}"
+
+
+# Translation settings that only affect a single job, not how a translator is built.
+_JOB_ONLY_TRANSLATION_FIELDS = get_fields_without(
+    TranslationSettings, "builds_translator"
+)
+
+
+def get_translator_fingerprint(
+    settings: BaseModel, translator_config: BaseModel, role: str = "main"
+) -> str:
+    """Get a stable fingerprint of everything a translator instance is built from.
+
+    Two jobs with the same fingerprint can share a translator instance.
+
+    Args:
+        settings: Global settings model.
+        translator_config: Concrete translation engine settings instance.
+        role: ``main`` or ``term``, they get different rate limiter priorities.
+
+    Returns:
+        A hex digest.
+    """
+    translation = settings.translation.model_dump(
+        mode="json", exclude=_JOB_ONLY_TRANSLATION_FIELDS
+    )
+    failover = [
+        failover_config.model_dump(mode="json")
+        for failover_config in getattr(settings, "failover_engine_settings", [])
+    ]
+    payload = json.dumps(
+        {
+            "role": role,
+            "engine": translator_config.model_dump(mode="json"),
+            "translation": translation,
+            "failover": failover if role == "main" else [],
+            "has_glossaries": bool(settings.translation.glossaries),
+            # The prompt cache layout puts the glossaries in the system prompt
+            "prompt_glossaries": settings.translation.glossaries
+            if settings.translation.prompt_cache_layout
+            else None,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_engine_fingerprint(translator_config: BaseModel) -> str:
+    """Get a stable fingerprint of the engine settings alone, e.g. for health checks.
+
+    Args:
+        translator_config: Concrete translation engine settings instance.
+
+    Returns:
+        A hex digest.
+    """
+    payload = json.dumps(
+        translator_config.model_dump(mode="json"), sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
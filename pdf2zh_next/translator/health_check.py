@@ -0,0 +1,79 @@
+import logging
+import threading
+import time
+from pathlib import Path
+
+from pdf2zh_next.utils.json_file import read_json_file
+from pdf2zh_next.utils.json_file import write_json_file
+
+logger = logging.getLogger(__name__)
+
+
+def _default_health_check_path() -> Path:
+    cache_folder = Path.home() / ".cache" / "pdf2zh_next"
+    return cache_folder / "health_check.v1.json"
+
+
+class HealthCheckMemo:
+    """
+    Remembers successful translator health checks per engine fingerprint.
+
+    Results are kept in memory and in a small JSON file, so that the translation
+    subprocesses of later files and tasks can skip the live check as well.
+    Only successes are remembered; a failing engine is checked again every time.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or _default_health_check_path()
+        self.lock = threading.Lock()
+        self.memo: dict[str, float] = {}
+
+    def _read_file(self) -> dict[str, float]:
+        try:
+            data = read_json_file(self.path)
+            if isinstance(data, dict):
+                return {
+                    k: float(v) for k, v in data.items() if isinstance(v, int | float)
+                }
+        except Exception as e:
+            logger.debug(f"Failed to read health check memo, ignore it: {e}")
+        return {}
+
+    def _write_file(self, data: dict[str, float]):
+        try:
+            write_json_file(self.path, data)
+        except Exception as e:
+            logger.debug(f"Failed to write health check memo, ignore it: {e}")
+
+    def is_healthy(self, fingerprint: str, ttl: float) -> bool:
+        """
+        Whether the engine with the given fingerprint passed a health check within ttl seconds.
+        """
+        if ttl <= 0:
+            return False
+        now = time.time()
+        with self.lock:
+            checked_at = self.memo.get(fingerprint)
+            if checked_at is None:
+                checked_at = self._read_file().get(fingerprint)
+                if checked_at is not None:
+                    self.memo[fingerprint] = checked_at
+        return checked_at is not None and 0 <= now - checked_at < ttl
+
+    def record_success(self, fingerprint: str, ttl: float):
+        if ttl <= 0:
+            return
+        now = time.time()
+        with self.lock:
+            self.memo[fingerprint] = now
+            # Merge with the entries written by other processes, dropping expired ones
+            data = {k: v for k, v in self._read_file().items() if now - v < ttl}
+            data[fingerprint] = now
+            self._write_file(data)
+
+
+_health_check_memo = HealthCheckMemo()
+
+
+def get_health_check_memo() -> HealthCheckMemo:
+    return _health_check_memo
@@ -0,0 +1,83 @@
+import importlib.util
+import logging
+import threading
+
+import httpx
+from babeldoc.utils.atomic_integer import AtomicInteger
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 is only enabled when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+SHARED_CLIENT_LIMITS = httpx.Limits(
+    max_connections=200,
+    max_keepalive_connections=100,
+    keepalive_expiry=60,
+)
+
+
+class TransportStats:
+    """
+    Connection reuse of the HTTP requests made by one translator.
+
+    Counted from httpcore trace events, pass ``extensions`` to every request.
+    """
+
+    def __init__(self):
+        self.request_count = AtomicInteger()
+        self.connection_count = AtomicInteger()
+        self.tls_handshake_count = AtomicInteger()
+
+    def trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            self.connection_count.inc()
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshake_count.inc()
+        elif event_name in (
+            "http11.send_request_headers.started",
+            "http2.send_request_headers.started",
+        ):
+            self.request_count.inc()
+
+    @property
+    def extensions(self) -> dict:
+        return {"trace": self.trace}
+
+    @property
+    def reused_connection_count(self) -> int:
+        return max(0, self.request_count.value - self.connection_count.value)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.request_count.value,
+            "connections": self.connection_count.value,
+            "tls_handshakes": self.tls_handshake_count.value,
+            "reused_connections": self.reused_connection_count,
+        }
+
+
+_shared_client: httpx.Client | None = None
+_shared_client_lock = threading.Lock()
+
+
+def get_shared_http_client() -> httpx.Client:
+    """
+    Get the process-level pooled HTTP client, shared by all translators so that
+    connections are kept alive across segments and jobs.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None or _shared_client.is_closed:
+            _shared_client = httpx.Client(
+                limits=SHARED_CLIENT_LIMITS,
+                http2=HTTP2_AVAILABLE,
+                timeout=60,
+            )
+            logger.debug(f"Created shared HTTP client, http2: {HTTP2_AVAILABLE}")
+        return _shared_client
+
+
+def is_shared_http_client(client) -> bool:
+    """Whether client is the process-level client, which translators must not close."""
+    return client is not None and client is _shared_client
@@ -0,0 +1,77 @@
+import logging
+import threading
+from pathlib import Path
+
+from pdf2zh_next.utils.json_file import read_json_file
+from pdf2zh_next.utils.json_file import write_json_file
+
+logger = logging.getLogger(__name__)
+
+# Requests of earlier jobs weigh at most as much as this many requests of a new job,
+# so that the mean follows an engine that became faster or slower
+MAX_HISTORY_WEIGHT = 1000
+
+
+def _default_latency_history_path() -> Path:
+    cache_folder = Path.home() / ".cache" / "pdf2zh_next"
+    return cache_folder / "latency.v1.json"
+
+
+class LatencyHistory:
+    """
+    Mean request latency of every translation endpoint, over earlier jobs.
+
+    Kept in a small JSON file shared by all processes, for estimating the
+    duration of a translation before it starts. The history is best-effort: the
+    file is not locked, so when two processes record at the same time the
+    requests of one of them may be lost.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or _default_latency_history_path()
+        self.lock = threading.Lock()
+
+    def _read_file(self) -> dict[str, dict]:
+        try:
+            data = read_json_file(self.path)
+            if isinstance(data, dict):
+                return {
+                    k: v
+                    for k, v in data.items()
+                    if isinstance(v, dict) and {"mean", "count"} <= v.keys()
+                }
+        except Exception as e:
+            logger.debug(f"Failed to read latency history, ignore it: {e}")
+        return {}
+
+    def _write_file(self, data: dict[str, dict]):
+        try:
+            write_json_file(self.path, data)
+        except Exception as e:
+            logger.debug(f"Failed to write latency history, ignore it: {e}")
+
+    def get(self, endpoint_key: str) -> float | None:
+        """Mean latency in seconds of the requests to an endpoint, None if unknown."""
+        entry = self._read_file().get(endpoint_key)
+        return float(entry["mean"]) if entry else None
+
+    def record(self, endpoint_key: str, total_seconds: float, count: int):
+        """Add the latencies of count requests of a job, summing to total_seconds."""
+        if count <= 0:
+            return
+        with self.lock:
+            data = self._read_file()
+            entry = data.get(endpoint_key, {"mean": 0.0, "count": 0})
+            weight = min(entry["count"], MAX_HISTORY_WEIGHT)
+            data[endpoint_key] = {
+                "mean": (entry["mean"] * weight + total_seconds) / (weight + count),
+                "count": entry["count"] + count,
+            }
+            self._write_file(data)
+
+
+_latency_history = LatencyHistory()
+
+
+def get_latency_history() -> LatencyHistory:
+    return _latency_history
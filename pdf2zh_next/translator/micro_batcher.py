@@ -0,0 +1,111 @@
+import logging
+import threading
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class _Batch:
+    def __init__(self):
+        self.texts: list[str] = []
+        self.char_count = 0
+        self.closed = False
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results: list[str] | None = None
+        self.error: BaseException | None = None
+
+
+class MicroBatcher:
+    """
+    Groups texts translated concurrently by pool threads into batch requests.
+
+    The first thread to submit a text opens a batch. While fewer than
+    ``max_in_flight`` batches are being sent it sends the batch at once, so a lone
+    caller is not delayed; otherwise it waits up to ``wait`` seconds for other
+    threads to join it. A batch is sent at once when it reaches ``max_chars``
+    characters or ``max_items`` texts. A text that does not fit in the open batch
+    starts a new one. Every thread gets the translation of its own text, or the
+    error of its batch.
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[list[str]], list[str]],
+        max_chars: int,
+        max_items: int | None = None,
+        wait: float = 0.05,
+        max_in_flight: int = 1,
+    ):
+        self.send_batch = send_batch
+        self.max_chars = max_chars
+        self.max_items = max_items
+        self.wait = wait
+        self.max_in_flight = max_in_flight
+        self.lock = threading.Lock()
+        self.current: _Batch | None = None
+        self.batch_count = 0
+        self.in_flight = 0
+
+    def _fits(self, batch: _Batch, text: str) -> bool:
+        if batch.closed:
+            return False
+        if self.max_items and len(batch.texts) >= self.max_items:
+            return False
+        return batch.char_count + len(text) <= self.max_chars
+
+    def _is_full(self, batch: _Batch) -> bool:
+        if self.max_items and len(batch.texts) >= self.max_items:
+            return True
+        return batch.char_count >= self.max_chars
+
+    def _close(self, batch: _Batch):
+        batch.closed = True
+        batch.full.set()
+        if self.current is batch:
+            self.current = None
+
+    def translate(self, text: str) -> str:
+        with self.lock:
+            batch = self.current
+            leader = batch is None or not self._fits(batch, text)
+            if leader:
+                if batch is not None:
+                    # Let the previous batch go, it cannot take this text
+                    self._close(batch)
+                batch = _Batch()
+                self.current = batch
+            index = len(batch.texts)
+            batch.texts.append(text)
+            batch.char_count += len(text)
+            if self._is_full(batch):
+                self._close(batch)
+            # Batching only pays off while earlier requests keep the engine busy
+            busy = self.in_flight >= self.max_in_flight
+
+        if not leader:
+            batch.done.wait()
+        else:
+            if busy:
+                batch.full.wait(self.wait)
+            with self.lock:
+                self._close(batch)
+                self.batch_count += 1
+                self.in_flight += 1
+            try:
+                results = self.send_batch(batch.texts)
+                if len(results) != len(batch.texts):
+                    raise ValueError(
+                        f"Batch translation returned {len(results)} texts for {len(batch.texts)}"
+                    )
+                batch.results = results
+            except BaseException as e:
+                batch.error = e
+            finally:
+                with self.lock:
+                    self.in_flight -= 1
+                batch.done.set()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[index]
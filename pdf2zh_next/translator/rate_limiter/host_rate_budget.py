@@ -0,0 +1,61 @@
+import hashlib
+import multiprocessing
+import time
+
+# Number of provider endpoints a host budget can keep apart
+HOST_BUDGET_CAPACITY = 64
+
+
+def _endpoint_hash(endpoint_key: str) -> int:
+    """Stable non-zero 63 bit hash of an endpoint key, the same in every process."""
+    digest = hashlib.sha256(endpoint_key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little") & ((1 << 63) - 1) or 1
+
+
+class HostRateBudget:
+    """
+    Request schedule of every provider endpoint, shared by the translation
+    processes started from the process that created it.
+
+    Each process keeps its own SharedQPSRateLimiter per endpoint, which then
+    reserves its request slots here, so that documents translated in parallel
+    jointly keep to the qps of an endpoint. The schedule lives in shared memory
+    and must be handed to the processes when they start.
+    This implementation is process-safe and robust against system clock changes.
+    """
+
+    def __init__(self, ctx=None, capacity: int = HOST_BUDGET_CAPACITY):
+        ctx = ctx or multiprocessing.get_context()
+        self.lock = ctx.Lock()
+        self.keys = ctx.Array("q", capacity, lock=False)
+        # Monotonic time is system-wide, so processes can compare it
+        self.next_request_times = ctx.Array("d", capacity, lock=False)
+
+    def _get_slot(self, key_hash: int) -> int | None:
+        capacity = len(self.keys)
+        start = key_hash % capacity
+        for offset in range(capacity):
+            slot = (start + offset) % capacity
+            if self.keys[slot] == key_hash:
+                return slot
+            if self.keys[slot] == 0:
+                self.keys[slot] = key_hash
+                self.next_request_times[slot] = 0.0
+                return slot
+        return None
+
+    def reserve(self, endpoint_key: str, min_interval: float) -> float:
+        """
+        Reserve the next request slot of an endpoint.
+        :return: the monotonic time at which the request may be sent
+        """
+        key_hash = _endpoint_hash(endpoint_key)
+        with self.lock:
+            now = time.monotonic()
+            slot = self._get_slot(key_hash)
+            if slot is None:
+                # Too many endpoints, this one is only limited within its process
+                return now
+            start = max(self.next_request_times[slot], now)
+            self.next_request_times[slot] = start + min_interval
+        return start
@@ -0,0 +1,129 @@
+import threading
+import time
+
+from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
+from pdf2zh_next.translator.rate_limiter.host_rate_budget import HostRateBudget
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+
+# Lower value is served first.
+TERM_EXTRACTION_PRIORITY = 0
+MAIN_TRANSLATION_PRIORITY = 1
+
+
+class SharedQPSRateLimiter:
+    """
+    A leaky bucket budget shared by every translator that calls the same provider endpoint.
+
+    Callers are served strictly by priority: while a higher priority caller is waiting,
+    lower priority callers do not take a slot. Term extraction therefore drains the budget
+    during its phase, and main translation gets the whole budget otherwise.
+    With a host budget, the endpoint's budget is also shared with the translation
+    processes of other documents.
+    This implementation is thread-safe and robust against system clock changes.
+    """
+
+    def __init__(
+        self,
+        max_qps: int,
+        host_budget: HostRateBudget | None = None,
+        endpoint_key: str | None = None,
+    ):
+        if max_qps <= 0:
+            raise ValueError("max_qps must be a positive number")
+        self.max_qps = max_qps
+        self.host_budget = host_budget
+        self.endpoint_key = endpoint_key
+        self.min_interval = 1.0 / max_qps
+        self.condition = threading.Condition()
+        # Use monotonic time to prevent issues with system time changes
+        self.next_request_time = time.monotonic()
+        self.waiting: dict[int, int] = {}
+
+    def _has_higher_priority_waiter(self, priority: int) -> bool:
+        return any(p < priority and n > 0 for p, n in self.waiting.items())
+
+    def acquire(self, priority: int = MAIN_TRANSLATION_PRIORITY):
+        """
+        Blocks until a slot of the shared budget is available for the given priority.
+        """
+        with self.condition:
+            self.waiting[priority] = self.waiting.get(priority, 0) + 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait_duration = self.next_request_time - now
+                    if self._has_higher_priority_waiter(priority):
+                        # Woken up by notify_all when a higher priority caller leaves.
+                        self.condition.wait(
+                            timeout=max(wait_duration, self.min_interval)
+                        )
+                        continue
+                    if wait_duration <= 0:
+                        # If the limiter has been idle, the next request should start from 'now'.
+                        self.next_request_time = (
+                            max(self.next_request_time, now) + self.min_interval
+                        )
+                        break
+                    self.condition.wait(timeout=wait_duration)
+            finally:
+                self.waiting[priority] -= 1
+                self.condition.notify_all()
+            min_interval = self.min_interval
+        if self.host_budget is not None:
+            # Other processes may already have taken the next slots of the endpoint
+            delay = (
+                self.host_budget.reserve(self.endpoint_key, min_interval)
+                - time.monotonic()
+            )
+            if delay > 0:
+                time.sleep(delay)
+
+    def set_max_qps(self, max_qps: int):
+        """
+        Updates the maximum queries per second. This operation is thread-safe.
+        """
+        if max_qps <= 0:
+            raise ValueError("max_qps must be a positive number")
+        with self.condition:
+            self.max_qps = max_qps
+            self.min_interval = 1.0 / max_qps
+            self.condition.notify_all()
+
+    def client(
+        self, priority: int, max_qps: int | None = None
+    ) -> "SharedQPSRateLimiterClient":
+        return SharedQPSRateLimiterClient(self, priority, max_qps)
+
+
+class SharedQPSRateLimiterClient(BaseRateLimiter):
+    """
+    The rate limiter handed to a single translator. It draws from a shared budget
+    with a fixed priority, optionally capped by its own (lower) qps.
+    """
+
+    def __init__(
+        self,
+        shared_limiter: SharedQPSRateLimiter,
+        priority: int,
+        max_qps: int | None = None,
+    ):
+        self.shared_limiter = shared_limiter
+        self.priority = priority
+        self.own_limiter = QPSRateLimiter(max_qps) if max_qps else None
+
+    @property
+    def max_qps(self) -> int:
+        if self.own_limiter:
+            return min(self.own_limiter.max_qps, self.shared_limiter.max_qps)
+        return self.shared_limiter.max_qps
+
+    def wait(self, rate_limit_params: dict = None):
+        if self.own_limiter:
+            self.own_limiter.wait(rate_limit_params)
+        self.shared_limiter.acquire(self.priority)
+
+    def set_max_qps(self, max_qps: int):
+        """
+        Updates the provider budget, e.g. with a limit advertised by the provider.
+        """
+        self.shared_limiter.set_max_qps(max_qps)
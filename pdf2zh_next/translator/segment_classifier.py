@@ -0,0 +1,170 @@
+import re
+
+import numpy as np
+
+# Code point ranges of the scripts told apart by the classifier
+SCRIPT_RANGES = {
+    "latin": [(0x41, 0x5A), (0x61, 0x7A), (0xC0, 0x24F), (0x1E00, 0x1EFF)],
+    "han": [(0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF)],
+    "kana": [(0x3040, 0x30FF), (0x31F0, 0x31FF)],
+    "hangul": [(0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF)],
+    "cyrillic": [(0x400, 0x4FF)],
+    "greek": [(0x370, 0x3FF)],
+    "arabic": [(0x600, 0x6FF), (0x750, 0x77F)],
+    "hebrew": [(0x590, 0x5FF)],
+    "thai": [(0xE00, 0xE7F)],
+    "devanagari": [(0x900, 0x97F)],
+}
+SCRIPT_NAMES = list(SCRIPT_RANGES)
+
+# Scripts a language is written in, by the language code prefix
+LANGUAGE_SCRIPTS = {
+    "zh": {"han"},
+    "ja": {"han", "kana"},
+    "ko": {"hangul", "han"},
+    "ru": {"cyrillic"},
+    "uk": {"cyrillic"},
+    "bg": {"cyrillic"},
+    "sr": {"cyrillic", "latin"},
+    "kk": {"cyrillic"},
+    "mn": {"cyrillic"},
+    "el": {"greek"},
+    "ar": {"arabic"},
+    "fa": {"arabic"},
+    "ur": {"arabic"},
+    "he": {"hebrew"},
+    "th": {"thai"},
+    "hi": {"devanagari"},
+    "mr": {"devanagari"},
+    "ne": {"devanagari"},
+}
+
+URL_PATTERN = re.compile(r"(?:https?://|ftp://|www\.)\S+", re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+DOI_PATTERN = re.compile(r"(?:doi:\s*|https?://(?:dx\.)?doi\.org/)?10\.\d{4,9}/\S+")
+# Operators and braces of programming languages that prose does not use. Quotes,
+# brackets, arithmetic and semicolons are common in prose, in keyword lists,
+# author lists and references, and are no evidence of code.
+CODE_OPERATOR_PATTERN = re.compile(r"==|!=|->|=>|::|&&|\|\||\+\+|\+=|-=|[{}]")
+# Keywords of programming languages that are not English words
+CODE_KEYWORD_PATTERN = re.compile(
+    r"#include\b|\b(?:def|elif|lambda|void|nullptr|printf|println|typedef)\b"
+)
+# A statement end: a semicolon closing the line or a block
+CODE_STATEMENT_END_PATTERN = re.compile(r";\s*(?:}|$)", re.MULTILINE)
+# Code tokens per word from which a segment is taken for code
+CODE_TOKEN_RATIO = 0.2
+
+# Share of the letters that must be in the target scripts to skip a segment
+TARGET_SCRIPT_RATIO = 0.95
+MIN_TARGET_LANGUAGE_LETTERS = 4
+
+
+def get_language_scripts(lang: str) -> set[str]:
+    """Scripts of a language code, languages not listed are written in Latin."""
+    prefix = lang.lower().replace("_", "-").split("-")[0]
+    return LANGUAGE_SCRIPTS.get(prefix, {"latin"})
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, a CJK character is about one token and other text four characters per token."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    wide = int(np.count_nonzero(codes >= 0x2E80))
+    return wide + (len(codes) - wide + 3) // 4
+
+
+class SegmentClassifier:
+    """
+    Recognizes segments that translation would return unchanged, so that they are
+    not sent to the translation engine.
+
+    Character classes are counted with numpy over the code points of a segment, the
+    language is told by its script.
+    """
+
+    def __init__(
+        self,
+        lang_in: str,
+        lang_out: str,
+        placeholder_patterns: list[str] = (),
+    ):
+        target_scripts = get_language_scripts(lang_out)
+        source_scripts = get_language_scripts(lang_in)
+        # Text in the target script can only be told from the source language when
+        # the two are written in different scripts
+        self.target_scripts = (
+            target_scripts if not (target_scripts & source_scripts) else set()
+        )
+        self.placeholder_pattern = (
+            re.compile("|".join(f"(?:{p})" for p in placeholder_patterns))
+            if placeholder_patterns
+            else None
+        )
+        ranges = [SCRIPT_RANGES[name] for name in SCRIPT_NAMES]
+        self.range_starts = np.array([r[0] for rs in ranges for r in rs])
+        self.range_ends = np.array([r[1] for rs in ranges for r in rs])
+        self.range_scripts = np.array(
+            [i for i, rs in enumerate(ranges) for _ in rs], dtype=np.int64
+        )
+
+    def _script_counts(self, codes: np.ndarray) -> np.ndarray:
+        """Number of characters of every script in SCRIPT_NAMES."""
+        in_range = (codes[:, None] >= self.range_starts) & (
+            codes[:, None] <= self.range_ends
+        )
+        per_range = in_range.sum(axis=0)
+        return np.bincount(
+            self.range_scripts, weights=per_range, minlength=len(SCRIPT_NAMES)
+        ).astype(np.int64)
+
+    @staticmethod
+    def _is_code(text: str) -> bool:
+        """Operators or braces together with a keyword or a statement end."""
+        operator_count = len(CODE_OPERATOR_PATTERN.findall(text))
+        if not operator_count:
+            return False
+        keyword_count = len(CODE_KEYWORD_PATTERN.findall(text))
+        statement_end_count = len(CODE_STATEMENT_END_PATTERN.findall(text))
+        if not (keyword_count or statement_end_count):
+            return False
+        token_count = operator_count + keyword_count + statement_end_count
+        return token_count / len(text.split()) >= CODE_TOKEN_RATIO
+
+    def classify(self, text: str) -> str | None:
+        """
+        :return: why the segment needs no translation, or None to translate it
+        """
+        if self.placeholder_pattern is not None:
+            text = self.placeholder_pattern.sub(" ", text)
+        stripped = text.strip()
+        if not stripped:
+            return "placeholder"
+
+        if (
+            URL_PATTERN.fullmatch(stripped)
+            or EMAIL_PATTERN.fullmatch(stripped)
+            or DOI_PATTERN.fullmatch(stripped)
+        ):
+            return "reference"
+
+        codes = np.frombuffer(stripped.encode("utf-32-le"), dtype=np.uint32)
+        # Unicode letters outside the known scripts still count as letters
+        is_alpha = np.fromiter(
+            (c.isalpha() for c in stripped), dtype=bool, count=len(stripped)
+        )
+        letter_count = int(is_alpha.sum())
+        if letter_count == 0:
+            return "number"
+
+        if self._is_code(stripped):
+            return "code"
+
+        if self.target_scripts and letter_count >= MIN_TARGET_LANGUAGE_LETTERS:
+            script_counts = self._script_counts(codes[is_alpha])
+            target_count = sum(
+                int(script_counts[SCRIPT_NAMES.index(name)])
+                for name in self.target_scripts
+            )
+            if target_count >= TARGET_SCRIPT_RATIO * letter_count:
+                return "target_language"
+        return None
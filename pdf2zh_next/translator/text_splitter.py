@@ -0,0 +1,90 @@
+import re
+
+# Cut after sentence punctuation followed by whitespace, or after CJK punctuation
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;:])\s+|(?<=[。！？；：])\s*")
+WORD_BOUNDARY = re.compile(r"\s+")
+
+
+def _protected_spans(
+    text: str,
+    max_chars: int,
+    atomic_patterns: list[str],
+    paired_patterns: list[tuple[str, str]],
+) -> list[tuple[int, int]]:
+    spans = []
+    for pattern in atomic_patterns:
+        spans.extend(m.span() for m in re.finditer(pattern, text))
+    for left, right in paired_patterns:
+        pair = re.compile(f"({left}).*?({right})", re.DOTALL)
+        for m in pair.finditer(text):
+            if m.end() - m.start() <= max_chars:
+                spans.append(m.span())
+            else:
+                # Too long to keep in one chunk, only keep the tags whole
+                spans.append(m.span(1))
+                spans.append(m.span(2))
+    return spans
+
+
+def split_text(
+    text: str,
+    max_chars: int,
+    atomic_patterns: list[str] = (),
+    paired_patterns: list[tuple[str, str]] = (),
+) -> list[tuple[str, str]]:
+    """
+    Split text into chunks of at most ``max_chars`` characters.
+
+    Chunks are cut at sentence boundaries when possible, then at whitespace, and
+    never inside a match of ``atomic_patterns`` or between the left and right
+    placeholder of ``paired_patterns``.
+
+    :return: (chunk, separator) pairs, ``"".join(chunk + separator)`` is the text
+    """
+    if len(text) <= max_chars:
+        return [(text, "")]
+
+    # Positions where the text may not be cut
+    blocked = bytearray(len(text) + 1)
+    for start, end in _protected_spans(
+        text, max_chars, atomic_patterns, paired_patterns
+    ):
+        blocked[start + 1 : end] = b"\x01" * max(0, end - start - 1)
+
+    def boundaries(pattern: re.Pattern) -> list[tuple[int, int]]:
+        return [
+            m.span()
+            for m in pattern.finditer(text)
+            if not blocked[m.start()] and not blocked[m.end()]
+        ]
+
+    sentence_boundaries = boundaries(SENTENCE_BOUNDARY)
+    word_boundaries = boundaries(WORD_BOUNDARY)
+
+    chunks = []
+    start = 0
+    while len(text) - start > max_chars:
+        limit = start + max_chars
+        cut = None
+        for candidates in (sentence_boundaries, word_boundaries):
+            inside = [span for span in candidates if start < span[0] <= limit]
+            if inside:
+                cut = inside[-1]
+                break
+        if cut is None:
+            # No boundary, cut at the last position outside protected spans
+            position = next(
+                (p for p in range(limit, start, -1) if not blocked[p]), None
+            )
+            if position is None:
+                # A protected span longer than max_chars, cut after it
+                position = next(
+                    (p for p in range(limit + 1, len(text)) if not blocked[p]),
+                    len(text),
+                )
+            cut = (position, position)
+        chunks.append((text[start : cut[0]], text[cut[0] : cut[1]]))
+        start = cut[1]
+    if start < len(text):
+        chunks.append((text[start:], ""))
+    return chunks
@@ -5,10 +5,10 @@ from azure.core.credentials import AzureKeyCredential
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception_type
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 
 logger = logging.getLogger(__name__)
@@ -17,6 +17,9 @@ logger = logging.getLogger(__name__)
 class AzureTranslator(BaseTranslator):
     name = "azure"
     lang_map = {"zh": "zh-Hans"}
+    # Translator v3 accepts 50,000 characters and 1,000 texts per request
+    max_chars_per_request = 50000
+    max_items_per_batch = 1000
 
     def __init__(
         self,
@@ -33,7 +36,7 @@ class AzureTranslator(BaseTranslator):
 
     @retry(
         retry=retry_if_exception_type(Exception),
-        stop=stop_after_attempt(5),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
@@ -5,10 +5,10 @@ from babeldoc.utils.atomic_integer import AtomicInteger
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception_type
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 
 logger = logging.getLogger(__name__)
@@ -16,6 +16,7 @@ logger = logging.getLogger(__name__)
 
 class AzureOpenAITranslator(BaseTranslator):
     name = "azure-openai"
+    max_retry_attempts = 8
 
     def __init__(
         self,
@@ -40,7 +41,7 @@ class AzureOpenAITranslator(BaseTranslator):
 
     @retry(
         retry=retry_if_exception_type(openai.RateLimitError),
-        stop=stop_after_attempt(100),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
@@ -63,7 +64,7 @@ class AzureOpenAITranslator(BaseTranslator):
 
     @retry(
         retry=retry_if_exception_type(openai.RateLimitError),
-        stop=stop_after_attempt(100),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
@@ -74,12 +75,7 @@ class AzureOpenAITranslator(BaseTranslator):
         response = self.client.chat.completions.create(
             model=self.model,
             **self.options,
-            messages=[
-                {
-                    "role": "user",
-                    "content": text,
-                },
-            ],
+            messages=self.llm_messages(text),
         )
         if hasattr(response, "usage") and response.usage:
             if hasattr(response.usage, "total_tokens"):
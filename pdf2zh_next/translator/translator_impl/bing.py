@@ -5,10 +5,10 @@ import requests
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 
 logger = logging.getLogger(__name__)
@@ -18,6 +18,7 @@ class BingTranslator(BaseTranslator):
     # https://github.com/immersive-translate/old-immersive-translate/blob/6df13da22664bea2f51efe5db64c63aca59c4e79/src/background/translationService.js
     name = "bing"
     lang_map = {"zh": "zh-Hans", "zh-cn": "zh-Hans", "zh-tw": "zh-Hant", "auto": "en"}
+    max_chars_per_request = 1000
 
     def __init__(
         self,
@@ -44,12 +45,11 @@ class BingTranslator(BaseTranslator):
 
     @retry(
         retry=retry_if_exception(Exception),
-        stop=stop_after_attempt(5),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
     def do_translate(self, text, rate_limit_params: dict = None):
-        text = text[:1000]  # bing translate max length
         url, ig, iid, key, token = self.find_sid()
         response = self.session.post(
             f"{url}ttranslatev3?IG={ig}&IID={iid}",
@@ -1,22 +1,223 @@
+import collections
+import contextlib
 import json
 import logging
 import os
+import queue
 import subprocess
+import threading
 
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception_type
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 
 logger = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = 120
+# The conversation is cleared after every request, the process is still restarted
+# after this many requests in case clearing leaves some state behind
+MAX_TURNS_PER_SESSION = 200
+# Slash command of Claude Code starting a new conversation in the same process
+CLEAR_COMMAND = "/clear"
+_EOF = object()
+
+
+class ClaudeCodeSession:
+    """
+    A long-lived Claude Code CLI process driven over stream-json.
+
+    Every user message written to stdin is answered by stream-json events ending with
+    a ``result`` event. A session serves one request at a time, and is reset
+    between requests so that no segment sees the conversation of an earlier one.
+    """
+
+    def __init__(self, cmd: list[str], env: dict | None = None):
+        self.cmd = cmd
+        self.turn_count = 0
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            env=env,
+        )
+        self.events = queue.Queue()
+        self.stderr_tail = collections.deque(maxlen=50)
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+    def _read_stdout(self):
+        with contextlib.suppress(Exception):
+            for line in self.process.stdout:
+                line = line.strip()
+                if not line.startswith("{"):
+                    continue
+                try:
+                    self.events.put(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        self.events.put(_EOF)
+
+    def _read_stderr(self):
+        with contextlib.suppress(Exception):
+            for line in self.process.stderr:
+                self.stderr_tail.append(line)
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def _crashed(self) -> subprocess.CalledProcessError:
+        self.close()
+        return subprocess.CalledProcessError(
+            self.process.returncode, self.cmd, "".join(self.stderr_tail)
+        )
+
+    def _send(self, message: dict):
+        try:
+            self.process.stdin.write(
+                json.dumps({"type": "user", "message": message}) + "\n"
+            )
+            self.process.stdin.flush()
+        except OSError as e:
+            raise self._crashed() from e
+
+    def _read_answer(self, timeout: float) -> str:
+        """Text of the events up to the next ``result`` event."""
+        full_text = []
+        while True:
+            try:
+                chunk = self.events.get(timeout=timeout)
+            except queue.Empty as e:
+                self.close()
+                raise subprocess.TimeoutExpired(self.cmd, timeout) from e
+            if chunk is _EOF:
+                raise self._crashed()
+            logger.debug(f"CC: {chunk}")
+            if chunk.get("type") == "assistant" and "message" in chunk:
+                for content in chunk["message"].get("content", []):
+                    if content.get("type") == "text":
+                        full_text.append(content.get("text", ""))
+            elif chunk.get("type") == "text":
+                full_text.append(chunk.get("text", ""))
+            elif chunk.get("type") == "result":
+                if chunk.get("is_error"):
+                    raise ValueError(
+                        f"Claude Code error: {chunk.get('result') or chunk.get('subtype')}"
+                    )
+                return "".join(full_text).strip()
+
+    def request(self, message: dict, timeout: float = REQUEST_TIMEOUT) -> str:
+        """Send one user message and return the text of the answer."""
+        self._send(message)
+        self.turn_count += 1
+        result = self._read_answer(timeout)
+        if not result:
+            raise ValueError("No translation received from Claude Code")
+        return result
+
+    def reset(self, timeout: float = REQUEST_TIMEOUT):
+        """Clear the conversation, the next request starts without history."""
+        self._send({"role": "user", "content": CLEAR_COMMAND})
+        self._read_answer(timeout)
+
+    def close(self):
+        with contextlib.suppress(Exception):
+            self.process.stdin.close()
+        if self.process.poll() is None:
+            self.process.kill()
+        with contextlib.suppress(Exception):
+            self.process.wait(timeout=5)
+
+
+class ClaudeCodeSessionPool:
+    """
+    Pool of Claude Code sessions, started lazily up to ``max_sessions``.
+
+    A session is reset after every request and reused. A session that failed,
+    died or served ``max_turns`` requests is replaced by a fresh process on the
+    next request.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        max_sessions: int,
+        max_turns: int = MAX_TURNS_PER_SESSION,
+    ):
+        self.session_factory = session_factory
+        self.max_sessions = max_sessions
+        self.max_turns = max_turns
+        self.idle = queue.LifoQueue()
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_sessions)
+        self.sessions: set[ClaudeCodeSession] = set()
+        self.started_count = 0
+        self.closed = False
+
+    def _discard(self, session: ClaudeCodeSession):
+        with self.lock:
+            self.sessions.discard(session)
+        session.close()
+
+    def _get_session(self) -> ClaudeCodeSession:
+        while True:
+            try:
+                session = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if session.is_alive():
+                return session
+            self._discard(session)
+        session = self.session_factory()
+        with self.lock:
+            self.sessions.add(session)
+            self.started_count += 1
+        return session
+
+    def _release(self, session: ClaudeCodeSession):
+        if self.closed or session.turn_count >= self.max_turns:
+            self._discard(session)
+            return
+        try:
+            session.reset()
+        except Exception as e:
+            logger.warning(f"Failed to clear a Claude Code session, restart it: {e}")
+            self._discard(session)
+            return
+        self.idle.put(session)
+
+    @contextlib.contextmanager
+    def acquire(self):
+        with self.slots:
+            session = self._get_session()
+            try:
+                yield session
+            except BaseException:
+                # The session may still be answering, never reuse it
+                self._discard(session)
+                raise
+            self._release(session)
+
+    def close(self):
+        self.closed = True
+        with self.lock:
+            sessions = list(self.sessions)
+            self.sessions.clear()
+        for session in sessions:
+            session.close()
+
 
 class ClaudeCodeTranslator(BaseTranslator):
     name = "claudecode"
+    max_retry_attempts = 3
 
     def __init__(
         self,
@@ -29,6 +230,10 @@ class ClaudeCodeTranslator(BaseTranslator):
         self.add_cache_impact_parameters("model", self.claude_code_model)
         self.add_cache_impact_parameters("prompt", self.prompt(""))
         self._test_claude_code()
+        max_processes = settings.translate_engine_settings.claude_code_max_processes
+        self.session_pool = ClaudeCodeSessionPool(self._start_session, max_processes)
+        # More workers than processes would only wait for a free process
+        self.pdf2zh_next_recommended_pool_max_workers = max_processes
 
     def _test_claude_code(self):
         try:
@@ -45,18 +250,7 @@ class ClaudeCodeTranslator(BaseTranslator):
                 f"Claude Code CLI not found at '{self.claude_code_path}'"
             ) from e
 
-    @retry(
-        retry=retry_if_exception_type(
-            (subprocess.CalledProcessError, subprocess.TimeoutExpired)
-        ),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=2, min=2, max=15),
-        before_sleep=before_sleep_log(logger, logging.WARNING),
-    )
-    def do_translate(self, text, rate_limit_params: dict = None) -> str:
-        messages = self.prompt(text)
-        input_data = json.dumps({"type": "user", "message": messages[0]})
-
+    def _start_session(self) -> ClaudeCodeSession:
         cmd = [
             self.claude_code_path,
             "-p",
@@ -72,52 +266,38 @@ class ClaudeCodeTranslator(BaseTranslator):
             "--disallowedTools",
             "Task Bash Glob Grep LS exit_plan_mode Read Edit MultiEdit Write NotebookRead NotebookEdit TodoRead TodoWrite",
         ]
+        if self.prompt_cache_layout:
+            # The system prompt is passed to the process instead of every message
+            cmd += ["--append-system-prompt", self.system_prompt()]
 
         env = os.environ.copy()
         env.pop("ANTHROPIC_API_KEY", None)
 
-        try:
-            logger.info(f"Running Claude Code: {cmd}\n{input_data}")
-            process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env=env,
-            )
-
-            stdout, stderr = process.communicate(input=input_data, timeout=120)
-            logger.debug(f"CC: {stdout}")
+        logger.info(f"Starting Claude Code: {cmd}")
+        return ClaudeCodeSession(cmd, env)
 
-            if process.returncode != 0:
-                logger.error(f"Claude Code failed: {stderr}")
-                raise subprocess.CalledProcessError(process.returncode, cmd, stderr)
-
-            translation = self._parse_output(stdout)
-            return translation.strip()
+    @retry(
+        retry=retry_if_exception_type(
+            (subprocess.CalledProcessError, subprocess.TimeoutExpired)
+        ),
+        stop=stop_translator_retry(),
+        wait=wait_exponential(multiplier=2, min=2, max=15),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+    )
+    def do_translate(self, text, rate_limit_params: dict = None) -> str:
+        messages = self.prompt(text)
+        with self.session_pool.acquire() as session:
+            try:
+                return session.request(messages[-1])
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Claude Code failed: {e.stderr}")
+                raise
 
-        except subprocess.TimeoutExpired as e:
-            process.kill()
-            raise ValueError("Claude Code translation timed out") from e
+    def close(self):
+        self.session_pool.close()
+        super().close()
 
-    def _parse_output(self, output: str) -> str:
-        full_text = []
-        for line in output.strip().split("\n"):
-            if not line.strip() or not line.strip().startswith("{"):
-                continue
-            try:
-                chunk = json.loads(line)
-                if chunk.get("type") == "assistant" and "message" in chunk:
-                    for content in chunk["message"].get("content", []):
-                        if content.get("type") == "text":
-                            full_text.append(content.get("text", ""))
-                elif chunk.get("type") == "text":
-                    full_text.append(chunk.get("text", ""))
-            except json.JSONDecodeError:
-                continue
-
-        result = "".join(full_text).strip()
-        if not result:
-            raise ValueError("No translation received from Claude Code")
-        return result
+    def __del__(self):
+        with contextlib.suppress(Exception):
+            self.session_pool.close()
+        super().__del__()
@@ -4,10 +4,10 @@ import deepl
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 
 logger = logging.getLogger(__name__)
@@ -16,6 +16,9 @@ logger = logging.getLogger(__name__)
 class DeepLTranslator(BaseTranslator):
     # https://github.com/immersive-translate/old-immersive-translate/blob/6df13da22664bea2f51efe5db64c63aca59c4e79/src/background/translationService.js
     name = "deepl"
+    # Requests are limited to 128 KiB and 50 texts, keep margin for 4-byte characters
+    max_chars_per_request = 30000
+    max_items_per_batch = 50
     # Normalize common variants to a canonical internal code before
     # mapping to DeepL specific enums.
     lang_map = {
@@ -177,7 +180,7 @@ class DeepLTranslator(BaseTranslator):
 
     @retry(
         retry=retry_if_exception(Exception),
-        stop=stop_after_attempt(5),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
@@ -1,14 +1,15 @@
 import json
 import logging
 
-import requests
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
+from pdf2zh_next.translator.http_client import TransportStats
+from pdf2zh_next.translator.http_client import get_shared_http_client
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception_type
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 
 logger = logging.getLogger(__name__)
@@ -29,10 +30,12 @@ class DifyTranslator(BaseTranslator):
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        self.client = get_shared_http_client()
+        self.transport_stats = TransportStats()
 
     @retry(
         retry=retry_if_exception_type(Exception),
-        stop=stop_after_attempt(5),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
@@ -47,8 +50,12 @@ class DifyTranslator(BaseTranslator):
             "user": "translator-service",
         }
 
-        response = requests.post(
-            self.api_url, headers=self.headers, data=json.dumps(payload), timeout=60
+        response = self.client.post(
+            self.api_url,
+            headers=self.headers,
+            content=json.dumps(payload),
+            timeout=60,
+            extensions=self.transport_stats.extensions,
         )
         response.raise_for_status()
         data = response.json()
@@ -7,10 +7,10 @@ import requests
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception_type
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 
 logger = logging.getLogger(__name__)
@@ -23,6 +23,7 @@ def remove_control_characters(s):
 class GoogleTranslator(BaseTranslator):
     name = "google"
     lang_map = {"zh": "zh-CN"}
+    max_chars_per_request = 5000
 
     def __init__(
         self,
@@ -38,12 +39,11 @@ class GoogleTranslator(BaseTranslator):
 
     @retry(
         retry=retry_if_exception_type(Exception),
-        stop=stop_after_attempt(5),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
     def do_translate(self, text, rate_limit_params: dict = None):
-        text = text[:5000]  # google translate max length
         response = self.session.get(
             self.endpoint,
             params={"tl": self.lang_out, "sl": self.lang_in, "q": text},
@@ -1,22 +1,44 @@
 import logging
+import os
+import threading
 
 import ollama
 from babeldoc.utils.atomic_integer import AtomicInteger
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception_type
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_keep_alive(keep_alive: str | None) -> str | int | None:
+    """Ollama expects a duration string, or a number of seconds such as -1."""
+    if keep_alive is None or not keep_alive.strip():
+        return None
+    keep_alive = keep_alive.strip()
+    if keep_alive.lstrip("-").isdigit():
+        return int(keep_alive)
+    return keep_alive
+
+
+def _get_num_parallel(num_parallel: int | None) -> int | None:
+    if num_parallel:
+        return num_parallel
+    try:
+        return int(os.environ["OLLAMA_NUM_PARALLEL"]) or None
+    except (KeyError, ValueError):
+        return None
+
+
 class OllamaTranslator(BaseTranslator):
     # https://github.com/ollama/ollama
     name = "ollama"
+    max_retry_attempts = 8
 
     def __init__(
         self,
@@ -36,34 +58,74 @@ class OllamaTranslator(BaseTranslator):
         self.model = settings.translate_engine_settings.ollama_model
         self.add_cache_impact_parameters("model", self.model)
         self.add_cache_impact_parameters("prompt", self.prompt(""))
+        self.keep_alive = _parse_keep_alive(
+            settings.translate_engine_settings.ollama_keep_alive
+        )
         self.token_count = AtomicInteger()
         self.prompt_token_count = AtomicInteger()
         self.completion_token_count = AtomicInteger()
+        self.eval_count = AtomicInteger()
+        self.eval_duration_ns = AtomicInteger()
+        if num_parallel := _get_num_parallel(
+            settings.translate_engine_settings.ollama_num_parallel
+        ):
+            # Requests beyond the server's parallel slots only queue up in Ollama
+            self.pdf2zh_next_recommended_pool_max_workers = num_parallel
+        self.warm_up_thread = threading.Thread(target=self.warm_up, daemon=True)
+        self.warm_up_thread.start()
 
-    @retry(
-        retry=retry_if_exception_type(ollama.ResponseError),
-        stop=stop_after_attempt(100),
-        wait=wait_exponential(multiplier=1, min=1, max=15),
-        before_sleep=before_sleep_log(logger, logging.WARNING),
-    )
-    def do_translate(self, text, rate_limit_params: dict = None) -> str:
-        if (max_token := len(text) * 5) > self.options["num_predict"]:
-            self.options["num_predict"] = max_token
+    def warm_up(self):
+        """Load the model in the background, so that the first segments do not wait for it."""
+        try:
+            self.client.generate(model=self.model, keep_alive=self.keep_alive)
+            logger.debug(f"Ollama model {self.model} loaded")
+        except Exception as e:
+            logger.warning(f"Failed to warm up Ollama model {self.model}: {e}")
+
+    def _get_options(self, text: str) -> dict:
+        """Leave room for the translation of long texts, without touching shared options."""
+        num_predict = self.options["num_predict"]
+        if num_predict is not None and (max_token := len(text) * 5) > num_predict:
+            return {**self.options, "num_predict": max_token}
+        return self.options
+
+    def _chat(self, text: str, messages: list[dict]) -> str:
         response = self.client.chat(
             model=self.model,
-            options=self.options,
-            messages=self.prompt(text),
+            options=self._get_options(text),
+            messages=messages,
+            keep_alive=self.keep_alive,
         )
         self.token_count.inc(response.prompt_eval_count + response.eval_count)
         self.prompt_token_count.inc(response.prompt_eval_count)
         self.completion_token_count.inc(response.eval_count)
+        if response.eval_count and response.eval_duration:
+            self.eval_count.inc(response.eval_count)
+            self.eval_duration_ns.inc(response.eval_duration)
         message = response.message.content.strip()
         message = self._remove_cot_content(message)
         return message
 
+    @property
+    def tokens_per_second(self) -> float | None:
+        """Generation speed of the Ollama server over this job."""
+        duration_ns = self.eval_duration_ns.value
+        if not duration_ns:
+            return None
+        return self.eval_count.value / (duration_ns / 1e9)
+
+    @retry(
+        retry=retry_if_exception_type(ollama.ResponseError),
+        stop=stop_translator_retry(),
+        wait=wait_exponential(multiplier=1, min=1, max=15),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+    )
+    def do_translate(self, text, rate_limit_params: dict = None) -> str:
+        return self._chat(text, self.prompt(text))
+
     @retry(
         retry=retry_if_exception_type(ollama.ResponseError),
-        stop=stop_after_attempt(100),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
@@ -71,22 +133,4 @@ class OllamaTranslator(BaseTranslator):
         if text is None:
             return None
 
-        if (max_token := len(text) * 5) > self.options["num_predict"]:
-            self.options["num_predict"] = max_token
-
-        response = self.client.chat(
-            model=self.model,
-            options=self.options,
-            messages=[
-                {
-                    "role": "user",
-                    "content": text,
-                },
-            ],
-        )
-        self.token_count.inc(response.prompt_eval_count + response.eval_count)
-        self.prompt_token_count.inc(response.prompt_eval_count)
-        self.completion_token_count.inc(response.eval_count)
-        message = response.message.content.strip()
-        message = self._remove_cot_content(message)
-        return message
+        return self._chat(text, self.llm_messages(text))
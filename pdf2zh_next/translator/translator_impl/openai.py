@@ -6,10 +6,11 @@ from babeldoc.utils.atomic_integer import AtomicInteger
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
+from pdf2zh_next.translator.client_pool import ClientPool
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception_type
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,7 @@ logger = logging.getLogger(__name__)
 class OpenAITranslator(BaseTranslator):
     # https://github.com/openai/openai-python
     name = "openai"
+    max_retry_attempts = 8
 
     def __init__(
         self,
@@ -26,16 +28,16 @@ class OpenAITranslator(BaseTranslator):
     ):
         super().__init__(settings, rate_limiter)
         self.timeout = settings.translate_engine_settings.openai_timeout
-        self.client = openai.OpenAI(
-            base_url=settings.translate_engine_settings.openai_base_url,
-            api_key=settings.translate_engine_settings.openai_api_key,
-            timeout=float(self.timeout) if self.timeout else openai.NOT_GIVEN,
-            http_client=httpx.Client(
-                limits=httpx.Limits(
-                    max_connections=None, max_keepalive_connections=None
-                )
-            ),
+        # Several keys and/or base urls may be given, requests are spread across them.
+        # They do not affect the translation, so they are not cache impact parameters.
+        self.client_pool = ClientPool.from_keys_and_urls(
+            settings.translate_engine_settings.openai_api_key,
+            settings.translate_engine_settings.openai_base_url,
+            settings.translate_engine_settings.openai_weights,
+            self._create_client,
+            qps=settings.translation.qps,
         )
+        self.client = self.client_pool.clients[0].client
         self.options = {}
         self.temperature = settings.translate_engine_settings.openai_temperature
         self.reasoning_effort = (
@@ -69,9 +71,21 @@ class OpenAITranslator(BaseTranslator):
         if self.enable_json_mode:
             self.add_cache_impact_parameters("enable_json_mode", self.enable_json_mode)
 
+    def _create_client(self, api_key: str | None, base_url: str | None):
+        return openai.OpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            timeout=float(self.timeout) if self.timeout else openai.NOT_GIVEN,
+            http_client=httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=None, max_keepalive_connections=None
+                )
+            ),
+        )
+
     @retry(
         retry=retry_if_exception_type(openai.RateLimitError),
-        stop=stop_after_attempt(100),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
@@ -84,11 +98,12 @@ class OpenAITranslator(BaseTranslator):
         ):
             options["response_format"] = {"type": "json_object"}
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            **options,
-            messages=self.prompt(text),
-        )
+        with self.client_pool.acquire(rate_limit_params) as client:
+            response = client.chat.completions.create(
+                model=self.model,
+                **options,
+                messages=self.prompt(text),
+            )
         try:
             if hasattr(response, "usage") and response.usage:
                 if hasattr(response.usage, "total_tokens"):
@@ -116,7 +131,7 @@ class OpenAITranslator(BaseTranslator):
 
     @retry(
         retry=retry_if_exception_type(openai.RateLimitError),
-        stop=stop_after_attempt(100),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
@@ -131,16 +146,12 @@ class OpenAITranslator(BaseTranslator):
         ):
             options["response_format"] = {"type": "json_object"}
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            **options,
-            messages=[
-                {
-                    "role": "user",
-                    "content": text,
-                },
-            ],
-        )
+        with self.client_pool.acquire(rate_limit_params) as client:
+            response = client.chat.completions.create(
+                model=self.model,
+                **options,
+                messages=self.llm_messages(text),
+            )
         try:
             if hasattr(response, "usage") and response.usage:
                 if hasattr(response.usage, "total_tokens"):
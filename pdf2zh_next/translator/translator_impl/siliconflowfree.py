@@ -1,17 +1,24 @@
 import logging
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import as_completed
+from pathlib import Path
 
 import httpx
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
 from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.rate_limiter.shared_qps_rate_limiter import (
+    SharedQPSRateLimiterClient,
+)
+from pdf2zh_next.utils.json_file import read_json_file
+from pdf2zh_next.utils.json_file import write_json_file
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception_type
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 
 logger = logging.getLogger(__name__)
@@ -30,10 +37,94 @@ AVAILABLE_SERVER_ENDPOINTS = [
     "https://api2.pdf2zh-next.com/chatproxy",
 ]
 
+# The selected endpoint and the fetched limits are reused by later jobs for this long.
+ENDPOINT_CACHE_TTL = 6 * 60 * 60
+
+
+def _default_endpoint_cache_path() -> Path:
+    return Path.home() / ".cache" / "pdf2zh_next" / "siliconflowfree.v1.json"
+
+
+class EndpointRouter:
+    """
+    Routes requests to the endpoint with the lowest latency observed on real traffic.
+
+    Latency is tracked as an EWMA per endpoint. Every ``explore_interval``-th request
+    goes to another endpoint so that its latency stays known, instead of blocking
+    probes. A failing endpoint is skipped for a cooldown.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[str],
+        preferred: str | None = None,
+        alpha: float = 0.2,
+        explore_interval: int = 20,
+        cooldown: float = 30.0,
+    ):
+        self.endpoints = list(endpoints)
+        self.alpha = alpha
+        self.explore_interval = explore_interval
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.latency: dict[str, float | None] = dict.fromkeys(self.endpoints)
+        self.unavailable_until: dict[str, float] = dict.fromkeys(self.endpoints, 0.0)
+        self.request_count = 0
+        self.preferred = preferred if preferred in self.endpoints else self.endpoints[0]
+
+    def _available(self, now: float) -> list[str]:
+        available = [e for e in self.endpoints if self.unavailable_until[e] <= now]
+        return available or [min(self.endpoints, key=self.unavailable_until.get)]
+
+    def _best(self, endpoints: list[str]) -> str:
+        measured = [e for e in endpoints if self.latency[e] is not None]
+        if not measured:
+            return self.preferred if self.preferred in endpoints else endpoints[0]
+        return min(measured, key=self.latency.get)
+
+    @property
+    def best(self) -> str:
+        with self.lock:
+            return self._best(self._available(time.monotonic()))
+
+    def select(self) -> str:
+        with self.lock:
+            self.request_count += 1
+            available = self._available(time.monotonic())
+            best = self._best(available)
+            others = [e for e in available if e != best]
+            if others and self.request_count % self.explore_interval == 0:
+                # Explore the endpoint we know least about
+                return min(
+                    others,
+                    key=lambda e: (self.latency[e] is not None, self.latency[e] or 0),
+                )
+            return best
+
+    def record_success(self, endpoint: str, latency: float):
+        with self.lock:
+            previous = self.latency.get(endpoint)
+            if previous is None:
+                self.latency[endpoint] = latency
+            else:
+                self.latency[endpoint] = (
+                    self.alpha * latency + (1 - self.alpha) * previous
+                )
+            self.unavailable_until[endpoint] = 0.0
+
+    def record_failure(self, endpoint: str):
+        with self.lock:
+            self.unavailable_until[endpoint] = time.monotonic() + self.cooldown
+            if self.latency.get(endpoint) is not None:
+                self.latency[endpoint] *= 2
+
 
 class SiliconFlowFreeTranslator(BaseTranslator):
     # https://github.com/openai/openai-python
     name = "siliconflowfree"
+    max_retry_attempts = 8
+    server_endpoints = AVAILABLE_SERVER_ENDPOINTS
+    endpoint_cache_path = None
 
     def __init__(
         self,
@@ -50,13 +141,68 @@ class SiliconFlowFreeTranslator(BaseTranslator):
         # CloudFlare has a timeout of 100 seconds
         self.client = httpx.Client(timeout=100)
 
-        self.url = AVAILABLE_SERVER_ENDPOINTS[0]
-        self.get_fast_service()
+        self.url = self.server_endpoints[0]
         self.pdf2zh_next_recommended_qps = 10
         self.pdf2zh_next_recommended_pool_max_workers = 100
-        self.fetch_setting()
+        if not self.load_endpoint_cache():
+            self.get_fast_service()
+            if self.fetch_setting():
+                self.save_endpoint_cache()
+        self.router = EndpointRouter(self.server_endpoints, preferred=self.url)
+
+    def _get_endpoint_cache_path(self) -> Path:
+        return self.endpoint_cache_path or _default_endpoint_cache_path()
+
+    def load_endpoint_cache(self) -> bool:
+        """Reuse the endpoint and limits selected by a recent job, skipping the probes."""
+        try:
+            cached = read_json_file(self._get_endpoint_cache_path())
+            if cached is None:
+                return False
+            if (
+                cached["endpoints"] != list(self.server_endpoints)
+                or not 0 <= time.time() - cached["updated_at"] < ENDPOINT_CACHE_TTL
+                or cached["url"] not in self.server_endpoints
+            ):
+                return False
+            qps = cached["qps"]
+            max_pool_size = cached["max_pool_size"]
+            assert isinstance(qps, int) and qps > 0
+            assert isinstance(max_pool_size, int) and max_pool_size > 0
+        except Exception as e:
+            logger.debug(f"Ignore invalid endpoint cache: {e}")
+            return False
+
+        self.url = cached["url"]
+        self.pdf2zh_next_recommended_qps = qps
+        self.pdf2zh_next_recommended_pool_max_workers = max_pool_size
+        if isinstance(self.rate_limiter, QPSRateLimiter | SharedQPSRateLimiterClient):
+            self.rate_limiter.set_max_qps(qps)
+        logger.info(f"Using cached endpoint {self.url}, qps: {qps}")
+        return True
+
+    def save_endpoint_cache(self):
+        path = self._get_endpoint_cache_path()
+        cached = {
+            "endpoints": list(self.server_endpoints),
+            "url": self.url,
+            "qps": self.pdf2zh_next_recommended_qps,
+            "max_pool_size": self.pdf2zh_next_recommended_pool_max_workers,
+            "updated_at": time.time(),
+        }
+        try:
+            write_json_file(path, cached)
+        except Exception as e:
+            logger.debug(f"Failed to save endpoint cache: {e}")
+
+    def end_job(self):
+        # Let later jobs start with the endpoint that performed best on real traffic
+        if self.router.request_count and self.router.best != self.url:
+            self.url = self.router.best
+            self.save_endpoint_cache()
+        super().end_job()
 
-    def fetch_setting(self):
+    def fetch_setting(self) -> bool:
         try:
             response = self.client.get(f"{self.url}/config")
             if response.status_code == 200:
@@ -74,15 +220,20 @@ class SiliconFlowFreeTranslator(BaseTranslator):
                     self.pdf2zh_next_recommended_qps = qps
                     self.pdf2zh_next_recommended_pool_max_workers = max_pool_size
 
-                    if isinstance(self.rate_limiter, QPSRateLimiter):
+                    if isinstance(
+                        self.rate_limiter,
+                        QPSRateLimiter | SharedQPSRateLimiterClient,
+                    ):
                         self.rate_limiter.set_max_qps(qps)
                         logger.info(f"Updated QPS rate limiter to {qps}")
                     logger.info(
                         f"Fetched setting and updated: qps: {qps}, max_pool_size: {max_pool_size}"
                     )
+                    return True
 
         except Exception as e:
             logger.error(f"Failed to fetch setting and update: {e}")
+        return False
 
     def get_fast_service(self):
         """Find the fastest responding endpoint by sending parallel requests."""
@@ -120,13 +271,11 @@ class SiliconFlowFreeTranslator(BaseTranslator):
         fastest_endpoint = None
         fastest_time = float("inf")
 
-        with ThreadPoolExecutor(
-            max_workers=len(AVAILABLE_SERVER_ENDPOINTS)
-        ) as executor:
+        with ThreadPoolExecutor(max_workers=len(self.server_endpoints)) as executor:
             # Submit all endpoint tests
             future_to_endpoint = {
                 executor.submit(test_endpoint_speed, endpoint): endpoint
-                for endpoint in AVAILABLE_SERVER_ENDPOINTS
+                for endpoint in self.server_endpoints
             }
 
             # Get results as they complete
@@ -148,7 +297,7 @@ class SiliconFlowFreeTranslator(BaseTranslator):
             )
         else:
             logger.warning("No available endpoints found, using default")
-            self.url = AVAILABLE_SERVER_ENDPOINTS[0]  # Fallback to first endpoint
+            self.url = self.server_endpoints[0]  # Fallback to first endpoint
 
         return self.url
 
@@ -180,15 +329,9 @@ class SiliconFlowFreeTranslator(BaseTranslator):
         )
 
     @retry(
-        retry=retry_if_exception_type(httpx.HTTPError),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=30, max=60),
-        before_sleep=before_sleep_log(logger, logging.WARNING),
-    )
-    @retry(
-        retry=retry_if_exception_type(RateLimitError),
-        stop=stop_after_attempt(100),
-        wait=wait_exponential(multiplier=1, min=4, max=120),
+        retry=retry_if_exception_type((httpx.HTTPError, RateLimitError)),
+        stop=stop_translator_retry(),
+        wait=wait_exponential(multiplier=1, min=4, max=30),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
     def do_llm_translate(self, text, rate_limit_params: dict = None):
@@ -209,14 +352,24 @@ class SiliconFlowFreeTranslator(BaseTranslator):
                 "text": text,
             }
 
-        response = self.client.post(
-            self.url,
-            json=request,
-            timeout=60,
-        )
-        if response.status_code == 429:
-            raise RateLimitError
-        response.raise_for_status()
+        url = self.router.select()
+        start_time = time.monotonic()
+        try:
+            response = self.client.post(
+                url,
+                json=request,
+                timeout=60,
+            )
+            if response.status_code == 429:
+                raise RateLimitError
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            if not isinstance(e, httpx.HTTPStatusError) or (
+                e.response.status_code >= 500
+            ):
+                self.router.record_failure(url)
+            raise
+        self.router.record_success(url, time.monotonic() - start_time)
         message = response.json()["content"]
         message = self._remove_cot_content(message)
         return message
@@ -1,14 +1,18 @@
+import functools
 import logging
 
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
+from pdf2zh_next.translator.micro_batcher import MicroBatcher
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 from tencentcloud.common import credential
+from tencentcloud.tmt.v20180321.models import TextTranslateBatchRequest
+from tencentcloud.tmt.v20180321.models import TextTranslateBatchResponse
 from tencentcloud.tmt.v20180321.models import TextTranslateRequest
 from tencentcloud.tmt.v20180321.models import TextTranslateResponse
 from tencentcloud.tmt.v20180321.tmt_client import TmtClient
@@ -19,6 +23,10 @@ logger = logging.getLogger(__name__)
 class TencentMechineTranslationTranslator(BaseTranslator):
     name = "tencent"
     lang_map = {"zh-cn": "zh", "zh-tw": "zh-TW", "zh-hk": "zh-TW"}
+    # TextTranslate and TextTranslateBatch accept less than 6000 characters
+    max_chars_per_request = 5999
+    batches_requests = True
+    batch_wait = 0.05
 
     def __init__(
         self,
@@ -34,18 +42,38 @@ class TencentMechineTranslationTranslator(BaseTranslator):
                 settings.translate_engine_settings.tencentcloud_secret_key,
             )
         self.client = TmtClient(cred, "ap-beijing")
-        self.req = TextTranslateRequest()
-        self.req.Source = self.lang_in
-        self.req.Target = self.lang_out
-        self.req.ProjectId = 0
+        self.batcher = MicroBatcher(
+            functools.partial(self.send_batch, self._translate_batch),
+            self.max_chars_per_request,
+            self.max_items_per_batch,
+            wait=self.batch_wait,
+            # Texts only wait to be batched once every request slot is taken
+            max_in_flight=settings.translation.qps,
+        )
+
+    def _translate_batch(self, texts: list[str]) -> list[str]:
+        # Request objects are built per call, they are not thread-safe
+        if len(texts) == 1:
+            req = TextTranslateRequest()
+            req.Source = self.lang_in
+            req.Target = self.lang_out
+            req.ProjectId = 0
+            req.SourceText = texts[0]
+            resp: TextTranslateResponse = self.client.TextTranslate(req)
+            return [resp.TargetText]
+        req = TextTranslateBatchRequest()
+        req.Source = self.lang_in
+        req.Target = self.lang_out
+        req.ProjectId = 0
+        req.SourceTextList = texts
+        resp: TextTranslateBatchResponse = self.client.TextTranslateBatch(req)
+        return resp.TargetTextList
 
     @retry(
         retry=retry_if_exception(Exception),
-        stop=stop_after_attempt(5),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
     def do_translate(self, text, rate_limit_params: dict = None):
-        self.req.SourceText = text
-        resp: TextTranslateResponse = self.client.TextTranslate(self.req)
-        return resp.TargetText
+        return self.batcher.translate(text)
@@ -1,12 +1,13 @@
 import logging
+import threading
 
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
 from tenacity import before_sleep_log
 from tenacity import retry
 from tenacity import retry_if_exception_type
-from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 from xinference_client import RESTfulClient as Client
 
@@ -15,6 +16,7 @@ logger = logging.getLogger(__name__)
 
 class XinferenceTranslator(BaseTranslator):
     name = "xinference"
+    max_retry_attempts = 8
 
     def __init__(
         self,
@@ -32,17 +34,34 @@ class XinferenceTranslator(BaseTranslator):
         self.model = settings.translate_engine_settings.xinference_model
         self.add_cache_impact_parameters("model", self.model)
         self.add_cache_impact_parameters("prompt", self.prompt(""))
+        self.model_handles = {}
+        self.model_handles_lock = threading.Lock()
+
+    def _get_model(self, model: str):
+        """Resolve a model handle once, instead of querying the server per request."""
+        with self.model_handles_lock:
+            handle = self.model_handles.get(model)
+        if handle is None:
+            handle = self.client.get_model(model)
+            with self.model_handles_lock:
+                self.model_handles[model] = handle
+        return handle
+
+    def _forget_model(self, model: str):
+        # The model may have been relaunched, resolve it again on the next request
+        with self.model_handles_lock:
+            self.model_handles.pop(model, None)
 
     @retry(
         retry=retry_if_exception_type(RuntimeError),
-        stop=stop_after_attempt(100),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
     def do_translate(self, text, rate_limit_params: dict = None) -> str:
         for model in self.model.split(";"):
             try:
-                xf_model = self.client.get_model(model)
+                xf_model = self._get_model(model)
                 xf_prompt = self.prompt(text)
                 response = xf_model.chat(
                     generate_config=self.options,
@@ -54,25 +73,21 @@ class XinferenceTranslator(BaseTranslator):
                 )
                 return response.strip()
             except Exception as e:
+                self._forget_model(model)
                 logger.error(e)
         raise Exception("All models failed")
 
     @retry(
         retry=retry_if_exception_type(RuntimeError),
-        stop=stop_after_attempt(100),
+        stop=stop_translator_retry(),
         wait=wait_exponential(multiplier=1, min=1, max=15),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
     def do_llm_translate(self, text, rate_limit_params: dict = None):
         for model in self.model.split(";"):
             try:
-                xf_model = self.client.get_model(model)
-                xf_prompt = [
-                    {
-                        "role": "user",
-                        "content": text,
-                    },
-                ]
+                xf_model = self._get_model(model)
+                xf_prompt = self.llm_messages(text)
                 response = xf_model.chat(
                     generate_config=self.options,
                     messages=xf_prompt,
@@ -83,5 +98,6 @@ class XinferenceTranslator(BaseTranslator):
                 )
                 return response.strip()
             except Exception as e:
+                self._forget_model(model)
                 logger.error(e)
         raise Exception("All models failed")
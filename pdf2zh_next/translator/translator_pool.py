@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from pdf2zh_next.translator.base_translator import BaseTranslator
+
+logger = logging.getLogger(__name__)
+
+
+class _IdleTranslator:
+    def __init__(self, translator: BaseTranslator, ttl: float):
+        self.translator = translator
+        self.ttl = ttl
+        self.released_at = time.monotonic()
+
+    def expired(self, now: float) -> bool:
+        return now - self.released_at >= self.ttl
+
+
+class TranslatorPool:
+    """
+    Process-level pool of warm translator instances, keyed by translator fingerprint.
+
+    A translator is used by one job at a time: it is checked out when the job is
+    configured and released when the job ends. Idle translators keep their HTTP
+    clients and connections, and are evicted after their TTL.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.idle: dict[str, list[_IdleTranslator]] = {}
+        self.fingerprints: dict[int, str] = {}
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def _evict_expired(self, now: float) -> list[BaseTranslator]:
+        """
+        Remove the idle translators whose TTL expired, call with the lock held.
+        :return: the evicted translators, to be closed once the lock is released
+        """
+        evicted = []
+        for fingerprint in list(self.idle):
+            entries = []
+            for entry in self.idle[fingerprint]:
+                if entry.expired(now):
+                    evicted.append(entry.translator)
+                else:
+                    entries.append(entry)
+            if entries:
+                self.idle[fingerprint] = entries
+            else:
+                del self.idle[fingerprint]
+        if evicted:
+            logger.debug(f"Evicted {len(evicted)} idle translator(s)")
+        return evicted
+
+    @staticmethod
+    def _close(translators: list[BaseTranslator]):
+        for translator in translators:
+            try:
+                translator.close()
+            except Exception as e:
+                logger.debug(f"Failed to close {translator.name} translator: {e}")
+
+    def checkout(
+        self, fingerprint: str, factory: Callable[[], BaseTranslator]
+    ) -> tuple[BaseTranslator, bool]:
+        """
+        Get an idle translator with the given fingerprint, or create one with factory.
+        :return: the translator, and whether it was reused
+        """
+        with self.lock:
+            evicted = self._evict_expired(time.monotonic())
+            entries = self.idle.get(fingerprint)
+            if entries:
+                translator = entries.pop().translator
+                self.hit_count += 1
+                reused = True
+            else:
+                translator = None
+                self.miss_count += 1
+                reused = False
+        self._close(evicted)
+        if translator is None:
+            translator = factory()
+        else:
+            translator.reset_job_counters()
+            logger.info(f"Reusing warm {translator.name} translator")
+        with self.lock:
+            self.fingerprints[id(translator)] = fingerprint
+        return translator, reused
+
+    def release(self, translator: BaseTranslator | None, ttl: float):
+        """
+        Return a translator to the pool once its job has finished.
+        """
+        if translator is None:
+            return
+        with self.lock:
+            fingerprint = self.fingerprints.pop(id(translator), None)
+            if fingerprint is None:
+                # Not checked out from this pool, or already released
+                return
+            evicted = self._evict_expired(time.monotonic())
+            if ttl > 0:
+                self.idle.setdefault(fingerprint, []).append(
+                    _IdleTranslator(translator, ttl)
+                )
+            else:
+                evicted.append(translator)
+        self._close(evicted)
+
+    def clear(self):
+        with self.lock:
+            translators = [
+                entry.translator for entries in self.idle.values() for entry in entries
+            ]
+            self.idle.clear()
+        self._close(translators)
+
+
+_translator_pool = TranslatorPool()
+
+
+def get_translator_pool() -> TranslatorPool:
+    return _translator_pool
@@ -1,5 +1,6 @@
 import importlib
 import logging
+import threading
 
 from pdf2zh_next.config.model import SettingsModel
 from pdf2zh_next.config.translate_engine_model import (
@@ -9,10 +10,40 @@ from pdf2zh_next.config.translate_engine_model import TRANSLATION_ENGINE_METADAT
 from pdf2zh_next.config.translate_engine_model import TranslateEngineSettingError
 from pdf2zh_next.translator.base_rate_limiter import BaseRateLimiter
 from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.fingerprint import get_endpoint_key
+from pdf2zh_next.translator.fingerprint import get_engine_fingerprint
+from pdf2zh_next.translator.fingerprint import get_translator_fingerprint
+from pdf2zh_next.translator.health_check import get_health_check_memo
+from pdf2zh_next.translator.rate_limiter.host_rate_budget import HostRateBudget
 from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.rate_limiter.shared_qps_rate_limiter import (
+    MAIN_TRANSLATION_PRIORITY,
+)
+from pdf2zh_next.translator.rate_limiter.shared_qps_rate_limiter import (
+    TERM_EXTRACTION_PRIORITY,
+)
+from pdf2zh_next.translator.rate_limiter.shared_qps_rate_limiter import (
+    SharedQPSRateLimiter,
+)
+from pdf2zh_next.translator.translator_pool import get_translator_pool
 
 logger = logging.getLogger(__name__)
 
+# Provider budgets shared by all translators of this process, keyed by endpoint.
+_shared_rate_limiters: dict[str, SharedQPSRateLimiter] = {}
+_shared_rate_limiters_lock = threading.Lock()
+# Budget shared with the other translation processes of the same parent, if any.
+_host_rate_budget: HostRateBudget | None = None
+
+
+def set_host_rate_budget(host_budget: HostRateBudget | None):
+    """Share the provider budgets of this process with other processes.
+
+    Must be called before the first translator of the process is created.
+    """
+    global _host_rate_budget
+    _host_rate_budget = host_budget
+
 
 def get_rate_limiter(qps: int | None) -> BaseRateLimiter | None:
     """Create rate limiter based on qps value."""
@@ -21,6 +52,61 @@ def get_rate_limiter(qps: int | None) -> BaseRateLimiter | None:
     return None
 
 
+def get_shared_rate_limiter(
+    translator_config,
+    qps: int | None,
+    priority: int,
+    update_budget: bool = True,
+    client_qps: int | None = None,
+) -> BaseRateLimiter | None:
+    """Get a rate limiter drawing from the provider budget of translator_config's endpoint.
+
+    Args:
+        translator_config: Concrete translation engine settings instance.
+        qps: Provider budget for this endpoint.
+        priority: Scheduling priority, see ``TERM_EXTRACTION_PRIORITY``.
+        update_budget: Whether qps should replace the budget of an existing endpoint.
+        client_qps: Optional lower cap for this translator alone.
+    """
+    if not qps or qps <= 0:
+        return None
+    endpoint_key = get_endpoint_key(translator_config)
+    with _shared_rate_limiters_lock:
+        shared_limiter = _shared_rate_limiters.get(endpoint_key)
+        if shared_limiter is None:
+            shared_limiter = SharedQPSRateLimiter(
+                qps, host_budget=_host_rate_budget, endpoint_key=endpoint_key
+            )
+            _shared_rate_limiters[endpoint_key] = shared_limiter
+        elif update_budget and shared_limiter.max_qps != qps:
+            shared_limiter.set_max_qps(qps)
+    if client_qps and client_qps >= shared_limiter.max_qps:
+        client_qps = None
+    return shared_limiter.client(priority, client_qps)
+
+
+def _check_translator_health(
+    settings: SettingsModel, translator_config, translator: BaseTranslator
+):
+    """Validate translator availability, unless it is lazy or was recently validated."""
+    if settings.translation.lazy_health_check:
+        logger.debug(
+            "Skip health check, the first request will validate the translator"
+        )
+        return
+    ttl = settings.translation.health_check_ttl
+    fingerprint = get_engine_fingerprint(translator_config)
+    memo = get_health_check_memo()
+    if memo.is_healthy(fingerprint, ttl):
+        logger.debug("Skip health check, the translator passed it recently")
+        return
+    request_count = translator.translate_call_count
+    translator.check_health()
+    # Only a request that reached the engine proves its settings valid
+    if translator.translate_call_count > request_count:
+        memo.record_success(fingerprint, ttl)
+
+
 def _create_translator_instance(
     settings: SettingsModel,
     translator_config,
@@ -69,24 +155,58 @@ def _create_translator_instance(
                     translator.pdf2zh_next_recommended_pool_max_workers
                 )
 
-            # Health check: perform a short translation ignoring cache to validate translator availability
-            translator.translate("Hello", ignore_cache=True)
+            _check_translator_health(settings, translator_config, translator)
             return translator, recommended_qps, recommended_pool_max_workers
 
     raise ValueError("No translator found")
 
 
+def _checkout_translator(
+    settings: SettingsModel, translator_config, role: str, factory
+) -> BaseTranslator:
+    """Get a warm translator from the process-level pool, or create one with factory."""
+    if not settings.translation.translator_pool_ttl:
+        return factory()
+    fingerprint = get_translator_fingerprint(settings, translator_config, role)
+    translator, _ = get_translator_pool().checkout(fingerprint, factory)
+    return translator
+
+
+def release_translators(settings: SettingsModel, *translators: BaseTranslator | None):
+    """Return the translators of a finished job to the process-level pool."""
+    pool = get_translator_pool()
+    for translator in {id(t): t for t in translators if t is not None}.values():
+        translator.end_job()
+        pool.release(translator, settings.translation.translator_pool_ttl)
+
+
 def get_translator(settings: SettingsModel) -> BaseTranslator:
-    """Get main translator instance according to translate_engine_settings."""
+    """Get main translator instance according to translate_engine_settings.
+
+    Translators are reused across jobs of the same process while they are idle
+    for less than ``translator_pool_ttl``, see ``release_translators``.
+    """
     translator_config = settings.translate_engine_settings
-    rate_limiter = get_rate_limiter(settings.translation.qps)
-    translator, recommended_qps, recommended_pool_max_workers = (
-        _create_translator_instance(
+
+    def create_translator():
+        rate_limiter = get_shared_rate_limiter(
+            translator_config, settings.translation.qps, MAIN_TRANSLATION_PRIORITY
+        )
+        translator, _, _ = _create_translator_instance(
             settings=settings,
             translator_config=translator_config,
             rate_limiter=rate_limiter,
             enforce_glossary_support=True,
         )
+        translator.failover_translators = get_failover_translators(settings, translator)
+        return translator
+
+    translator = _checkout_translator(
+        settings, translator_config, "main", create_translator
+    )
+    recommended_qps = getattr(translator, "pdf2zh_next_recommended_qps", None)
+    recommended_pool_max_workers = getattr(
+        translator, "pdf2zh_next_recommended_pool_max_workers", None
     )
     if recommended_qps:
         settings.translation.qps = recommended_qps
@@ -97,27 +217,96 @@ def get_translator(settings: SettingsModel) -> BaseTranslator:
     return translator
 
 
+def _placeholder_scheme(translator: BaseTranslator) -> tuple:
+    return (
+        translator.get_formular_placeholder(1),
+        translator.get_rich_text_left_placeholder(1),
+        translator.get_rich_text_right_placeholder(1),
+    )
+
+
+def get_failover_translators(
+    settings: SettingsModel, translator: BaseTranslator
+) -> list[BaseTranslator]:
+    """Get failover translator instances of the main translator.
+
+    Babeldoc formats paragraphs with the placeholders of the main translator, so
+    failover engines with a different placeholder scheme are skipped. A failover
+    engine that fails its health check is skipped as well, it must not stop the
+    translation before the main engine has failed.
+    """
+    failover_translators = []
+    for translator_config in settings.failover_engine_settings:
+        rate_limiter = get_shared_rate_limiter(
+            translator_config,
+            settings.translation.qps,
+            MAIN_TRANSLATION_PRIORITY,
+            update_budget=False,
+        )
+        try:
+            failover_translator, _, _ = _create_translator_instance(
+                settings=settings,
+                translator_config=translator_config,
+                rate_limiter=rate_limiter,
+                enforce_glossary_support=True,
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failover engine {translator_config.translate_engine_type} is not available, ignored: {e}"
+            )
+            continue
+        if _placeholder_scheme(failover_translator) != _placeholder_scheme(translator):
+            logger.warning(
+                f"Failover engine {translator_config.translate_engine_type} uses a different placeholder scheme, ignored"
+            )
+            continue
+        failover_translators.append(failover_translator)
+    return failover_translators
+
+
 def get_term_translator(settings: SettingsModel) -> BaseTranslator | None:
     """Get term-extraction translator instance if configured.
 
-    This translator uses a potentially different engine and separate rate limit
-    from the main translation engine.
+    This translator uses a potentially different engine from the main translation
+    engine. When both engines call the same provider endpoint, they draw from one
+    provider budget (``qps``) and term extraction is served first.
     """
     translator_config = settings.term_extraction_engine_settings
     if translator_config is None:
         return None
 
-    # Prefer dedicated term_qps, fallback to main qps when not set
-    term_qps = settings.translation.term_qps or settings.translation.qps
-    rate_limiter = get_rate_limiter(term_qps)
-
-    translator, recommended_qps, recommended_pool_max_workers = (
-        _create_translator_instance(
+    def create_translator():
+        # Prefer dedicated term_qps, fallback to main qps when not set
+        term_qps = settings.translation.term_qps or settings.translation.qps
+        main_config = settings.translate_engine_settings
+        if main_config is not None and get_endpoint_key(
+            translator_config
+        ) == get_endpoint_key(main_config):
+            rate_limiter = get_shared_rate_limiter(
+                translator_config,
+                settings.translation.qps,
+                TERM_EXTRACTION_PRIORITY,
+                update_budget=False,
+                client_qps=term_qps,
+            )
+        else:
+            rate_limiter = get_shared_rate_limiter(
+                translator_config, term_qps, TERM_EXTRACTION_PRIORITY
+            )
+        translator, _, _ = _create_translator_instance(
             settings=settings,
             translator_config=translator_config,
             rate_limiter=rate_limiter,
             enforce_glossary_support=False,
         )
+        return translator
+
+    translator = _checkout_translator(
+        settings, translator_config, "term", create_translator
+    )
+    recommended_qps = getattr(translator, "pdf2zh_next_recommended_qps", None)
+    recommended_pool_max_workers = getattr(
+        translator, "pdf2zh_next_recommended_pool_max_workers", None
     )
     if recommended_qps:
         settings.translation.term_qps = recommended_qps
@@ -1,5 +1,9 @@
 import asyncio
-import time
+import itertools
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Hashable
 
 
 class Args:
@@ -9,26 +13,64 @@ class Args:
 
 
 class AsyncCallback:
+    """
+    Bridges callbacks called from other threads to an async iterator.
+
+    Calls are buffered until the event loop consumes them, and the loop is woken
+    once per batch instead of once per call. Calls with the same ``coalesce_key``
+    replace each other while they are pending, e.g. progress updates of a stage,
+    so a slow consumer only sees the latest. At most ``max_pending`` calls are
+    buffered, further calls block the calling thread until there is room.
+    """
+
     MAGIC_MESSAGE_FINISHED = "MAGIC_MESSAGE_FINISHED"
     MAGIC_MESSAGE_ERROR = "MAGIC_MESSAGE_ERROR"
 
-    def __init__(self, timeout=None):
-        self.queue = asyncio.Queue()
+    def __init__(
+        self,
+        timeout=None,
+        coalesce_key: Callable[[Args], Hashable | None] | None = None,
+        max_pending: int = 1000,
+    ):
         self.finished = False
         self.error = None
         self.loop = asyncio.get_event_loop()
         self.timeout = timeout
+        self.coalesce_key = coalesce_key
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.not_full = threading.Condition(self.lock)
+        # Pending calls in call order, coalesced calls are keyed by their key
+        self.pending: OrderedDict[Hashable, Args] = OrderedDict()
+        self.sequence = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.closed = False
+        self.coalesced_count = 0
+
+    def _put(self, args: Args, coalesce: bool):
+        key = self.coalesce_key(args) if coalesce and self.coalesce_key else None
+        with self.lock:
+            if key is not None and key in self.pending:
+                # Drop the older pending call, the newer one goes to the end
+                del self.pending[key]
+                self.coalesced_count += 1
+            else:
+                while len(self.pending) >= self.max_pending and not self.closed:
+                    self.not_full.wait()
+                if self.closed:
+                    return
+            if key is None:
+                key = ("call", next(self.sequence))
+            was_empty = not self.pending
+            self.pending[key] = args
+        if was_empty:
+            # We have to use the threadsafe call so that it wakes up the event loop, in case it's sleeping:
+            # https://stackoverflow.com/a/49912853/2148718
+            self.loop.call_soon_threadsafe(self.wakeup.set)
 
     def step_callback(self, *args, **kwargs):
         # Whenever a step is called, add to the queue but don't set finished to True, so __anext__ will continue
-        args = Args(args, kwargs)
-
-        # We have to use the threadsafe call so that it wakes up the event loop, in case it's sleeping:
-        # https://stackoverflow.com/a/49912853/2148718
-        self.loop.call_soon_threadsafe(self.queue.put_nowait, args)
-
-        # Add a small delay to release the GIL, ensuring the event loop has time to process messages
-        time.sleep(0.05)
+        self._put(Args(args, kwargs), coalesce=True)
 
     def error_callback(self, error_obj):
         """
@@ -39,7 +81,7 @@ class AsyncCallback:
             return
         self.error = error_obj
         # Create a special message to signal the error
-        self.step_callback(self.MAGIC_MESSAGE_ERROR, error=error_obj)
+        self._put(Args((self.MAGIC_MESSAGE_ERROR,), {"error": error_obj}), False)
         self.finished = True
 
     def finished_callback(self, *args, **kwargs):
@@ -47,12 +89,19 @@ class AsyncCallback:
         # will terminate after processing the remaining items
         if self.finished:
             return
-        self.step_callback(*args, **kwargs)
+        self._put(Args(args, kwargs), coalesce=False)
         self.finished = True
 
     def finished_callback_without_args(self):
         self.finished_callback(self.MAGIC_MESSAGE_FINISHED)
 
+    def close(self):
+        """Stop buffering calls, e.g. when the consumer has gone away."""
+        with self.lock:
+            self.closed = True
+            self.pending.clear()
+            self.not_full.notify_all()
+
     def is_finished(self):
         """Return True if the callback has been finished."""
         return self.finished
@@ -61,9 +110,26 @@ class AsyncCallback:
         """Return True if an error has been recorded."""
         return self.error is not None
 
+    def _pop(self) -> Args | None:
+        with self.lock:
+            if not self.pending:
+                # Cleared while holding the lock, a later call sets it again
+                self.wakeup.clear()
+                return None
+            _, result = self.pending.popitem(last=False)
+            self.not_full.notify()
+            return result
+
+    async def _get(self) -> Args:
+        while True:
+            result = self._pop()
+            if result is not None:
+                return result
+            await self.wakeup.wait()
+
     def __await__(self):
         # Since this implements __anext__, this can return itself
-        return self.queue.get().__await__()
+        return self._get().__await__()
 
     def __aiter__(self):
         # Since this implements __anext__, this can return itself
@@ -72,16 +138,16 @@ class AsyncCallback:
     async def __anext__(self):
         # Keep waiting for the queue if a) we haven't finished, or b) if the queue is still full. This lets us finish
         # processing the remaining items even after we've finished
-        if self.finished and self.queue.empty():
+        if self.finished and not self.pending:
             if self.error:
                 # If we finished due to an error, raise it
                 raise self.error
             raise StopAsyncIteration
 
         if isinstance(self.timeout, int) or isinstance(self.timeout, float):
-            result = await asyncio.wait_for(self.queue.get(), self.timeout)
+            result = await asyncio.wait_for(self._get(), self.timeout)
         else:
-            result = await self.queue.get()
+            result = await self._get()
         if result.args and result.args[0] == self.MAGIC_MESSAGE_FINISHED:
             raise StopAsyncIteration
         if result.args and result.args[0] == self.MAGIC_MESSAGE_ERROR:
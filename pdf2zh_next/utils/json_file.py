@@ -0,0 +1,35 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def read_json_file(path: Path) -> Any:
+    """
+    Content of a JSON file.
+    :return: None if the file does not exist
+    :raises ValueError: if the file is not valid JSON
+    """
+    try:
+        with path.open(encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_json_file(path: Path, data: Any):
+    """
+    Write data to a JSON file atomically: readers in other processes see either
+    the previous content or the new one, never a partly written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
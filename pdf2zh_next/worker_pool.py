@@ -0,0 +1,287 @@
+import atexit
+import logging
+import multiprocessing
+import multiprocessing.connection
+import threading
+import traceback
+from collections.abc import Callable
+
+from pdf2zh_next import ipc
+from pdf2zh_next.ipc import FrameChannel
+from pdf2zh_next.ipc import FrameLogHandler
+
+logger = logging.getLogger(__name__)
+
+# Seconds a worker process gets to exit on its own before it is terminated
+WORKER_EXIT_TIMEOUT = 2
+
+
+def _worker_main(
+    initializer: Callable | None,
+    initargs: tuple,
+    conn: multiprocessing.connection.Connection,
+):
+    channel = FrameChannel(conn)
+    # Replace handlers inherited from a forked parent, the parent logs the records
+    logging.basicConfig(
+        level=logging.INFO, handlers=[FrameLogHandler(channel)], force=True
+    )
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        target, args = job
+        try:
+            target(channel, *args)
+        except Exception as e:
+            logger.error(f"Error in worker job: {e}\n{traceback.format_exc()}")
+        channel.send_job_done()
+
+
+class WorkerExitedError(Exception):
+    """The worker process exited before its job returned."""
+
+    def __init__(self, exit_code: int | None):
+        super().__init__(f"Worker process exited with code {exit_code}")
+        self.exit_code = exit_code
+
+
+class WorkerProcess:
+    """
+    A long-lived process running the jobs submitted to it one at a time.
+
+    The process sends everything over one channel, see pdf2zh_next.ipc: its log
+    records, which are forwarded to the logging of this process, and the messages
+    of the current job, which are passed to the handler given to submit.
+    """
+
+    def __init__(self, ctx, initializer: Callable | None = None, initargs: tuple = ()):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(initializer, initargs, child_conn),
+        )
+        self.process.start()
+        child_conn.close()
+        self.task_count = 0
+        self.state_changed = threading.Condition()
+        self.job_pending = False
+        self.connected = True
+        self.on_message: Callable | None = None
+        self.reader_thread = threading.Thread(target=self._read_frames, daemon=True)
+        self.reader_thread.start()
+
+    def _dispatch(self, message):
+        with self.state_changed:
+            on_message = self.on_message if self.job_pending else None
+        if on_message is None:
+            return
+        try:
+            on_message(message)
+        except Exception as e:
+            logger.error(f"Error handling message of worker process {self.pid}: {e}")
+
+    def _read_frames(self):
+        while True:
+            try:
+                frame = self.conn.recv_bytes()
+            except (EOFError, OSError):
+                break
+            try:
+                kind, message = ipc.decode(frame)
+            except ipc.ProtocolError as e:
+                logger.error(f"Invalid frame from worker process {self.pid}: {e}")
+                self._dispatch(e)
+                continue
+            if kind == ipc.FRAME_LOG:
+                logger.handle(message)
+            elif kind == ipc.FRAME_JOB_DONE:
+                with self.state_changed:
+                    self.job_pending = False
+                    self.on_message = None
+                    self.state_changed.notify_all()
+            else:
+                self._dispatch(message)
+        # The process exited, or this side closed the channel
+        if self.job_pending and self.process.is_alive():
+            self.process.join(timeout=1)
+        self._dispatch(WorkerExitedError(self.process.exitcode))
+        with self.state_changed:
+            self.connected = False
+            self.on_message = None
+            self.state_changed.notify_all()
+
+    @property
+    def pid(self) -> int | None:
+        return self.process.pid
+
+    @property
+    def sentinel(self) -> int:
+        """Becomes ready when the process exits, see multiprocessing.connection.wait."""
+        return self.process.sentinel
+
+    @property
+    def exitcode(self) -> int | None:
+        if self.process.exitcode is None and multiprocessing.connection.wait(
+            [self.sentinel], timeout=0
+        ):
+            # The process has exited but may not have been reaped yet
+            self.process.join(timeout=1)
+        return self.process.exitcode
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def submit(self, target: Callable, *args, on_message: Callable | None = None):
+        """
+        Run target(channel, *args) in the process, target must be picklable.
+
+        The messages the job sends over the channel (see ipc.FrameChannel) are
+        passed to on_message in a thread of this process until the job returns. A
+        WorkerExitedError is passed if the process exits before that.
+        """
+        with self.state_changed:
+            self.task_count += 1
+            self.job_pending = True
+            self.on_message = on_message
+        self.conn.send((target, args))
+
+    def wait_job(self, timeout: float) -> bool:
+        """
+        Wait for the submitted job to return.
+        :return: False if it did not return in time or the process died
+        """
+        with self.state_changed:
+            self.state_changed.wait_for(
+                lambda: not self.job_pending or not self.connected, timeout
+            )
+            return not self.job_pending
+
+    def _close(self):
+        with self.state_changed:
+            self.on_message = None
+        try:
+            self.conn.close()
+        except Exception as e:
+            logger.debug(f"Failed to close worker channel: {e}")
+        self.reader_thread.join(timeout=1)
+
+    def kill(self):
+        """Stop the process at once, e.g. when its job does not end in time."""
+        if self.process.is_alive():
+            logger.info("Worker process did not finish in time, terminate it")
+            self.process.terminate()
+            self.process.join(timeout=1)
+        if self.process.is_alive():
+            logger.info("Worker process did not finish in time, killing it")
+            try:
+                self.process.kill()
+                self.process.join(timeout=1)
+                logger.info("Worker process killed")
+            except Exception as e:
+                logger.exception(f"Error killing worker process: {e}")
+        self._close()
+
+    def stop(self):
+        """Ask the idle process to exit, kill it if it does not."""
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError) as e:
+            logger.debug(f"Failed to send stop message to worker: {e}")
+        self.process.join(timeout=WORKER_EXIT_TIMEOUT)
+        self.kill()
+
+
+class WorkerPool:
+    """
+    Keeps worker processes warm between jobs, so that imports, models and
+    translators loaded by one job are reused by the next.
+
+    A job always gets a process of its own: an idle worker if there is one,
+    otherwise a new process. Up to ``size`` workers are kept idle after their job,
+    and a worker is replaced after ``max_tasks`` jobs to free the memory it
+    accumulated. With a size of 0 every job runs in a new process.
+
+    ``initializer(*initargs)`` is called in every worker when it
+    starts, initargs may hold objects that can only be inherited, such as locks.
+    """
+
+    def __init__(
+        self, initializer: Callable | None = None, initargs: tuple = (), ctx=None
+    ):
+        self.ctx = ctx or multiprocessing.get_context()
+        self.initializer = initializer
+        self.initargs = initargs
+        self.lock = threading.Lock()
+        self.idle: list[WorkerProcess] = []
+        self.size = 0
+        self.max_tasks: int | None = None
+        self.started_count = 0
+        self.reused_count = 0
+        atexit.register(self.shutdown)
+
+    def configure(self, size: int, max_tasks: int | None):
+        with self.lock:
+            self.size = max(0, size)
+            self.max_tasks = max_tasks or None
+            surplus = self.idle[self.size :]
+            self.idle = self.idle[: self.size]
+        for worker in surplus:
+            worker.stop()
+
+    def acquire(self) -> WorkerProcess:
+        """Get a worker for one job, it must be returned with release."""
+        dead = []
+        worker = None
+        with self.lock:
+            while self.idle:
+                candidate = self.idle.pop()
+                if candidate.is_alive():
+                    worker = candidate
+                    self.reused_count += 1
+                    break
+                dead.append(candidate)
+        for candidate in dead:
+            logger.warning(
+                f"Idle worker process {candidate.pid} exited with code {candidate.exitcode}"
+            )
+            candidate.kill()
+        if worker is not None:
+            logger.debug(f"Reusing warm worker process {worker.pid}")
+            return worker
+        worker = WorkerProcess(self.ctx, self.initializer, self.initargs)
+        with self.lock:
+            self.started_count += 1
+        logger.debug(f"Started worker process {worker.pid}")
+        return worker
+
+    def release(self, worker: WorkerProcess, reusable: bool):
+        """
+        Return a worker whose job has ended.
+        :param reusable: False if the job did not end cleanly, the worker is stopped
+        """
+        if not reusable or not worker.is_alive():
+            worker.kill()
+            return
+        with self.lock:
+            retire = self.max_tasks is not None and worker.task_count >= self.max_tasks
+            if not retire and len(self.idle) < self.size:
+                self.idle.append(worker)
+                return
+        if retire:
+            logger.debug(
+                f"Worker process {worker.pid} ran {worker.task_count} jobs, replacing it"
+            )
+        worker.stop()
+
+    def shutdown(self):
+        with self.lock:
+            idle = self.idle
+            self.idle = []
+        for worker in idle:
+            worker.stop()
@@ -0,0 +1,172 @@
+"""Compare the frame protocol of worker processes with the pickle path it replaces.
+
+Events used to cross the process boundary pickled by Connection.send, and log
+records pickled by a QueueHandler. For every kind of message this measures the
+bytes and the CPU time to encode and decode it both ways, then sends a stream of
+progress updates through a FrameChannel to count the frames left after coalescing.
+
+Usage: python script/ipc_benchmark.py [--repeat N] [--updates N] [--rate UPDATES_PER_S]
+"""
+
+import argparse
+import logging
+import pickle
+import sys
+import time
+from logging.handlers import QueueHandler
+from multiprocessing.reduction import ForkingPickler
+from pathlib import Path
+
+from babeldoc.format.pdf.translation_config import TranslateResult
+from pdf2zh_next import ipc
+from pdf2zh_next.high_level import BabeldocError
+
+
+def progress_event(event_type: str, current: int) -> dict:
+    return {
+        "type": event_type,
+        "stage": "Translate Paragraphs",
+        "stage_progress": current / 3,
+        "stage_current": current,
+        "stage_total": 300,
+        "overall_progress": 40 + current / 10,
+        "part_index": 1,
+        "total_parts": 1,
+    }
+
+
+def sample_messages() -> dict:
+    result = TranslateResult(
+        Path("output/paper.zh.mono.pdf"), Path("output/paper.zh.dual.pdf")
+    )
+    result.original_pdf_path = "input/paper.pdf"
+    result.total_seconds = 93.4
+    result.peak_memory_usage = 812_000_000
+    record = logging.LogRecord(
+        "babeldoc.format.pdf.document_il.midend.il_translator",
+        logging.INFO,
+        "il_translator.py",
+        420,
+        "Translated %d paragraphs of page %d",
+        (24, 7),
+        None,
+    )
+    QueueHandler(None).prepare(record)
+    return {
+        "progress_update": progress_event("progress_update", 120),
+        "stage_summary": {
+            "type": "stage_summary",
+            "stages": [
+                {"name": name, "percent": 1 / 8}
+                for name in (
+                    "Parse PDF and Create Intermediate Representation",
+                    "DetectScannedFile",
+                    "Parse Page Layout",
+                    "Parse Paragraphs",
+                    "Translate Paragraphs",
+                    "Typesetting",
+                    "Add Fonts",
+                    "Generate drawing instructions",
+                )
+            ],
+            "part_index": 1,
+            "total_parts": 1,
+        },
+        "finish": {
+            "type": "finish",
+            "translate_result": result,
+            "token_usage": {
+                "main": {
+                    "total": 91234,
+                    "prompt": 60123,
+                    "completion": 31111,
+                    "cache_hit_prompt": 40000,
+                    "cache_hit_ratio": 0.6653,
+                }
+            },
+        },
+        "error": BabeldocError("Babeldoc translation error: timeout", "timeout"),
+        "log": record,
+    }
+
+
+def measure(encode, decode, message, repeat: int) -> tuple[int, float]:
+    """:return: bytes of the message and CPU microseconds to encode and decode it"""
+    data = encode(message)
+    start = time.process_time()
+    for _ in range(repeat):
+        decode(encode(message))
+    return len(data), (time.process_time() - start) / repeat * 1e6
+
+
+def pickle_decode(data: bytes):
+    return pickle.loads(data)  # noqa: S301
+
+
+def pickle_encode(message) -> bytes:
+    return bytes(ForkingPickler.dumps(message))
+
+
+class CountingConnection:
+    def __init__(self):
+        self.frame_count = 0
+        self.byte_count = 0
+
+    def send_bytes(self, frame: bytes):
+        self.frame_count += 1
+        self.byte_count += len(frame)
+
+
+def measure_stream(update_count: int, rate: float) -> dict:
+    conn = CountingConnection()
+    channel = ipc.FrameChannel(conn)
+    pickled_bytes = 0
+    events = [progress_event("progress_start", 0)]
+    events += [progress_event("progress_update", i) for i in range(update_count)]
+    events.append(progress_event("progress_end", update_count))
+    for event in events:
+        pickled_bytes += len(pickle_encode(event))
+        channel.send(event)
+        time.sleep(1 / rate)
+    channel.flush()
+    return {
+        "events": len(events),
+        "frames": conn.frame_count,
+        "frame bytes": conn.byte_count,
+        "pickle bytes": pickled_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    parser.add_argument("--updates", type=int, default=300)
+    parser.add_argument("--rate", type=float, default=500.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'message':<16} {'pickle B':>9} {'frame B':>8} {'pickle us':>10} {'frame us':>9}"
+    )
+    for name, message in sample_messages().items():
+        pickle_size, pickle_us = measure(
+            pickle_encode, pickle_decode, message, args.repeat
+        )
+        frame_size, frame_us = measure(
+            ipc.encode, lambda data: ipc.decode(data)[1], message, args.repeat
+        )
+        print(
+            f"{name:<16} {pickle_size:>9} {frame_size:>8} "
+            f"{pickle_us:>10.1f} {frame_us:>9.1f}"
+        )
+
+    stream = measure_stream(args.updates, args.rate)
+    print(
+        f"\n{stream['events']} progress events at {args.rate:.0f}/s: "
+        f"{stream['frames']} frames, {stream['frame bytes']} bytes "
+        f"(pickle: {stream['events']} messages, {stream['pickle bytes']} bytes)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
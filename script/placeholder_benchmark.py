@@ -0,0 +1,127 @@
+"""Compare the prompt tokens per page of the standard and compact placeholder schemes.
+
+Paragraphs are rebuilt from the PyMuPDF spans of every page: spans in a math font
+become formula placeholders, spans in another font than the rest of the paragraph
+become rich text. Every paragraph is wrapped in the prompt of the translator.
+
+Usage: python script/placeholder_benchmark.py [PDF ...]
+Without arguments, the sample PDFs in test/file are used.
+"""
+
+import argparse
+import collections
+import re
+import sys
+from pathlib import Path
+
+import pymupdf
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.segment_classifier import estimate_tokens
+from pdf2zh_next.translator.translator_impl.openai import OpenAITranslator
+
+SAMPLE_DIR = Path(__file__).resolve().parent.parent / "test" / "file"
+MATH_FONT = re.compile(r"CM(MI|SY|EX|R\d)|MSBM|Symbol|Math|STIX|Euclid", re.IGNORECASE)
+
+
+def get_token_counter():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.encoding_for_model("gpt-4o")
+        return lambda text: len(encoding.encode(text, disallowed_special=())), "o200k"
+    except Exception:
+        # The encoding could not be loaded, e.g. offline
+        return estimate_tokens, "estimated"
+
+
+def create_translator(scheme: str) -> OpenAITranslator:
+    settings = SettingsModel(
+        translate_engine_settings=OpenAISettings(openai_api_key="benchmark")
+    )
+    settings.translation.placeholder_scheme = scheme
+    return OpenAITranslator(settings, QPSRateLimiter(1))
+
+
+def build_paragraph(spans: list[dict], translator: OpenAITranslator) -> str:
+    """Text of a paragraph with the placeholders of the translator."""
+    fonts = collections.Counter(span["font"] for span in spans if span["text"].strip())
+    if not fonts:
+        return ""
+    main_font = fonts.most_common(1)[0][0]
+    parts = []
+    placeholder_id = 1
+    for span in spans:
+        text = span["text"]
+        if not text.strip() or span["font"] == main_font:
+            parts.append(text)
+        elif MATH_FONT.search(span["font"]):
+            parts.append(translator.get_formular_placeholder(placeholder_id)[0])
+            placeholder_id += 1
+        else:
+            left = translator.get_rich_text_left_placeholder(placeholder_id)[0]
+            right = translator.get_rich_text_right_placeholder(placeholder_id)[0]
+            parts.append(f"{left}{text}{right}")
+            placeholder_id += 1
+    return "".join(parts)
+
+
+def count_page_tokens(page, translator, count_tokens) -> tuple[int, int]:
+    """:return: prompt tokens and placeholder tokens of the page"""
+    prompt_tokens = 0
+    placeholder_tokens = 0
+    placeholder_pattern = re.compile("|".join(translator._get_placeholder_patterns()))
+    for block in page.get_text("dict")["blocks"]:
+        spans = [span for line in block.get("lines", []) for span in line["spans"]]
+        paragraph = build_paragraph(spans, translator)
+        if not paragraph.strip():
+            continue
+        prompt_tokens += count_tokens(translator.prompt(paragraph)[0]["content"])
+        placeholder_tokens += sum(
+            count_tokens(m.group(0)) for m in placeholder_pattern.finditer(paragraph)
+        )
+    return prompt_tokens, placeholder_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", type=Path)
+    args = parser.parse_args()
+    files = args.files or sorted(SAMPLE_DIR.glob("*.pdf"))
+
+    count_tokens, tokenizer = get_token_counter()
+    translators = {
+        scheme: create_translator(scheme) for scheme in ("standard", "compact")
+    }
+    print(f"Tokenizer: {tokenizer}")
+    print(
+        f"{'file':<40} {'pages':>5} "
+        + " ".join(
+            f"{scheme + '/page':>16} {'markup/page':>12}" for scheme in translators
+        )
+        + f" {'saved':>7}"
+    )
+    for file in files:
+        with pymupdf.open(file) as doc:
+            totals = {}
+            for scheme, translator in translators.items():
+                prompt, markup = 0, 0
+                for page in doc:
+                    page_prompt, page_markup = count_page_tokens(
+                        page, translator, count_tokens
+                    )
+                    prompt += page_prompt
+                    markup += page_markup
+                totals[scheme] = (prompt / len(doc), markup / len(doc))
+            saved = 1 - totals["compact"][0] / totals["standard"][0]
+            print(
+                f"{file.name[:40]:<40} {len(doc):>5} "
+                + " ".join(f"{p:>16.1f} {m:>12.1f}" for p, m in totals.values())
+                + f" {saved:>7.1%}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Measure how fast progress events get from a translation subprocess to the event loop.
+
+A thread plays the translation subprocess: it generates progress updates of a few
+stages at a fixed rate into a queue, which stands in for the pipe. A second thread
+plays the recv thread of _translate_in_subprocess and hands every event to the
+bridge. The consumer handles every event it gets with a small delay, like a
+progress view, and measures how late events and the end of the job arrive.
+
+The legacy bridge slept 50 ms after every event, it is kept here for comparison.
+
+Usage: python script/progress_event_benchmark.py [--events N] [--rate EVENTS_PER_S]
+"""
+
+import argparse
+import asyncio
+import queue
+import sys
+import threading
+import time
+
+from pdf2zh_next.high_level import _progress_coalesce_key
+from pdf2zh_next.utils.asynchronize import Args
+from pdf2zh_next.utils.asynchronize import AsyncCallback
+
+STAGES = ("Parse", "Layout", "Translate", "Typeset")
+
+
+class LegacyAsyncCallback:
+    """The bridge before coalescing: an asyncio.Queue and a sleep per event."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.loop = asyncio.get_event_loop()
+
+    def step_callback(self, *args, **kwargs):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, Args(args, kwargs))
+        time.sleep(0.05)
+
+    def finished_callback_without_args(self):
+        self.step_callback(AsyncCallback.MAGIC_MESSAGE_FINISHED)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        result = await self.queue.get()
+        if result.args[0] == AsyncCallback.MAGIC_MESSAGE_FINISHED:
+            raise StopAsyncIteration
+        return result
+
+
+def generate(pipe: queue.Queue, event_count: int, rate: float):
+    for i in range(event_count):
+        pipe.put(
+            {
+                "type": "progress_update",
+                "stage": STAGES[i * len(STAGES) // event_count],
+                "part_index": 1,
+                "overall_progress": 100 * i / event_count,
+                "generated_at": time.perf_counter(),
+            }
+        )
+        time.sleep(1 / rate)
+    pipe.put({"type": "finish", "generated_at": time.perf_counter()})
+
+
+def receive(pipe: queue.Queue, cb):
+    while True:
+        event = pipe.get()
+        cb.step_callback(event)
+        if event["type"] == "finish":
+            cb.finished_callback_without_args()
+            return
+
+
+async def run(cb_factory, event_count: int, rate: float, handler_seconds: float):
+    cb = cb_factory()
+    pipe = queue.Queue()
+    threads = [
+        threading.Thread(target=generate, args=(pipe, event_count, rate)),
+        threading.Thread(target=receive, args=(pipe, cb)),
+    ]
+    for thread in threads:
+        thread.start()
+    start = time.perf_counter()
+    received = 0
+    max_lag = 0.0
+    async for result in cb:
+        event = result.args[0]
+        lag = time.perf_counter() - event["generated_at"]
+        max_lag = max(max_lag, lag)
+        received += 1
+        if event["type"] == "finish":
+            finish_latency = lag
+        elif handler_seconds:
+            await asyncio.sleep(handler_seconds)
+    elapsed = time.perf_counter() - start
+    for thread in threads:
+        thread.join()
+    return {
+        "events/s": received / elapsed,
+        "received": received,
+        "max lag ms": max_lag * 1000,
+        "finish latency ms": finish_latency * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=300)
+    parser.add_argument("--rate", type=float, default=100.0)
+    parser.add_argument("--handler-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    bridges = {
+        "legacy": LegacyAsyncCallback,
+        "coalescing": lambda: AsyncCallback(coalesce_key=_progress_coalesce_key),
+    }
+    print(
+        f"{args.events} progress events at {args.rate:.0f}/s, "
+        f"{args.handler_ms} ms per handled event"
+    )
+    print(
+        f"{'bridge':<12} {'events/s':>9} {'received':>9} {'max lag ms':>11} {'finish ms':>10}"
+    )
+    for name, factory in bridges.items():
+        result = asyncio.run(
+            run(factory, args.events, args.rate, args.handler_ms / 1000)
+        )
+        print(
+            f"{name:<12} {result['events/s']:>9.0f} {result['received']:>9} "
+            f"{result['max lag ms']:>11.1f} {result['finish latency ms']:>10.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Stand-in for the Claude Code CLI speaking the stream-json protocol.
+
+Every user message is answered with the last line of its text upper-cased.
+A message whose last line is "crash" makes the process exit, one whose last line
+is "hang" is never answered and one whose last line is "turns" is answered with
+the number of messages received since the conversation was cleared by "/clear".
+"""
+
+import json
+import os
+import sys
+
+
+def emit(event):
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+
+def main():
+    if "--version" in sys.argv:
+        print("0.0.0 (Fake Claude Code)")
+        return
+    emit({"type": "system", "subtype": "init", "pid": os.getpid()})
+    turns = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        turns += 1
+        message = json.loads(line)["message"]
+        content = message["content"]
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") for part in content)
+        if content == "/clear":
+            turns = 0
+            emit({"type": "result", "subtype": "success", "is_error": False})
+            continue
+        text = content.rsplit("\n", 1)[-1]
+        if text == "crash":
+            sys.stderr.write("fake crash\n")
+            sys.exit(3)
+        if text == "hang":
+            continue
+        if text == "turns":
+            text = str(turns)
+        emit(
+            {
+                "type": "assistant",
+                "message": {"content": [{"type": "text", "text": text.upper()}]},
+            }
+        )
+        emit({"type": "result", "subtype": "success", "is_error": False})
+
+
+if __name__ == "__main__":
+    main()
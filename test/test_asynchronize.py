@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from pdf2zh_next.high_level import _progress_coalesce_key
+from pdf2zh_next.utils.asynchronize import AsyncCallback
+
+
+def progress(stage, value, event_type="progress_update"):
+    return {"type": event_type, "stage": stage, "part_index": 1, "value": value}
+
+
+async def collect(cb) -> list:
+    return [result.args[0] async for result in cb]
+
+
+class TestAsyncCallback(unittest.TestCase):
+    def test_events_delivered_in_order_without_delay(self):
+        async def main():
+            cb = AsyncCallback()
+
+            def produce():
+                for i in range(500):
+                    cb.step_callback(i)
+                cb.finished_callback_without_args()
+
+            start = time.monotonic()
+            thread = threading.Thread(target=produce)
+            thread.start()
+            events = await collect(cb)
+            thread.join()
+            return events, time.monotonic() - start
+
+        events, elapsed = asyncio.run(main())
+        self.assertEqual(events, list(range(500)))
+        self.assertLess(elapsed, 2)
+
+    def test_pending_progress_updates_coalesced(self):
+        async def main():
+            cb = AsyncCallback(coalesce_key=_progress_coalesce_key)
+            cb.step_callback(progress("Parse", 0, "progress_start"))
+            for i in range(10):
+                cb.step_callback(progress("Parse", i))
+                cb.step_callback(progress("Translate", i))
+            cb.step_callback(progress("Parse", 10, "progress_end"))
+            cb.finished_callback_without_args()
+            return await collect(cb), cb.coalesced_count
+
+        events, coalesced_count = asyncio.run(main())
+        self.assertEqual(
+            [(e["type"], e["stage"], e["value"]) for e in events],
+            [
+                ("progress_start", "Parse", 0),
+                ("progress_update", "Parse", 9),
+                ("progress_update", "Translate", 9),
+                ("progress_end", "Parse", 10),
+            ],
+        )
+        self.assertEqual(coalesced_count, 18)
+
+    def test_error_raised_after_pending_events(self):
+        async def main():
+            cb = AsyncCallback()
+            cb.step_callback(1)
+            cb.error_callback(ValueError("broken"))
+            events = []
+            with self.assertRaisesRegex(ValueError, "broken"):
+                async for result in cb:
+                    events.append(result.args[0])
+            return events
+
+        self.assertEqual(asyncio.run(main()), [1])
+
+    def test_bounded_until_consumed(self):
+        async def main():
+            cb = AsyncCallback(max_pending=2)
+            produced = threading.Event()
+
+            def produce():
+                for i in range(5):
+                    cb.step_callback(i)
+                produced.set()
+                cb.finished_callback_without_args()
+
+            thread = threading.Thread(target=produce)
+            thread.start()
+            await asyncio.sleep(0.1)
+            # The producer waits for room instead of growing the buffer
+            self.assertFalse(produced.is_set())
+            self.assertEqual(len(cb.pending), 2)
+            events = await collect(cb)
+            thread.join()
+            return events
+
+        self.assertEqual(asyncio.run(main()), list(range(5)))
+
+    def test_close_releases_waiting_producer(self):
+        async def main():
+            cb = AsyncCallback(max_pending=1)
+            cb.step_callback(0)
+            thread = threading.Thread(target=cb.step_callback, args=(1,))
+            thread.start()
+            await asyncio.sleep(0.05)
+            cb.close()
+            thread.join(timeout=1)
+            return thread.is_alive()
+
+        self.assertFalse(asyncio.run(main()))
+
+
+if __name__ == "__main__":
+    unittest.main()
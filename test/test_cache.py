@@ -73,6 +73,20 @@ class TestCache(unittest.TestCase):
         self.assertEqual(cache1.get("hello"), "你好 1")
         self.assertEqual(cache2.get("hello"), "你好 2")
 
+    def test_get_many(self):
+        """Test the bulk lookup of several texts"""
+        cache_instance = cache.TranslationCache("test_engine", {"lang_out": "zh"})
+        other_params = cache.TranslationCache("test_engine", {"lang_out": "ja"})
+        cache_instance.set("hello", "你好")
+        cache_instance.set("world", "世界")
+        other_params.set("cat", "猫")
+
+        texts = ["hello", "cat", "world", "hello"] + [f"text {i}" for i in range(600)]
+        self.assertEqual(
+            cache_instance.get_many(texts), {"hello": "你好", "world": "世界"}
+        )
+        self.assertEqual(cache_instance.get_many([]), {})
+
     def test_params_distinction(self):
         """Test that cache distinguishes between different engine parameters"""
         params1 = {"param": "value1"}
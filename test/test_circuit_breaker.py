@@ -0,0 +1,127 @@
+import time
+import unittest
+
+from pdf2zh_next.translator.circuit_breaker import CLOSED
+from pdf2zh_next.translator.circuit_breaker import HALF_OPEN
+from pdf2zh_next.translator.circuit_breaker import OPEN
+from pdf2zh_next.translator.circuit_breaker import CircuitBreaker
+from pdf2zh_next.translator.circuit_breaker import CircuitOpenError
+from pdf2zh_next.translator.circuit_breaker import RetryBudget
+from pdf2zh_next.translator.circuit_breaker import get_retry_budget
+from pdf2zh_next.translator.circuit_breaker import stop_translator_retry
+from tenacity import RetryError
+from tenacity import retry
+from tenacity import retry_if_exception_type
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_open_after_consecutive_failures(self):
+        """Test that only consecutive failures open the circuit"""
+        breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=60)
+        opened = []
+        breaker.add_open_listener(opened.append)
+
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(opened, [breaker])
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+    def test_half_open_probe(self):
+        """Test that a single probe is let through after the cooldown"""
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, HALF_OPEN)
+
+        breaker.before_request()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        time.sleep(0.06)
+        breaker.before_request()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.before_request()
+
+
+class TestRetryBudget(unittest.TestCase):
+    def test_budget_refills_with_successes(self):
+        """Test that retries are capped by the ratio of successes"""
+        budget = RetryBudget(ratio=0.5, burst=2)
+        self.assertTrue(budget.try_acquire())
+        self.assertTrue(budget.try_acquire())
+        self.assertFalse(budget.try_acquire())
+
+        budget.record_success()
+        self.assertFalse(budget.try_acquire())
+        budget.record_success()
+        self.assertTrue(budget.try_acquire())
+
+        for _ in range(10):
+            budget.record_success()
+        self.assertEqual(budget.tokens, 2)
+
+
+class FlakyTranslator:
+    max_retry_attempts = 4
+
+    def __init__(self, breaker):
+        self.circuit_breaker = breaker
+        self.calls = 0
+
+    @retry(
+        retry=retry_if_exception_type(ConnectionError),
+        stop=stop_translator_retry(),
+    )
+    def do_translate(self, text):
+        self.calls += 1
+        raise ConnectionError
+
+
+class TestStopTranslatorRetry(unittest.TestCase):
+    def setUp(self):
+        budget = get_retry_budget()
+        self.saved_tokens = budget.tokens
+        budget.tokens = float(budget.burst)
+
+    def tearDown(self):
+        get_retry_budget().tokens = self.saved_tokens
+
+    def test_stop_at_max_attempts(self):
+        """Test that the translator's max_retry_attempts is respected"""
+        translator = FlakyTranslator(CircuitBreaker("test"))
+        with self.assertRaises(RetryError):
+            translator.do_translate("Hello")
+        self.assertEqual(translator.calls, 4)
+
+    def test_stop_when_circuit_open(self):
+        """Test that no retry is made against an open circuit"""
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+        breaker.record_failure()
+        translator = FlakyTranslator(breaker)
+        with self.assertRaises(RetryError):
+            translator.do_translate("Hello")
+        self.assertEqual(translator.calls, 1)
+
+    def test_stop_when_budget_exhausted(self):
+        """Test that retries stop once the shared retry budget is spent"""
+        get_retry_budget().tokens = 1
+        translator = FlakyTranslator(CircuitBreaker("test"))
+        with self.assertRaises(RetryError):
+            translator.do_translate("Hello")
+        self.assertEqual(translator.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import subprocess
+import threading
+import unittest
+from pathlib import Path
+
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import ClaudeCodeSettings
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.translator_impl.claudecode import ClaudeCodeTranslator
+
+FAKE_CLI = str(Path(__file__).with_name("fake_claude_cli.py"))
+
+
+class TestClaudeCodeSessions(unittest.TestCase):
+    def setUp(self):
+        settings = SettingsModel(
+            translate_engine_settings=ClaudeCodeSettings(
+                claude_code_path=FAKE_CLI, claude_code_max_processes=2
+            )
+        )
+        settings.translate_engine_settings.validate_settings()
+        self.translator = ClaudeCodeTranslator(settings, QPSRateLimiter(4))
+        self.pool = self.translator.session_pool
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_processes_are_reused(self):
+        """Test that consecutive segments are served by the same process"""
+        for text in ["one", "two", "three"]:
+            self.assertEqual(self.translator.do_translate(text), text.upper())
+        self.assertEqual(self.pool.started_count, 1)
+        self.assertEqual(self.translator.pdf2zh_next_recommended_pool_max_workers, 2)
+
+    def test_fresh_context_per_request(self):
+        """Test that no segment is answered in the conversation of an earlier one"""
+        for _ in range(3):
+            self.assertEqual(self.translator.do_translate("turns"), "1")
+        self.assertEqual(self.pool.started_count, 1)
+
+    def test_concurrent_requests_bounded(self):
+        """Test that concurrent segments share at most max processes"""
+        results = {}
+
+        def translate(i):
+            results[i] = self.translator.do_translate(f"segment {i}")
+
+        threads = [threading.Thread(target=translate, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {i: f"SEGMENT {i}" for i in range(8)})
+        self.assertLessEqual(self.pool.started_count, 2)
+
+    def test_restart_on_crash(self):
+        """Test that a crashed process is replaced on the next request"""
+        with (
+            self.assertRaises(subprocess.CalledProcessError),
+            self.pool.acquire() as session,
+        ):
+            session.request({"role": "user", "content": "crash"})
+        self.assertFalse(session.is_alive())
+        self.assertEqual(self.translator.do_translate("after"), "AFTER")
+        self.assertEqual(self.pool.started_count, 2)
+
+    def test_timeout(self):
+        """Test that a process that does not answer is killed"""
+        with (
+            self.assertRaises(subprocess.TimeoutExpired),
+            self.pool.acquire() as session,
+        ):
+            session.request({"role": "user", "content": "hang"}, timeout=0.5)
+        self.assertFalse(session.is_alive())
+
+    def test_sessions_recycled(self):
+        """Test that a session is restarted after max turns"""
+        self.pool.max_turns = 2
+        for text in ["a", "b", "c"]:
+            self.translator.do_translate(text)
+        self.assertEqual(self.pool.started_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
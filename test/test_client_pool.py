@@ -0,0 +1,93 @@
+import contextlib
+import unittest
+
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAICompatibleSettings
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.translator.client_pool import ClientPool
+from pdf2zh_next.translator.client_pool import pair_keys_and_urls
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.translator_impl.openai import OpenAITranslator
+
+
+class TestClientPool(unittest.TestCase):
+    def test_pair_keys_and_urls(self):
+        """Test pairing of comma separated keys and urls"""
+        self.assertEqual(pair_keys_and_urls("k1, k2", "u"), [("k1", "u"), ("k2", "u")])
+        self.assertEqual(pair_keys_and_urls("k", "u1,u2"), [("k", "u1"), ("k", "u2")])
+        self.assertEqual(
+            pair_keys_and_urls("k1,k2", "u1,u2"), [("k1", "u1"), ("k2", "u2")]
+        )
+        self.assertEqual(pair_keys_and_urls("k", None), [("k", None)])
+        with self.assertRaises(ValueError):
+            pair_keys_and_urls("k1,k2,k3", "u1,u2")
+
+    def test_weighted_least_loaded(self):
+        """Test that concurrent requests are spread by weight"""
+        pool = ClientPool.from_keys_and_urls("a,b", None, "2,1", lambda key, _url: key)
+        with contextlib.ExitStack() as stack:
+            picked = [stack.enter_context(pool.acquire()) for _ in range(6)]
+        self.assertEqual(picked.count("a"), 4)
+        self.assertEqual(picked.count("b"), 2)
+
+    def test_failing_client_is_put_aside(self):
+        """Test that a failing client is skipped during its cooldown"""
+        pool = ClientPool.from_keys_and_urls("a,b", None, None, lambda key, _url: key)
+        with self.assertRaises(RuntimeError), pool.acquire() as client:
+            failed = client
+            raise RuntimeError
+        for _ in range(4):
+            with pool.acquire() as client:
+                self.assertNotEqual(client, failed)
+
+    def test_qps_shared_by_weight(self):
+        """Test that every key gets its share of the engine qps"""
+        pool = ClientPool.from_keys_and_urls(
+            "a,b", None, "3,1", lambda key, _url: key, qps=8
+        )
+        self.assertEqual([c.rate_limiter.max_qps for c in pool.clients], [6, 2])
+
+
+class TestOpenAIClientPool(unittest.TestCase):
+    def create_translator(self, api_key, base_url):
+        settings = SettingsModel(
+            translate_engine_settings=OpenAISettings(
+                openai_api_key=api_key, openai_base_url=base_url
+            )
+        )
+        settings.translate_engine_settings.validate_settings()
+        return OpenAITranslator(settings, QPSRateLimiter(4))
+
+    def test_cache_does_not_depend_on_keys(self):
+        """Test that cache parameters are the same whatever keys serve the requests"""
+        single = self.create_translator("k1", "https://a.example.com/v1")
+        multiple = self.create_translator(
+            "k1,k2", "https://a.example.com/v1,https://b.example.com/v1/"
+        )
+        self.assertEqual(len(multiple.client_pool), 2)
+        self.assertEqual(
+            single.cache.translate_engine_params,
+            multiple.cache.translate_engine_params,
+        )
+
+    def test_compatible_settings_transform(self):
+        """Test that weights survive the OpenAI Compatible transform"""
+        compatible = OpenAICompatibleSettings(
+            openai_compatible_api_key="k1,k2",
+            openai_compatible_base_url="https://a.example.com/v1/chat/completions",
+            openai_compatible_weights="1,3",
+        )
+        compatible.validate_settings()
+        settings = compatible.transform()
+        self.assertEqual(settings.openai_weights, "1,3")
+        self.assertEqual(settings.openai_base_url, "https://a.example.com/v1")
+
+    def test_weights_count_checked(self):
+        """Test that weights must match the number of keys"""
+        settings = OpenAISettings(openai_api_key="k1,k2", openai_weights="1")
+        with self.assertRaises(ValueError):
+            settings.validate_settings()
+
+
+if __name__ == "__main__":
+    unittest.main()
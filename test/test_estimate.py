@@ -0,0 +1,131 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import pymupdf
+from pdf2zh_next import estimate
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import DeepLSettings
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.translator import cache
+from pdf2zh_next.translator.latency_history import LatencyHistory
+
+SENTENCES = [
+    "The first paragraph explains the method in detail.",
+    "The second paragraph reports the results of the experiments.",
+    "https://example.com/paper",
+]
+
+
+def create_pdf(path: Path, page_count: int) -> Path:
+    doc = pymupdf.open()
+    for _ in range(page_count):
+        page = doc.new_page()
+        for i, sentence in enumerate(SENTENCES):
+            page.insert_text((72, 72 + 100 * i), sentence)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+class TestLatencyHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.history = LatencyHistory(self.tmp / "latency.json")
+
+    def test_mean_over_jobs(self):
+        self.assertIsNone(self.history.get("openai|api.openai.com"))
+        self.history.record("openai|api.openai.com", 10.0, 10)
+        self.history.record("openai|api.openai.com", 30.0, 10)
+        self.history.record("openai|api.openai.com", 0.0, 0)
+        self.assertAlmostEqual(self.history.get("openai|api.openai.com"), 2.0)
+        self.assertIsNone(self.history.get("google"))
+
+    def test_recent_jobs_weigh_more_than_old_history(self):
+        self.history.record("google", 1.0 * 5000, 5000)
+        self.history.record("google", 3.0 * 1000, 1000)
+        self.assertAlmostEqual(self.history.get("google"), 2.0)
+
+
+class TestEstimate(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.test_db = cache.init_test_db()
+        self.addCleanup(cache.clean_test_db, self.test_db)
+        self.file = create_pdf(self.tmp / "paper.pdf", 4)
+        self.history = LatencyHistory(self.tmp / "latency.json")
+        patcher = mock.patch.object(
+            estimate, "get_latency_history", return_value=self.history
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def estimate(self, engine_settings, **translation):
+        settings = SettingsModel(translate_engine_settings=engine_settings)
+        settings.translation.qps = 2
+        for name, value in translation.items():
+            setattr(settings.translation, name, value)
+        translator = SimpleNamespace(
+            cache=cache.TranslationCache("test_engine"), endpoint_key="test"
+        )
+        translator.cache.set(SENTENCES[0], "第一段")
+        return estimate.estimate_file(settings, self.file, translator)
+
+    def test_segments_cache_hits_and_requests(self):
+        result = self.estimate(DeepLSettings(deepl_auth_key="key"))
+        self.assertEqual(result.pages, 4)
+        self.assertEqual(result.segments, 12)
+        # The URLs need no translation
+        self.assertEqual(result.skipped_segments, 4)
+        self.assertEqual(result.cached_segments, 4)
+        self.assertEqual(result.cache_hit_ratio, 0.5)
+        self.assertEqual(result.requests, 4)
+        self.assertEqual(result.prompt_tokens, result.completion_tokens)
+        self.assertEqual(result.latency_source, "default")
+
+    def test_ignore_cache(self):
+        result = self.estimate(DeepLSettings(deepl_auth_key="key"), ignore_cache=True)
+        self.assertEqual(result.cached_segments, 0)
+        self.assertEqual(result.requests, 8)
+
+    def test_llm_engines_batch_paragraphs(self):
+        result = self.estimate(OpenAISettings(openai_api_key="key"))
+        self.assertEqual(result.skipped_segments, 0)
+        # Babeldoc caches whole batch prompts, not segments
+        self.assertEqual(result.cached_segments, 0)
+        # 12 paragraphs, batches are closed at 6 paragraphs
+        self.assertEqual(result.requests, 2)
+        self.assertGreater(result.prompt_tokens, result.completion_tokens)
+
+    def test_time_from_qps_workers_and_history(self):
+        self.history.record("test", 8.0, 2)
+        # 4 requests at most 2 per second, 1 worker with 4s latency
+        result = self.estimate(DeepLSettings(deepl_auth_key="key"), pool_max_workers=1)
+        self.assertEqual(result.latency_source, "history")
+        self.assertEqual(result.translation_seconds, 16.0)
+        self.assertEqual(
+            result.predicted_seconds,
+            16.0 + 4 * estimate.PROCESSING_SECONDS_PER_PAGE,
+        )
+        result = self.estimate(DeepLSettings(deepl_auth_key="key"), pool_max_workers=16)
+        self.assertEqual(result.translation_seconds, 2.0)
+
+    def test_total_of_batch(self):
+        file_estimate = self.estimate(DeepLSettings(deepl_auth_key="key"))
+        settings = SettingsModel(
+            translate_engine_settings=DeepLSettings(deepl_auth_key="key")
+        )
+        settings.basic.parallel_files = 2
+        total = estimate.total_estimate(settings, [file_estimate, file_estimate])
+        self.assertEqual(total.requests, 8)
+        self.assertEqual(total.cache_hit_ratio, 0.5)
+        self.assertEqual(total.processing_seconds, file_estimate.processing_seconds)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import openai
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.translator import utils
+from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.health_check import HealthCheckMemo
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.utils import _create_translator_instance
+
+
+class TestHealthCheckMemo(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "health_check.json"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_success_shared_through_file(self):
+        """Test that a success recorded by one process is seen by another"""
+        HealthCheckMemo(self.path).record_success("fp", ttl=60)
+        other_process = HealthCheckMemo(self.path)
+        self.assertTrue(other_process.is_healthy("fp", ttl=60))
+        self.assertFalse(other_process.is_healthy("other", ttl=60))
+
+    def test_ttl(self):
+        """Test that a success expires after its TTL, and TTL 0 disables the memo"""
+        memo = HealthCheckMemo(self.path)
+        memo.record_success("fp", ttl=0.05)
+        self.assertTrue(memo.is_healthy("fp", ttl=0.05))
+        self.assertFalse(memo.is_healthy("fp", ttl=0))
+        time.sleep(0.06)
+        self.assertFalse(memo.is_healthy("fp", ttl=0.05))
+
+    def test_corrupted_file_ignored(self):
+        self.path.write_text("not json")
+        memo = HealthCheckMemo(self.path)
+        self.assertFalse(memo.is_healthy("fp", ttl=60))
+        memo.record_success("fp", ttl=60)
+        self.assertTrue(HealthCheckMemo(self.path).is_healthy("fp", ttl=60))
+
+
+class EchoTranslator(BaseTranslator):
+    name = "echo"
+
+    def __init__(self, settings):
+        super().__init__(settings, QPSRateLimiter(100))
+        self.requests = []
+
+    def do_translate(self, text, rate_limit_params: dict = None):
+        self.requests.append(text)
+        return text
+
+
+class TestHealthCheck(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        memo = HealthCheckMemo(Path(self.temp_dir.name) / "health_check.json")
+        patcher = mock.patch.object(utils, "get_health_check_memo", lambda: memo)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.memo = memo
+
+    def create_settings(self, api_key: str) -> SettingsModel:
+        settings = SettingsModel(
+            translate_engine_settings=OpenAISettings(
+                openai_api_key=api_key, openai_base_url="http://127.0.0.1:9"
+            )
+        )
+        settings.translation.lang_in = "zh"
+        settings.translation.lang_out = "en"
+        settings.translation.max_retry_attempts = 1
+        return settings
+
+    def test_request_sent_for_latin_target_language(self):
+        """Test that the check reaches the engine, though "Hello" is already English"""
+        settings = self.create_settings("key")
+        translator = EchoTranslator(settings)
+        utils._check_translator_health(
+            settings, settings.translate_engine_settings, translator
+        )
+        self.assertEqual(translator.requests, ["Hello"])
+        fingerprint = utils.get_engine_fingerprint(settings.translate_engine_settings)
+        self.assertTrue(self.memo.is_healthy(fingerprint, ttl=60))
+
+    def test_unreachable_engine_not_remembered(self):
+        """Test that an engine failing the check raises and is not marked healthy"""
+        settings = self.create_settings("invalid")
+        with self.assertRaises(openai.APIConnectionError):
+            _create_translator_instance(
+                settings, settings.translate_engine_settings, QPSRateLimiter(100)
+            )
+        fingerprint = utils.get_engine_fingerprint(settings.translate_engine_settings)
+        self.assertFalse(self.memo.is_healthy(fingerprint, ttl=60))
+
+
+class TestLazyHealthCheck(unittest.TestCase):
+    def test_lazy_health_check_makes_no_request(self):
+        """Test that lazy validation creates the translator without any request"""
+        settings = SettingsModel(
+            translate_engine_settings=OpenAISettings(
+                openai_api_key="invalid", openai_base_url="http://127.0.0.1:9"
+            )
+        )
+        settings.translation.lazy_health_check = True
+        translator, _, _ = _create_translator_instance(
+            settings, settings.translate_engine_settings, rate_limiter=None
+        )
+        self.assertEqual(translator.translate_call_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from unittest import mock
+
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import DifySettings
+from pdf2zh_next.config.translate_engine_model import XinferenceSettings
+from pdf2zh_next.translator.http_client import get_shared_http_client
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.translator_impl.dify import DifyTranslator
+from pdf2zh_next.translator.translator_impl.xinference import XinferenceTranslator
+
+
+class DifyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        text = payload["inputs"]["text"]
+        data = json.dumps({"data": {"outputs": {"text": text.upper()}}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class TestSharedHTTPClient(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), DifyHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def create_translator(self):
+        settings = SettingsModel(
+            translate_engine_settings=DifySettings(
+                dify_url=f"http://127.0.0.1:{self.server.server_address[1]}/v1",
+                dify_apikey="key",
+            )
+        )
+        return DifyTranslator(settings, QPSRateLimiter(4))
+
+    def test_connections_reused(self):
+        """Test that consecutive segments reuse one connection"""
+        translator = self.create_translator()
+        for text in ["a", "b", "c"]:
+            self.assertEqual(translator.do_translate(text), text.upper())
+        self.assertEqual(
+            translator.transport_stats.as_dict(),
+            {
+                "requests": 3,
+                "connections": 1,
+                "tls_handshakes": 0,
+                "reused_connections": 2,
+            },
+        )
+
+    def test_client_shared_between_translators(self):
+        first = self.create_translator()
+        second = self.create_translator()
+        self.assertIs(first.client, second.client)
+        self.assertIs(first.client, get_shared_http_client())
+        first.do_translate("a")
+        second.do_translate("b")
+        self.assertEqual(second.transport_stats.connection_count.value, 0)
+
+    def test_stats_reset_per_job(self):
+        translator = self.create_translator()
+        translator.do_translate("a")
+        translator.reset_job_counters()
+        self.assertEqual(translator.transport_stats.request_count.value, 0)
+
+
+class StubModelHandle:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def chat(self, generate_config, messages):
+        if self.fail:
+            raise RuntimeError("model relaunched")
+        return {"choices": [{"message": {"content": "translated"}}]}
+
+
+class StubXinferenceClient:
+    def __init__(self):
+        self.handles = [StubModelHandle(fail=True), StubModelHandle()]
+        self.get_model_count = 0
+
+    def get_model(self, model):
+        handle = self.handles[min(self.get_model_count, 1)]
+        self.get_model_count += 1
+        return handle
+
+
+class TestXinferenceModelHandles(unittest.TestCase):
+    def test_handles_cached(self):
+        """Test that model handles are resolved once, and again after a failure"""
+        settings = SettingsModel(
+            translate_engine_settings=XinferenceSettings(xinference_model="model")
+        )
+        client = StubXinferenceClient()
+        with mock.patch(
+            "pdf2zh_next.translator.translator_impl.xinference.Client",
+            return_value=client,
+        ):
+            translator = XinferenceTranslator(settings, QPSRateLimiter(4))
+        with self.assertRaisesRegex(Exception, "All models failed"):
+            translator.do_llm_translate("hello")
+        for _ in range(3):
+            self.assertEqual(translator.do_llm_translate("hello"), "translated")
+        self.assertEqual(translator.client.get_model_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pymupdf
+from babeldoc.format.pdf.translation_config import TranslateResult
+from pdf2zh_next import high_level
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.incremental import page_fingerprint
+from pdf2zh_next.page_parts import selected_pages
+
+
+def create_pdf(path: Path, texts: list[str]) -> Path:
+    doc = pymupdf.open()
+    for text in texts:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def page_texts(path: Path) -> list[str]:
+    with pymupdf.open(path) as doc:
+        return [page.get_text().strip() for page in doc]
+
+
+class TestPageFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def fingerprints(self, name: str, texts: list[str]) -> list[str]:
+        with pymupdf.open(create_pdf(self.tmp / name, texts)) as doc:
+            return [page_fingerprint(page) for page in doc]
+
+    def test_regenerated_pages_keep_fingerprints(self):
+        v1 = self.fingerprints("v1.pdf", ["intro", "method", "results"])
+        v2 = self.fingerprints("v2.pdf", ["intro", "new method", "results"])
+        self.assertEqual(v1[0], v2[0])
+        self.assertNotEqual(v1[1], v2[1])
+        self.assertEqual(v1[2], v2[2])
+
+
+class TestIncrementalTranslation(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.translated_pages = []
+
+    async def fake_translate(self, settings, file):
+        source_texts = page_texts(file)
+        pages = selected_pages(len(source_texts), settings.parse_pages())
+        self.translated_pages.append([page + 1 for page in pages])
+        output = Path(settings.translation.output)
+        output.mkdir(parents=True, exist_ok=True)
+        mono = create_pdf(
+            output / f"{file.stem}.zh.mono.pdf",
+            [f"zh {source_texts[page]}" for page in pages],
+        )
+        # Alternating pages dual output
+        dual = create_pdf(
+            output / f"{file.stem}.zh.dual.pdf",
+            [
+                t
+                for page in pages
+                for t in (source_texts[page], f"zh {source_texts[page]}")
+            ],
+        )
+        yield {"type": "progress_start", "stage": "Translate", "overall_progress": 0}
+        result = TranslateResult(mono, dual)
+        result.total_valid_character_count = len(pages)
+        yield {
+            "type": "finish",
+            "translate_result": result,
+            "token_usage": {"main": {"total": len(pages)}},
+        }
+
+    def translate(self, name: str, texts: list[str]) -> dict:
+        source = create_pdf(self.tmp / name, texts)
+        settings = SettingsModel(
+            translate_engine_settings=OpenAISettings(openai_api_key="key")
+        )
+        settings.pdf.incremental = True
+        settings.translation.no_result_cache = True
+        settings.translation.output = str(self.tmp / "out")
+
+        async def collect():
+            return [
+                event
+                async for event in high_level.do_translate_async_stream(
+                    settings, source
+                )
+            ]
+
+        with (
+            mock.patch.object(
+                high_level, "_translate_in_subprocess", self.fake_translate
+            ),
+            mock.patch.object(high_level, "DEFAULT_PAGE_CACHE_DIR", self.tmp / "pages"),
+        ):
+            return asyncio.run(collect())[-1]
+
+    def test_only_changed_pages_translated(self):
+        v1 = [f"page {i}" for i in range(1, 7)]
+        first = self.translate("paper_v1.pdf", v1)
+        self.assertEqual(first["reused_pages"], 0)
+
+        v2 = list(v1)
+        v2[2] = "page 3 revised"
+        v2[4] = "page 5 revised"
+        event = self.translate("paper_v2.pdf", v2)
+        self.assertEqual(self.translated_pages, [[1, 2, 3, 4, 5, 6], [3, 5]])
+        self.assertEqual(event["reused_pages"], 4)
+        self.assertEqual(event["token_usage"]["main"]["total"], 2)
+
+        result = event["translate_result"]
+        self.assertEqual(
+            result.mono_pdf_path, self.tmp / "out" / "paper_v2.zh.mono.pdf"
+        )
+        self.assertEqual(page_texts(result.mono_pdf_path), [f"zh {t}" for t in v2])
+        self.assertEqual(
+            page_texts(result.dual_pdf_path),
+            [t for text in v2 for t in (text, f"zh {text}")],
+        )
+        self.assertEqual(result.total_valid_character_count, 2)
+
+    def test_unchanged_document_not_translated_again(self):
+        texts = ["a", "b", "c"]
+        self.translate("v1.pdf", texts)
+        event = self.translate("v2.pdf", texts)
+        self.assertEqual(len(self.translated_pages), 1)
+        self.assertEqual(event["reused_pages"], 3)
+        self.assertEqual(
+            page_texts(event["translate_result"].mono_pdf_path),
+            ["zh a", "zh b", "zh c"],
+        )
+
+    def test_pages_cannot_be_selected(self):
+        settings = SettingsModel(
+            translate_engine_settings=OpenAISettings(openai_api_key="key")
+        )
+        settings.pdf.incremental = True
+        settings.pdf.pages = "1-3"
+        with self.assertRaisesRegex(ValueError, "incremental"):
+            settings.validate_settings()
+
+
+if __name__ == "__main__":
+    unittest.main()
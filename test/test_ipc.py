@@ -0,0 +1,179 @@
+import logging
+import multiprocessing
+import pickle
+import time
+import unittest
+from pathlib import Path
+
+from babeldoc.format.pdf.translation_config import TranslateResult
+from pdf2zh_next import ipc
+from pdf2zh_next.high_level import BabeldocError
+from pdf2zh_next.high_level import SubprocessCrashError
+
+
+def progress(event_type="progress_update", stage="Translate", current=1):
+    return {
+        "type": event_type,
+        "stage": stage,
+        "stage_progress": 10.0 * current,
+        "stage_current": current,
+        "stage_total": 10,
+        "overall_progress": 42.5,
+        "part_index": 1,
+        "total_parts": 1,
+    }
+
+
+def round_trip(message):
+    return ipc.decode(ipc.encode(message))
+
+
+class FakeConnection:
+    def __init__(self):
+        self.frames = []
+
+    def send_bytes(self, frame):
+        self.frames.append(frame)
+
+    def messages(self):
+        return [ipc.decode(frame)[1] for frame in self.frames]
+
+
+class TestFrames(unittest.TestCase):
+    def test_progress_round_trip(self):
+        for event_type in ipc.PROGRESS_TYPES:
+            event = progress(event_type)
+            kind, decoded = round_trip(event)
+            self.assertEqual(kind, ipc.FRAME_PROGRESS)
+            self.assertEqual(decoded, event)
+
+    def test_progress_smaller_than_pickle(self):
+        event = progress()
+        self.assertLess(len(ipc.encode(event)), len(pickle.dumps(event)) / 2)
+
+    def test_stage_summary_round_trip(self):
+        event = {
+            "type": "stage_summary",
+            "stages": [
+                {"name": "Parse", "percent": 0.25},
+                {"name": "Translate", "percent": 0.75},
+            ],
+            "part_index": 0,
+            "total_parts": 1,
+        }
+        kind, decoded = round_trip(event)
+        self.assertEqual(kind, ipc.FRAME_STAGE_SUMMARY)
+        self.assertEqual(decoded, event)
+
+    def test_finish_round_trip(self):
+        result = TranslateResult(Path("out/mono.pdf"), Path("out/dual.pdf"))
+        result.original_pdf_path = "in.pdf"
+        result.total_seconds = 1.5
+        event = {
+            "type": "finish",
+            "translate_result": result,
+            "token_usage": {"main": {"total": 10, "prompt": 8}},
+        }
+        kind, decoded = round_trip(event)
+        self.assertEqual(kind, ipc.FRAME_FINISH)
+        self.assertIsInstance(decoded["translate_result"], TranslateResult)
+        self.assertEqual(vars(decoded["translate_result"]), vars(result))
+        self.assertEqual(
+            decoded["translate_result"].mono_pdf_path, Path("out/mono.pdf")
+        )
+        self.assertEqual(decoded["token_usage"], event["token_usage"])
+
+    def test_other_events_round_trip(self):
+        event = {"type": "custom", "path": Path("out/a.pdf"), "values": {1: (2, 3)}}
+        kind, decoded = round_trip(event)
+        self.assertEqual(kind, ipc.FRAME_EVENT)
+        self.assertEqual(
+            decoded,
+            {"type": "custom", "path": Path("out/a.pdf"), "values": {1: [2, 3]}},
+        )
+
+    def test_error_round_trip(self):
+        for error in (
+            BabeldocError("Babeldoc translation error: boom", original_error="boom"),
+            SubprocessCrashError("crashed", exit_code=-9),
+        ):
+            kind, decoded = round_trip(error)
+            self.assertEqual(kind, ipc.FRAME_ERROR)
+            self.assertIs(type(decoded), type(error))
+            # Rebuilt the way pickle rebuilds it
+            self.assertEqual(str(decoded), str(pickle.loads(pickle.dumps(error))))  # noqa: S301
+
+    def test_log_round_trip(self):
+        record = logging.LogRecord(
+            "pdf2zh_next.test", logging.WARNING, __file__, 1, "%d pages", (3,), None
+        )
+        kind, decoded = round_trip(record)
+        self.assertEqual(kind, ipc.FRAME_LOG)
+        self.assertEqual(decoded.getMessage(), "3 pages")
+        self.assertEqual(decoded.levelno, logging.WARNING)
+        self.assertEqual(decoded.name, "pdf2zh_next.test")
+        self.assertEqual(decoded.created, record.created)
+
+    def test_end_round_trip(self):
+        self.assertEqual(round_trip(None), (ipc.FRAME_END, None))
+
+    def test_version_mismatch_rejected(self):
+        frame = bytearray(ipc.encode(progress()))
+        frame[0] = ipc.PROTOCOL_VERSION + 1
+        with self.assertRaisesRegex(ipc.ProtocolError, "version"):
+            ipc.decode(bytes(frame))
+
+    def test_malformed_frame_rejected(self):
+        with self.assertRaises(ipc.ProtocolError):
+            ipc.decode(ipc.FRAME_HEADER.pack(ipc.PROTOCOL_VERSION, ipc.FRAME_PROGRESS))
+        with self.assertRaises(ipc.ProtocolError):
+            ipc.decode(b"\x01")
+
+
+class TestFrameChannel(unittest.TestCase):
+    def test_progress_updates_coalesced_until_other_message(self):
+        conn = FakeConnection()
+        channel = ipc.FrameChannel(conn, flush_interval=60)
+        channel.send(progress("progress_start"))
+        for i in range(10):
+            channel.send(progress(current=i))
+            channel.send(progress(stage="Typeset", current=i))
+        channel.send(progress("progress_end", current=10))
+        channel.send(None)
+        self.assertEqual(
+            [
+                (message["type"], message["stage"], message["stage_current"])
+                for message in conn.messages()[:-1]
+            ],
+            [
+                ("progress_start", "Translate", 1),
+                ("progress_update", "Translate", 9),
+                ("progress_update", "Typeset", 9),
+                ("progress_end", "Translate", 10),
+            ],
+        )
+        self.assertIsNone(conn.messages()[-1])
+        self.assertEqual(channel.coalesced_count, 18)
+
+    def test_pending_progress_flushed_after_interval(self):
+        conn = FakeConnection()
+        channel = ipc.FrameChannel(conn, flush_interval=0.05)
+        channel.send(progress(current=1))
+        self.assertEqual(conn.frames, [])
+        time.sleep(0.3)
+        self.assertEqual([m["stage_current"] for m in conn.messages()], [1])
+
+    def test_messages_over_pipe(self):
+        recv, send = multiprocessing.Pipe(duplex=False)
+        channel = ipc.FrameChannel(send)
+        channel.send(progress("progress_start"))
+        channel.send(SubprocessCrashError("crashed", exit_code=1))
+        channel.send_job_done()
+        kinds = [ipc.decode(recv.recv_bytes())[0] for _ in range(3)]
+        self.assertEqual(
+            kinds, [ipc.FRAME_PROGRESS, ipc.FRAME_ERROR, ipc.FRAME_JOB_DONE]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from pdf2zh_next.utils.json_file import read_json_file
+from pdf2zh_next.utils.json_file import write_json_file
+
+
+class TestJsonFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = Path(self.temp_dir.name) / "state" / "data.json"
+
+    def test_round_trip(self):
+        self.assertIsNone(read_json_file(self.path))
+        write_json_file(self.path, {"a": 1})
+        self.assertEqual(read_json_file(self.path), {"a": 1})
+
+    def test_failed_write_keeps_previous_content(self):
+        """Test that a failed write leaves the file and no temporary file behind"""
+        write_json_file(self.path, {"a": 1})
+        with self.assertRaises(TypeError):
+            write_json_file(self.path, {"a": object()})
+        self.assertEqual(read_json_file(self.path), {"a": 1})
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import psutil
+import pymupdf
+from pdf2zh_next import high_level
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.high_level import MemoryLimitError
+from pdf2zh_next.memory_watchdog import MemoryWatchdog
+from pdf2zh_next.memory_watchdog import get_rss
+
+
+def create_pdf(path: Path, page_count: int) -> Path:
+    doc = pymupdf.open()
+    for i in range(page_count):
+        doc.new_page().insert_text((72, 72), f"page {i + 1}")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def create_settings(memory_limit: int) -> SettingsModel:
+    settings = SettingsModel(
+        translate_engine_settings=OpenAISettings(openai_api_key="key")
+    )
+    settings.translation.memory_limit = memory_limit
+    settings.translation.no_result_cache = True
+    return settings
+
+
+class TestMemoryWatchdog(unittest.TestCase):
+    def test_soft_limit_reported_once(self):
+        rss = get_rss(os.getpid())
+        soft_calls = []
+        watchdog = MemoryWatchdog(
+            os.getpid(), rss * 4, on_soft_limit=soft_calls.append, soft_limit_ratio=0
+        )
+        self.assertTrue(watchdog.check())
+        self.assertTrue(watchdog.check())
+        self.assertEqual(len(soft_calls), 1)
+        self.assertFalse(watchdog.limit_exceeded)
+        self.assertGreater(watchdog.peak_rss_mb, 0)
+
+    def test_limit_exceeded(self):
+        limit_calls = []
+        watchdog = MemoryWatchdog(os.getpid(), 1024, on_limit=limit_calls.append)
+        self.assertFalse(watchdog.check())
+        self.assertTrue(watchdog.limit_exceeded)
+        self.assertEqual(limit_calls, [watchdog.peak_rss])
+
+    def test_exited_process(self):
+        process = mock.Mock()
+        process.memory_info.side_effect = psutil.NoSuchProcess(1)
+        with mock.patch("psutil.Process", return_value=process):
+            self.assertIsNone(get_rss(1))
+
+
+class TestMemoryDegradation(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.pages_per_part = []
+
+    def test_smaller_pages_per_part(self):
+        settings = create_settings(1000)
+        self.assertEqual(high_level._smaller_pages_per_part(settings, 300), 150)
+        settings.pdf.max_pages_per_part = 120
+        self.assertEqual(high_level._smaller_pages_per_part(settings, 300), 60)
+        settings.pdf.max_pages_per_part = 50
+        self.assertEqual(high_level._smaller_pages_per_part(settings, 300), 25)
+        settings.pdf.max_pages_per_part = 6
+        self.assertEqual(high_level._smaller_pages_per_part(settings, 300), 4)
+        settings.pdf.max_pages_per_part = 4
+        self.assertIsNone(high_level._smaller_pages_per_part(settings, 300))
+        settings.pdf.max_pages_per_part = None
+        self.assertEqual(high_level._smaller_pages_per_part(settings, 40), 20)
+        self.assertIsNone(high_level._smaller_pages_per_part(settings, 4))
+
+    async def fake_translate_in_worker(self, settings, file, degradable=False):
+        self.pages_per_part.append(settings.pdf.max_pages_per_part)
+        yield {"type": "progress_start", "stage": "Translate", "overall_progress": 0}
+        if degradable and len(self.pages_per_part) < 3:
+            raise high_level._MemoryPressureError(1600.0 + len(self.pages_per_part))
+        yield {"type": "finish", "token_usage": {}, "peak_rss_mb": 900.0}
+
+    def translate(self, settings: SettingsModel, file: Path) -> list[dict]:
+        async def collect():
+            return [
+                event
+                async for event in high_level.do_translate_async_stream(settings, file)
+            ]
+
+        with mock.patch.object(
+            high_level, "_translate_in_worker", self.fake_translate_in_worker
+        ):
+            return asyncio.run(collect())
+
+    def test_translated_again_in_smaller_parts(self):
+        file = create_pdf(self.tmp / "scan.pdf", 240)
+        events = self.translate(create_settings(2000), file)
+        self.assertEqual(self.pages_per_part, [None, 120, 60])
+        self.assertEqual(events[-1]["type"], "finish")
+        self.assertEqual(events[-1]["peak_rss_mb"], 1602.0)
+
+    def test_short_scan_degraded(self):
+        """Test that a short document heavy per page is split as well"""
+        file = create_pdf(self.tmp / "scan.pdf", 20)
+        self.translate(create_settings(2000), file)
+        self.assertEqual(self.pages_per_part, [None, 10, 5])
+
+    def test_few_pages_not_degraded(self):
+        file = create_pdf(self.tmp / "short.pdf", 4)
+        events = self.translate(create_settings(2000), file)
+        self.assertEqual(self.pages_per_part, [None])
+        self.assertEqual(events[-1]["peak_rss_mb"], 900.0)
+
+    def test_error_event_has_peak_rss(self):
+        async def exceed_limit(_settings, _file):
+            raise MemoryLimitError("too much", peak_rss_mb=2100.5, limit_mb=2000)
+            yield
+
+        file = create_pdf(self.tmp / "scan.pdf", 1)
+        events = []
+
+        async def collect():
+            async for event in high_level.do_translate_async_stream(
+                create_settings(2000), file
+            ):
+                events.append(event)
+
+        with mock.patch.object(high_level, "_translate_in_subprocess", exceed_limit):
+            with self.assertRaises(MemoryLimitError):
+                asyncio.run(collect())
+        self.assertEqual(events[-1]["type"], "error")
+        self.assertEqual(events[-1]["error_type"], "MemoryLimitError")
+        self.assertEqual(events[-1]["peak_rss_mb"], 2100.5)
+        self.assertEqual(events[-1]["memory_limit_mb"], 2000)
+
+    def test_memory_limit_validated(self):
+        settings = create_settings(-1)
+        with self.assertRaisesRegex(ValueError, "memory_limit"):
+            settings.validate_settings()
+
+
+if __name__ == "__main__":
+    unittest.main()
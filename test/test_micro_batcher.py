@@ -0,0 +1,217 @@
+import functools
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import DeepLSettings
+from pdf2zh_next.config.translate_engine_model import TencentSettings
+from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.micro_batcher import MicroBatcher
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+
+try:
+    from pdf2zh_next.translator.translator_impl.tencentmechinetranslation import (
+        TencentMechineTranslationTranslator,
+    )
+except ImportError:
+    # Some releases of tencentcloud-sdk-python-tmt ship without the text APIs
+    TencentMechineTranslationTranslator = None
+
+
+class RecordingSender:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.batches = []
+
+    def __call__(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+        time.sleep(self.delay)
+        return [f"T:{text}" for text in texts]
+
+
+class FailingSender(RecordingSender):
+    def __call__(self, texts):
+        super().__call__(texts)
+        raise RuntimeError("batch failed")
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_texts_grouped(self):
+        """Test that every thread gets its own translation from shared batches"""
+        sender = RecordingSender()
+        batcher = MicroBatcher(sender, max_chars=100, wait=0.05)
+        texts = [f"text {i}" for i in range(200)]
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(batcher.translate, texts))
+        self.assertEqual(results, [f"T:{text}" for text in texts])
+        self.assertLess(len(sender.batches), len(texts) / 4)
+        for batch in sender.batches:
+            self.assertLessEqual(sum(len(text) for text in batch), 100)
+        self.assertEqual(sorted(t for b in sender.batches for t in b), sorted(texts))
+
+    def test_lone_text_sent_at_once(self):
+        """Test that a text is not held back while no other request is in flight"""
+        sender = RecordingSender()
+        batcher = MicroBatcher(sender, max_chars=100, wait=5)
+        start = time.monotonic()
+        self.assertEqual(batcher.translate("a"), "T:a")
+        self.assertEqual(batcher.translate("b"), "T:b")
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(sender.batches, [["a"], ["b"]])
+
+    def test_texts_sent_at_once_below_max_in_flight(self):
+        sender = RecordingSender(delay=0.2)
+        batcher = MicroBatcher(sender, max_chars=100, wait=5, max_in_flight=4)
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(batcher.translate, ["a", "b", "c", "d"]))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_max_items(self):
+        sender = RecordingSender()
+        batcher = MicroBatcher(sender, max_chars=10_000, max_items=3, wait=0.2)
+        with ThreadPoolExecutor(max_workers=9) as executor:
+            list(executor.map(batcher.translate, ["a"] * 9))
+        self.assertTrue(all(len(batch) <= 3 for batch in sender.batches))
+
+    def test_long_text_sent_alone(self):
+        sender = RecordingSender()
+        batcher = MicroBatcher(sender, max_chars=10, wait=0.01)
+        self.assertEqual(batcher.translate("x" * 50), "T:" + "x" * 50)
+        self.assertEqual(sender.batches, [["x" * 50]])
+
+    def test_error_reaches_every_text(self):
+        """Test that a failed batch fails every segment in it"""
+
+        def fail(_texts):
+            raise RuntimeError("batch failed")
+
+        batcher = MicroBatcher(fail, max_chars=100, wait=0.05)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(batcher.translate, "a") for _ in range(4)]
+        for future in futures:
+            self.assertIsInstance(future.exception(), RuntimeError)
+
+
+class CountingRateLimiter(QPSRateLimiter):
+    def __init__(self, qps):
+        super().__init__(qps)
+        self.wait_count = 0
+
+    def wait(self, rate_limit_params: dict = None):
+        self.wait_count += 1
+        super().wait(rate_limit_params)
+
+
+class BatchingTranslator(BaseTranslator):
+    name = "batching"
+    batches_requests = True
+
+    def __init__(self, settings, rate_limiter, sender):
+        super().__init__(settings, rate_limiter)
+        self.batcher = MicroBatcher(
+            functools.partial(self.send_batch, sender), max_chars=10_000, wait=0.05
+        )
+
+    def do_translate(self, text, rate_limit_params: dict = None):
+        return self.batcher.translate(text)
+
+
+def create_settings(auth_key: str) -> SettingsModel:
+    settings = SettingsModel(
+        translate_engine_settings=DeepLSettings(deepl_auth_key=auth_key)
+    )
+    settings.translation.ignore_cache = True
+    return settings
+
+
+class TestBatchingTranslator(unittest.TestCase):
+    def test_rate_slot_per_batch(self):
+        """Test that segments sent through translate() share the rate slots of their batch"""
+        settings = create_settings("batch-rate")
+        rate_limiter = CountingRateLimiter(settings.translation.qps)
+        sender = RecordingSender()
+        translator = BatchingTranslator(settings, rate_limiter, sender)
+        texts = [f"segment {i}" for i in range(40)]
+        with ThreadPoolExecutor(max_workers=settings.translation.qps * 5) as executor:
+            results = list(executor.map(translator.translate, texts))
+        self.assertEqual(results, [f"T:{text}" for text in texts])
+        self.assertEqual(rate_limiter.wait_count, len(sender.batches))
+        self.assertLess(len(sender.batches), len(texts) / 4)
+
+    def test_failed_batch_counts_once(self):
+        """Test that a failed batch is a single failure for the circuit breaker"""
+        sender = FailingSender()
+        settings = create_settings("batch-failure")
+        translator = BatchingTranslator(settings, QPSRateLimiter(4), sender)
+        translator.batcher.wait = 0.5
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(translator.translate, "a") for _ in range(4)]
+        for future in futures:
+            self.assertIsInstance(future.exception(), RuntimeError)
+        self.assertEqual(
+            translator.circuit_breaker.consecutive_failures, len(sender.batches)
+        )
+        self.assertLess(len(sender.batches), 4)
+
+
+class StubTmtClient:
+    """Records the request objects, to check that none is shared between calls."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def _record(self, req):
+        with self.lock:
+            self.requests.append(req)
+        time.sleep(0.005)
+
+    def TextTranslate(self, req):  # noqa: N802
+        source_text = req.SourceText
+        self._record(req)
+        return mock.Mock(TargetText=f"T:{source_text}")
+
+    def TextTranslateBatch(self, req):  # noqa: N802
+        source_texts = list(req.SourceTextList)
+        self._record(req)
+        return mock.Mock(TargetTextList=[f"T:{text}" for text in source_texts])
+
+
+@unittest.skipIf(
+    TencentMechineTranslationTranslator is None,
+    "tencentcloud-sdk-python-tmt without the text translation API",
+)
+class TestTencentTranslator(unittest.TestCase):
+    def test_many_threads(self):
+        """Test that segments are batched through translate() at the default qps"""
+        settings = SettingsModel(
+            translate_engine_settings=TencentSettings(
+                tencentcloud_secret_id="id",  # noqa: S106
+                tencentcloud_secret_key="key",  # noqa: S106
+            )
+        )
+        settings.translation.ignore_cache = True
+        client = StubTmtClient()
+        module = "pdf2zh_next.translator.translator_impl.tencentmechinetranslation"
+        with mock.patch(f"{module}.TmtClient", return_value=client):
+            translator = TencentMechineTranslationTranslator(
+                settings, QPSRateLimiter(settings.translation.qps)
+            )
+        texts = [f"segment {i}" for i in range(300)]
+        with ThreadPoolExecutor(max_workers=50) as executor:
+            results = list(executor.map(translator.translate, texts))
+        self.assertEqual(results, [f"T:{text}" for text in texts])
+        self.assertEqual(
+            len({id(req) for req in client.requests}), len(client.requests)
+        )
+        self.assertLess(len(client.requests), len(texts) / 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
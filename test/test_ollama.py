@@ -0,0 +1,80 @@
+import os
+import threading
+import unittest
+from unittest import mock
+
+from ollama import ChatResponse
+from ollama import Message
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OllamaSettings
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.translator_impl.ollama import OllamaTranslator
+
+
+class StubClient:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def generate(self, **kwargs):
+        with self.lock:
+            self.calls.append(("generate", kwargs))
+
+    def chat(self, **kwargs):
+        with self.lock:
+            self.calls.append(("chat", kwargs))
+        return ChatResponse(
+            message=Message(role="assistant", content="translated"),
+            prompt_eval_count=10,
+            eval_count=50,
+            eval_duration=500_000_000,
+        )
+
+
+class TestOllamaTranslator(unittest.TestCase):
+    def create_translator(self, **kwargs):
+        settings = SettingsModel(translate_engine_settings=OllamaSettings(**kwargs))
+        settings.translate_engine_settings.validate_settings()
+        client = StubClient()
+        with mock.patch("ollama.Client", return_value=client):
+            translator = OllamaTranslator(settings, QPSRateLimiter(4))
+        translator.warm_up_thread.join()
+        return translator, client
+
+    def test_warm_up_and_keep_alive(self):
+        """Test that the model is loaded at creation and kept loaded"""
+        translator, client = self.create_translator(ollama_keep_alive="-1")
+        self.assertEqual(
+            client.calls[0], ("generate", {"model": "gemma2", "keep_alive": -1})
+        )
+        translator.do_translate("hello")
+        self.assertEqual(client.calls[1][1]["keep_alive"], -1)
+
+    def test_num_predict_per_request(self):
+        """Test that a long text does not raise num_predict of later requests"""
+        translator, client = self.create_translator(num_predict=100)
+        translator.do_llm_translate("x" * 50)
+        translator.do_llm_translate("x")
+        self.assertEqual(client.calls[1][1]["options"]["num_predict"], 250)
+        self.assertEqual(client.calls[2][1]["options"]["num_predict"], 100)
+        self.assertEqual(translator.options["num_predict"], 100)
+
+    def test_tokens_per_second(self):
+        translator, _ = self.create_translator()
+        self.assertIsNone(translator.tokens_per_second)
+        translator.do_translate("hello")
+        translator.do_translate("world")
+        self.assertEqual(translator.tokens_per_second, 100)
+        translator.reset_job_counters()
+        self.assertIsNone(translator.tokens_per_second)
+
+    def test_pool_workers_from_num_parallel(self):
+        with mock.patch.dict(os.environ, {"OLLAMA_NUM_PARALLEL": "3"}):
+            translator, _ = self.create_translator()
+        self.assertEqual(translator.pdf2zh_next_recommended_pool_max_workers, 3)
+        translator, _ = self.create_translator(ollama_num_parallel=6)
+        self.assertEqual(translator.pdf2zh_next_recommended_pool_max_workers, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import asyncio
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pymupdf
+from babeldoc.format.pdf.translation_config import TranslateResult
+from pdf2zh_next import high_level
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.page_parts import merge_pdfs
+from pdf2zh_next.page_parts import plan_parts
+
+
+def create_pdf(path: Path, page_count: int, prefix: str = "page") -> Path:
+    doc = pymupdf.open()
+    for i in range(page_count):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"{prefix} {i + 1}")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def page_texts(path: Path) -> list[str]:
+    with pymupdf.open(path) as doc:
+        return [page.get_text().strip() for page in doc]
+
+
+class TestPlanParts(unittest.TestCase):
+    def test_pages_balanced_over_parts(self):
+        parts = plan_parts(100, None, 3)
+        self.assertEqual(
+            [(p.start_page, p.end_page) for p in parts], [(0, 33), (34, 66), (67, 99)]
+        )
+        self.assertTrue(all(p.pages_setting() is None for p in parts))
+
+    def test_selected_pages_balanced_and_whole_document_covered(self):
+        # Pages 1-5 and 41-60 are translated
+        parts = plan_parts(80, [(1, 5), (41, 60)], 2, min_pages=5)
+        self.assertEqual(
+            [(p.start_page, p.end_page) for p in parts], [(0, 47), (48, 79)]
+        )
+        self.assertEqual([len(p.pages) for p in parts], [13, 12])
+        self.assertEqual(parts[0].pages_setting(), "1-5,41-48")
+        self.assertEqual(parts[1].pages_setting(), "1-12")
+
+    def test_open_ended_range(self):
+        parts = plan_parts(30, [(11, -1)], 2, min_pages=10)
+        self.assertEqual(
+            [(p.start_page, p.end_page, p.pages_setting()) for p in parts],
+            [(0, 19, "11-20"), (20, 29, None)],
+        )
+
+    def test_short_documents_not_split(self):
+        self.assertEqual(plan_parts(15, None, 4, min_pages=10), [])
+        self.assertEqual(len(plan_parts(25, None, 4, min_pages=10)), 2)
+        self.assertEqual(plan_parts(100, [(3, 3)], 4, min_pages=1), [])
+
+
+class TestParallelParts(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.part_pages = []
+        self.fail_part = None
+        self.cancelled_parts = 0
+
+    def test_merge_pdfs_in_order(self):
+        paths = [create_pdf(self.tmp / f"{i}.pdf", 2, f"doc{i}") for i in range(3)]
+        merged = merge_pdfs(paths, self.tmp / "merged.pdf")
+        self.assertEqual(
+            page_texts(merged),
+            [f"doc{i} {n}" for i in range(3) for n in (1, 2)],
+        )
+
+    async def fake_translate(self, settings, file):
+        self.part_pages.append((settings.pdf.pages, len(page_texts(file))))
+        if self.fail_part is not None:
+            if file.stem.endswith(f"part{self.fail_part}"):
+                raise high_level.TranslationError("part failed")
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                self.cancelled_parts += 1
+                raise
+        output = Path(settings.translation.output)
+        mono = output / f"{file.stem}.zh.mono.pdf"
+        shutil.copy(file, mono)
+        for event_type, progress in (("progress_start", 0), ("progress_end", 100)):
+            yield {
+                "type": event_type,
+                "stage": "Translate",
+                "stage_progress": progress,
+                "stage_current": 1,
+                "stage_total": 1,
+                "overall_progress": progress,
+                "part_index": 1,
+                "total_parts": 1,
+            }
+        result = TranslateResult(mono, None)
+        result.peak_memory_usage = 100
+        yield {
+            "type": "finish",
+            "translate_result": result,
+            "token_usage": {
+                "main": {
+                    "total": 10,
+                    "prompt": 8,
+                    "completion": 2,
+                    "cache_hit_prompt": 2,
+                }
+            },
+        }
+
+    def translate(self, page_count=30, pages=None):
+        source = create_pdf(self.tmp / "book.pdf", page_count)
+        settings = SettingsModel(
+            translate_engine_settings=OpenAISettings(openai_api_key="key")
+        )
+        settings.pdf.parallel_parts = 3
+        settings.pdf.pages = pages
+        settings.translation.output = str(self.tmp / "out")
+        settings.translation.no_result_cache = True
+
+        async def collect():
+            return [
+                event
+                async for event in high_level.do_translate_async_stream(
+                    settings, source
+                )
+            ]
+
+        with mock.patch.object(
+            high_level, "_translate_in_subprocess", self.fake_translate
+        ):
+            return asyncio.run(collect())
+
+    def test_parts_translated_and_merged_in_page_order(self):
+        events = self.translate()
+        self.assertEqual(sorted(self.part_pages), [(None, 10)] * 3)
+        finish = [e for e in events if e["type"] == "finish"]
+        self.assertEqual(len(finish), 1)
+        self.assertEqual(finish[0], events[-1])
+        result = finish[0]["translate_result"]
+        self.assertEqual(result.mono_pdf_path, self.tmp / "out" / "book.zh.mono.pdf")
+        self.assertEqual(
+            page_texts(result.mono_pdf_path), [f"page {i}" for i in range(1, 31)]
+        )
+        self.assertIsNone(result.dual_pdf_path)
+        self.assertEqual(result.peak_memory_usage, 300)
+        self.assertEqual(
+            finish[0]["token_usage"]["main"],
+            {
+                "total": 30,
+                "prompt": 24,
+                "completion": 6,
+                "cache_hit_prompt": 6,
+                "cache_hit_ratio": 0.25,
+            },
+        )
+
+    def test_progress_reported_for_document(self):
+        events = self.translate()
+        progress = [e for e in events if e["type"].startswith("progress")]
+        self.assertEqual({e["total_parts"] for e in progress}, {3})
+        self.assertEqual({e["part_index"] for e in progress}, {1, 2, 3})
+        self.assertEqual(progress[-1]["overall_progress"], 100)
+
+    def test_page_selection_split_over_parts(self):
+        # 23 pages to translate make two parts of at least 10 pages
+        self.translate(page_count=60, pages="1-3,41-")
+        self.assertEqual(
+            sorted(self.part_pages, key=str), [("1-3,41-49", 49), (None, 11)]
+        )
+
+    def test_failed_part_stops_other_parts(self):
+        self.fail_part = 1
+        with self.assertRaisesRegex(high_level.TranslationError, "part failed"):
+            self.translate()
+        self.assertEqual(self.cancelled_parts, 2)
+        self.assertFalse((self.tmp / "out" / "book.zh.mono.pdf").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from pdf2zh_next import high_level
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+
+
+class FakeResult:
+    original_pdf_path = "in.pdf"
+    total_seconds = 0.1
+    mono_pdf_path = None
+    dual_pdf_path = None
+
+
+def create_settings(files, parallel_files=3):
+    settings = SettingsModel(
+        translate_engine_settings=OpenAISettings(openai_api_key="key")
+    )
+    settings.basic.input_files = set(files)
+    settings.basic.parallel_files = parallel_files
+    return settings
+
+
+class TestParallelFiles(unittest.TestCase):
+    def setUp(self):
+        self.running = 0
+        self.max_running = 0
+        self.translated = []
+
+    async def fake_stream(self, settings, file):
+        yield {
+            "type": "progress_start",
+            "stage": "Parse",
+            "stage_total": 1,
+            "part_index": 1,
+            "total_parts": 1,
+            "overall_progress": 0,
+        }
+        if "bad" in file:
+            yield {"type": "error", "error": "broken", "error_type": "X"}
+            raise high_level.TranslationError("broken")
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+        self.translated.append(file)
+        yield {"type": "finish", "translate_result": FakeResult()}
+
+    def translate(self, settings, ignore_error):
+        with mock.patch.object(
+            high_level, "do_translate_async_stream", self.fake_stream
+        ):
+            return asyncio.run(
+                high_level.do_translate_file_async(settings, ignore_error)
+            )
+
+    def test_files_translated_concurrently(self):
+        files = [f"{i}.pdf" for i in range(5)]
+        self.assertEqual(self.translate(create_settings(files), False), 0)
+        self.assertEqual(sorted(self.translated), files)
+        self.assertEqual(self.max_running, 3)
+
+    def test_sequential_by_default(self):
+        files = [f"{i}.pdf" for i in range(3)]
+        self.assertEqual(self.translate(create_settings(files, 1), False), 0)
+        self.assertEqual(self.max_running, 1)
+
+    def test_errors_counted_with_ignore_error(self):
+        files = ["bad1.pdf", "bad2.pdf", "good.pdf"]
+        self.assertEqual(self.translate(create_settings(files), True), 2)
+        self.assertEqual(self.translated, ["good.pdf"])
+
+    def test_error_stops_batch(self):
+        """Test that the files still running are cancelled after an error"""
+        files = ["bad.pdf"] + [f"{i}.pdf" for i in range(5)]
+        with self.assertRaises(RuntimeError):
+            self.translate(create_settings(files, 2), False)
+        self.assertLess(len(self.translated), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import re
+import unittest
+from unittest import mock
+
+from babeldoc.format.pdf.document_il.midend import il_translator
+from babeldoc.format.pdf.document_il.midend import il_translator_llm_only
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.translator_impl.openai import OpenAITranslator
+
+
+def create_translator(scheme=None):
+    settings = SettingsModel(
+        translate_engine_settings=OpenAISettings(openai_api_key="key")
+    )
+    settings.translation.placeholder_scheme = scheme
+    settings.translation.ignore_cache = True
+    settings.validate_settings()
+    return OpenAITranslator(settings, QPSRateLimiter(4))
+
+
+class TestCompactPlaceholders(unittest.TestCase):
+    def setUp(self):
+        self.translator = create_translator("compact")
+
+    def test_placeholders(self):
+        self.assertEqual(self.translator.get_formular_placeholder(3)[0], "{3}")
+        self.assertEqual(self.translator.get_rich_text_left_placeholder(2)[0], "<b2>")
+        self.assertEqual(self.translator.get_rich_text_right_placeholder(2)[0], "</b2>")
+
+    def test_mangled_variants_recovered(self):
+        """Test that spacing and full-width characters added by models are matched"""
+        formula = self.translator.get_formular_placeholder(12)[1]
+        left = self.translator.get_rich_text_left_placeholder(2)[1]
+        right = self.translator.get_rich_text_right_placeholder(2)[1]
+        for text in ["{12}", "{ 12 }", "｛12｝"]:
+            self.assertTrue(re.fullmatch(formula, text), text)
+        self.assertFalse(re.search(formula, "{1}{2}"))
+        for text in ["<b2>", "< b2 >", "＜b2＞", "<B2>"]:
+            self.assertTrue(re.fullmatch(left, text, re.IGNORECASE), text)
+        for text in ["</b2>", "< / b2>", "＜／b2＞"]:
+            self.assertTrue(re.fullmatch(right, text, re.IGNORECASE), text)
+        self.assertFalse(re.search(right, "</b12>"))
+
+    def test_any_id_patterns(self):
+        """Test the patterns used to detect hallucinated placeholders"""
+        formula = self.translator.get_formular_placeholder(r"\d+")[1]
+        self.assertTrue(re.fullmatch(formula, "{42}"))
+
+    def test_cache_separated_from_standard(self):
+        standard = create_translator()
+        self.assertNotEqual(
+            standard.cache.translate_engine_params,
+            self.translator.cache.translate_engine_params,
+        )
+        self.assertEqual(standard.get_formular_placeholder(1)[0], "{v1}")
+
+    def test_invalid_scheme(self):
+        with self.assertRaises(ValueError):
+            create_translator("tiny")
+
+
+def llm_only_prompt(json_input_str):
+    return il_translator_llm_only.PROMPT_TEMPLATE.substitute(
+        role_block="You are a professional Simplified Chinese native translator.",
+        lang_out="Simplified Chinese",
+        glossary_usage_rules_block="",
+        contextual_hints_block="",
+        glossary_tables_block="",
+        json_input_str=json_input_str,
+    )
+
+
+def il_prompt(text):
+    return il_translator.PROMPT_TEMPLATE.substitute(
+        role_block="You are a professional Simplified Chinese native translator.",
+        lang_out="Simplified Chinese",
+        glossary_block="",
+        context_block="",
+        text_to_translate=text,
+    )
+
+
+class TestLlmPromptExamples(unittest.TestCase):
+    def sent_prompt(self, scheme, prompt):
+        translator = create_translator(scheme)
+        with mock.patch.object(
+            translator, "do_llm_translate", return_value="ok"
+        ) as do_llm_translate:
+            translator.llm_translate(prompt)
+        return do_llm_translate.call_args.args[0]
+
+    def test_compact_examples(self):
+        """Test that the prompt shows the placeholders the segments carry"""
+        for prompt in [
+            llm_only_prompt('[{"id": 0, "input": "{1}<b2>x</b2> keeps {v3}"}]'),
+            il_prompt("{1}<b2>x</b2> keeps {v3}"),
+        ]:
+            sent = self.sent_prompt("compact", prompt)
+            instructions, _, text = sent.rpartition("\n\n")
+            with self.subTest(prompt=prompt[-30:]):
+                self.assertNotIn("{v1}", instructions)
+                self.assertNotIn("<style", instructions)
+                self.assertIn("{1}", instructions)
+                self.assertIn("<b1>", instructions)
+                # The texts to translate are sent as they are
+                self.assertIn("{1}<b2>x</b2> keeps {v3}", text)
+        self.assertIn(
+            '"{1}<b2>hello</b2>, world!"',
+            self.sent_prompt("compact", llm_only_prompt("[]")),
+        )
+
+    def test_standard_examples_unchanged(self):
+        for prompt in [llm_only_prompt("[]"), il_prompt("Text.")]:
+            self.assertEqual(self.sent_prompt(None, prompt), prompt)
+
+
+if __name__ == "__main__":
+    unittest.main()
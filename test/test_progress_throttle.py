@@ -0,0 +1,84 @@
+import unittest
+
+from pdf2zh_next.high_level import ProgressThrottle
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def event(event_type, stage="Translate", current=0):
+    return {"type": event_type, "stage": stage, "part_index": 1, "current": current}
+
+
+def summary(events):
+    return [(e["type"], e.get("stage"), e.get("current")) for e in events]
+
+
+class TestProgressThrottle(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.throttle = ProgressThrottle(1.0, clock=self.clock)
+
+    def push_all(self, events, step=0.1):
+        passed = []
+        for e in events:
+            passed += self.throttle.push(e)
+            self.clock.now += step
+        return passed
+
+    def test_updates_passed_once_per_interval(self):
+        passed = self.push_all(
+            [event("progress_update", current=i) for i in range(10)], step=0.25
+        )
+        self.assertEqual(
+            summary(passed),
+            [("progress_update", "Translate", i) for i in (0, 4, 8)],
+        )
+
+    def test_stages_throttled_separately(self):
+        passed = self.push_all(
+            [event("progress_update", "Parse"), event("progress_update", "Translate")]
+        )
+        self.assertEqual(len(passed), 2)
+
+    def test_latest_update_passed_before_other_events(self):
+        passed = self.push_all(
+            [
+                event("progress_update", "Translate", 0),
+                event("progress_update", "Translate", 1),
+                event("progress_update", "Typeset", 0),
+                event("progress_update", "Typeset", 1),
+                event("progress_update", "Typeset", 2),
+                event("progress_end", "Translate", 3),
+                event("finish", None),
+            ]
+        )
+        self.assertEqual(
+            summary(passed),
+            [
+                ("progress_update", "Translate", 0),
+                ("progress_update", "Typeset", 0),
+                ("progress_update", "Typeset", 2),
+                ("progress_end", "Translate", 3),
+                ("finish", None, 0),
+            ],
+        )
+        self.assertEqual(self.throttle.dropped_count, 2)
+
+    def test_other_events_never_held_back(self):
+        events = [
+            event("progress_start"),
+            event("stage_summary"),
+            event("progress_end"),
+            event("error"),
+        ]
+        self.assertEqual(self.push_all(events, step=0), events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from babeldoc.format.pdf.document_il.midend import il_translator_llm_only
+from babeldoc.format.pdf.document_il.midend.il_translator import PROMPT_TEMPLATE
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.translator.base_translator import split_llm_prompt
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.translator_impl.openai import OpenAITranslator
+
+
+def create_translator(layout=True, glossaries=None, custom_system_prompt=None):
+    settings = SettingsModel(
+        translate_engine_settings=OpenAISettings(openai_api_key="key")
+    )
+    settings.translation.prompt_cache_layout = layout
+    settings.translation.glossaries = glossaries
+    settings.translation.custom_system_prompt = custom_system_prompt
+    return OpenAITranslator(settings, QPSRateLimiter(4))
+
+
+def babeldoc_prompt(text, glossary_block="", context_block=""):
+    return PROMPT_TEMPLATE.substitute(
+        role_block="You are a professional Simplified Chinese native translator.",
+        lang_out="Simplified Chinese",
+        glossary_block=glossary_block,
+        context_block=context_block,
+        text_to_translate=text,
+    )
+
+
+def babeldoc_llm_only_prompt(json_input_str, glossary=False, hints=""):
+    glossary_rules = "## Glossary\nAlways use the exact target term.\n\n"
+    glossary_tables = "## Glossary Tables\n\n| a | b |"
+    return il_translator_llm_only.PROMPT_TEMPLATE.substitute(
+        role_block="You are a professional Simplified Chinese native translator.",
+        lang_out="Simplified Chinese",
+        glossary_usage_rules_block=glossary_rules if glossary else "",
+        contextual_hints_block=hints,
+        glossary_tables_block=glossary_tables if glossary else "",
+        json_input_str=json_input_str,
+    )
+
+
+class TestPromptCacheLayout(unittest.TestCase):
+    def test_system_message_identical_across_segments(self):
+        translator = create_translator()
+        first = translator.prompt("First segment.")
+        second = translator.prompt("Second segment.")
+        self.assertEqual(first[0]["role"], "system")
+        self.assertEqual(first[0], second[0])
+        self.assertEqual(first[1], {"role": "user", "content": "First segment."})
+
+    def test_default_layout_unchanged(self):
+        messages = create_translator(layout=False).prompt("Segment.")
+        self.assertEqual(len(messages), 1)
+        self.assertTrue(messages[0]["content"].endswith("Input:\n\nSegment."))
+
+    def test_system_prompt_contains_glossary_and_custom_prompt(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            glossary = Path(tmpdir) / "terms.csv"
+            glossary.write_text(
+                "source,target,tgt_lng\nLLM,大语言模型,zh\ntoken,jeton,fr\n",
+                encoding="utf-8",
+            )
+            translator = create_translator(
+                glossaries=str(glossary), custom_system_prompt="Translate papers."
+            )
+            system = translator.system_prompt()
+        self.assertTrue(system.startswith("Translate papers."))
+        self.assertIn("| LLM | 大语言模型 |", system)
+        # Entries for another target language are left out
+        self.assertNotIn("jeton", system)
+
+    def test_cache_separated_from_default_layout(self):
+        self.assertNotEqual(
+            create_translator().cache.translate_engine_params,
+            create_translator(layout=False).cache.translate_engine_params,
+        )
+
+
+class TestLlmMessages(unittest.TestCase):
+    def test_babeldoc_prompt_split(self):
+        translator = create_translator()
+        first = translator.llm_messages(
+            babeldoc_prompt("First.", glossary_block="## Glossary\n\n| a | b |")
+        )
+        second = translator.llm_messages(babeldoc_prompt("Second."))
+        self.assertEqual([m["role"] for m in first], ["system", "user"])
+        self.assertEqual(first[0], second[0])
+        self.assertIn("## Rules", first[0]["content"])
+        self.assertTrue(first[1]["content"].startswith("## Glossary"))
+        self.assertTrue(second[1]["content"].endswith("Second."))
+
+    def test_babeldoc_llm_only_prompt_split(self):
+        translator = create_translator()
+        first = translator.llm_messages(
+            babeldoc_llm_only_prompt('[{"id": 0, "input": "First."}]', glossary=True)
+        )
+        second = translator.llm_messages(
+            babeldoc_llm_only_prompt(
+                '[{"id": 0, "input": "Second."}]',
+                hints="## Contextual Hints for Better Translation\n1. Title\n",
+            )
+        )
+        self.assertEqual([m["role"] for m in first], ["system", "user"])
+        self.assertEqual(first[0], second[0])
+        self.assertIn("## Structure Rules", first[0]["content"])
+        self.assertIn("## Do NOT Modify", first[0]["content"])
+        self.assertTrue(first[1]["content"].startswith("## Glossary"))
+        self.assertTrue(second[1]["content"].startswith("## Output Format"))
+        self.assertIn("## Contextual Hints", second[1]["content"])
+        self.assertTrue(second[1]["content"].endswith('Second."}]'))
+
+    def test_unknown_prompt_kept_whole(self):
+        self.assertIsNone(split_llm_prompt("Translate this."))
+        messages = create_translator().llm_messages("Translate this.")
+        self.assertEqual(messages, [{"role": "user", "content": "Translate this."}])
+
+    def test_default_layout_single_message(self):
+        prompt = babeldoc_prompt("Text.")
+        messages = create_translator(layout=False).llm_messages(prompt)
+        self.assertEqual(messages, [{"role": "user", "content": prompt}])
+
+
+if __name__ == "__main__":
+    unittest.main()
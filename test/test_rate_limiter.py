@@ -0,0 +1,152 @@
+import multiprocessing
+import threading
+import time
+import unittest
+
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.translator.fingerprint import get_endpoint_key
+from pdf2zh_next.translator.rate_limiter.host_rate_budget import HostRateBudget
+from pdf2zh_next.translator.rate_limiter.shared_qps_rate_limiter import (
+    MAIN_TRANSLATION_PRIORITY,
+)
+from pdf2zh_next.translator.rate_limiter.shared_qps_rate_limiter import (
+    TERM_EXTRACTION_PRIORITY,
+)
+from pdf2zh_next.translator.rate_limiter.shared_qps_rate_limiter import (
+    SharedQPSRateLimiter,
+)
+from pdf2zh_next.translator.utils import get_shared_rate_limiter
+
+
+class TestEndpointKey(unittest.TestCase):
+    def test_model_does_not_affect_key(self):
+        """Test that engines differing only in model share an endpoint"""
+        a = OpenAISettings(openai_model="a", openai_api_key="k", openai_base_url="u")
+        b = OpenAISettings(openai_model="b", openai_api_key="k", openai_base_url="u/")
+        self.assertEqual(get_endpoint_key(a), get_endpoint_key(b))
+
+    def test_account_affects_key(self):
+        """Test that different keys or urls are different endpoints"""
+        a = OpenAISettings(openai_api_key="k1", openai_base_url="u")
+        b = OpenAISettings(openai_api_key="k2", openai_base_url="u")
+        c = OpenAISettings(openai_api_key="k1", openai_base_url="v")
+        self.assertNotEqual(get_endpoint_key(a), get_endpoint_key(b))
+        self.assertNotEqual(get_endpoint_key(a), get_endpoint_key(c))
+        self.assertNotIn("k1", get_endpoint_key(a))
+
+
+class TestSharedQPSRateLimiter(unittest.TestCase):
+    def test_joint_rate(self):
+        """Test that two clients jointly stay within one budget"""
+        limiter = SharedQPSRateLimiter(20)
+        main = limiter.client(MAIN_TRANSLATION_PRIORITY)
+        term = limiter.client(TERM_EXTRACTION_PRIORITY)
+
+        start = time.monotonic()
+        threads = [
+            threading.Thread(target=client.wait)
+            for client in (main, term) * 5
+            for _ in range(2)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 20 requests at 20 qps: the first one is immediate
+        self.assertGreaterEqual(time.monotonic() - start, 19 / 20 - 0.05)
+
+    def test_term_extraction_served_first(self):
+        """Test that waiting term extraction requests overtake main translation"""
+        limiter = SharedQPSRateLimiter(10)
+        limiter.acquire()  # occupy the first slot so that everyone has to wait
+        order = []
+        order_lock = threading.Lock()
+
+        def worker(priority, name):
+            limiter.acquire(priority)
+            with order_lock:
+                order.append(name)
+
+        threads = [
+            threading.Thread(target=worker, args=(MAIN_TRANSLATION_PRIORITY, "main"))
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.02)
+        term_threads = [
+            threading.Thread(target=worker, args=(TERM_EXTRACTION_PRIORITY, "term"))
+            for _ in range(3)
+        ]
+        for t in term_threads:
+            t.start()
+        for t in threads + term_threads:
+            t.join()
+        self.assertEqual(order[-3:], ["main"] * 3)
+
+    def test_registry_keyed_by_endpoint(self):
+        """Test that translators of the same endpoint share the same budget"""
+        main_config = OpenAISettings(
+            openai_model="a", openai_api_key="registry", openai_base_url="u"
+        )
+        term_config = OpenAISettings(
+            openai_model="b", openai_api_key="registry", openai_base_url="u"
+        )
+        main = get_shared_rate_limiter(main_config, 8, MAIN_TRANSLATION_PRIORITY)
+        term = get_shared_rate_limiter(
+            term_config,
+            8,
+            TERM_EXTRACTION_PRIORITY,
+            update_budget=False,
+            client_qps=2,
+        )
+        self.assertIs(main.shared_limiter, term.shared_limiter)
+        self.assertEqual(term.max_qps, 2)
+        self.assertEqual(main.max_qps, 8)
+
+
+def acquire_in_process(host_budget, count, times):
+    limiter = SharedQPSRateLimiter(
+        20, host_budget=host_budget, endpoint_key="OpenAI|u|k"
+    )
+    for _ in range(count):
+        limiter.acquire()
+        times.put(time.monotonic())
+
+
+class TestHostRateBudget(unittest.TestCase):
+    def test_processes_share_endpoint_budget(self):
+        """Test that limiters of different processes jointly keep to one budget"""
+        host_budget = HostRateBudget()
+        times = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=acquire_in_process, args=(host_budget, 5, times)
+            )
+            for _ in range(2)
+        ]
+        for p in processes:
+            p.start()
+        send_times = sorted(times.get(timeout=10) for _ in range(10))
+        for p in processes:
+            p.join()
+        # 10 requests at 20 qps: the first one is immediate
+        self.assertGreaterEqual(send_times[-1] - send_times[0], 9 / 20 - 0.05)
+
+    def test_endpoints_kept_apart(self):
+        host_budget = HostRateBudget()
+        now = time.monotonic()
+        self.assertLessEqual(host_budget.reserve("a", 1.0), now + 0.05)
+        self.assertLessEqual(host_budget.reserve("b", 1.0), now + 0.05)
+        self.assertGreaterEqual(host_budget.reserve("a", 1.0), now + 1.0)
+
+    def test_full_table_falls_back_to_process_budget(self):
+        host_budget = HostRateBudget(capacity=1)
+        host_budget.reserve("a", 10.0)
+        now = time.monotonic()
+        self.assertLessEqual(host_budget.reserve("b", 10.0), now + 0.05)
+        self.assertLessEqual(host_budget.reserve("b", 10.0), now + 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
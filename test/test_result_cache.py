@@ -0,0 +1,177 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from babeldoc.format.pdf.translation_config import TranslateResult
+from pdf2zh_next import high_level
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.result_cache import ResultCache
+from pdf2zh_next.result_cache import get_result_cache_key
+
+
+def create_settings(api_key="key") -> SettingsModel:
+    return SettingsModel(
+        translate_engine_settings=OpenAISettings(openai_api_key=api_key)
+    )
+
+
+class TestResultCacheKey(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.file = self.tmp / "doc.pdf"
+        self.file.write_bytes(b"%PDF-1.7 document")
+        self.key = get_result_cache_key(create_settings(), self.file)
+
+    def test_key_changes_with_document_and_output_settings(self):
+        self.file.write_bytes(b"%PDF-1.7 other document")
+        self.assertNotEqual(
+            get_result_cache_key(create_settings(), self.file), self.key
+        )
+        self.file.write_bytes(b"%PDF-1.7 document")
+
+        settings = create_settings()
+        settings.translation.lang_out = "ja"
+        self.assertNotEqual(get_result_cache_key(settings, self.file), self.key)
+        settings = create_settings()
+        settings.pdf.no_dual = True
+        self.assertNotEqual(get_result_cache_key(settings, self.file), self.key)
+        settings = create_settings()
+        settings.translate_engine_settings.openai_model = "other-model"
+        self.assertNotEqual(get_result_cache_key(settings, self.file), self.key)
+        # Every part extracts its own glossary and only the first has a watermark
+        settings = create_settings()
+        settings.pdf.parallel_parts = 2
+        self.assertNotEqual(get_result_cache_key(settings, self.file), self.key)
+
+    def test_key_ignores_credentials_and_throughput_settings(self):
+        settings = create_settings(api_key="other-key")
+        settings.translation.qps = 20
+        settings.translation.output = str(self.tmp / "elsewhere")
+        settings.translation.worker_processes = 4
+        self.assertEqual(get_result_cache_key(settings, self.file), self.key)
+
+    def test_key_follows_glossary_contents(self):
+        glossary = self.tmp / "glossary.csv"
+        glossary.write_text("source,target\nfoo,bar\n", encoding="utf-8")
+        settings = create_settings()
+        settings.translation.glossaries = str(glossary)
+        key = get_result_cache_key(settings, self.file)
+        glossary.write_text("source,target\nfoo,baz\n", encoding="utf-8")
+        self.assertNotEqual(get_result_cache_key(settings, self.file), key)
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.cache = ResultCache(self.tmp / "cache", max_size=1000)
+        self.translate_count = 0
+
+    def store(self, key: str, size: int = 100, stem: str = "doc"):
+        output = self.tmp / "translated"
+        output.mkdir(exist_ok=True)
+        mono = output / f"{stem}.zh.mono.pdf"
+        mono.write_bytes(b"m" * size)
+        dual = output / f"{stem}.zh.dual.pdf"
+        dual.write_bytes(b"d" * size)
+        result = TranslateResult(mono, dual)
+        result.total_valid_character_count = 42
+        self.cache.store(key, Path(f"{stem}.pdf"), {"translate_result": result})
+
+    def test_outputs_renamed_after_the_document(self):
+        self.store("a" * 64)
+        event = self.cache.load("a" * 64, Path("report.pdf"), self.tmp / "out")
+        result = event["translate_result"]
+        self.assertTrue(event["result_cache_hit"])
+        self.assertEqual(result.mono_pdf_path, self.tmp / "out" / "report.zh.mono.pdf")
+        self.assertEqual(result.dual_pdf_path, self.tmp / "out" / "report.zh.dual.pdf")
+        self.assertEqual(result.no_watermark_mono_pdf_path, result.mono_pdf_path)
+        self.assertIsNone(result.auto_extracted_glossary_path)
+        self.assertEqual(result.dual_pdf_path.read_bytes(), b"d" * 100)
+        self.assertEqual(result.total_valid_character_count, 42)
+
+    def test_missing_and_broken_entries_are_misses(self):
+        self.assertIsNone(self.cache.load("b" * 64, Path("doc.pdf"), self.tmp))
+        self.store("c" * 64)
+        shutil.rmtree(self.tmp / "translated")
+        (self.cache.cache_dir / "cc" / ("c" * 64) / "doc.zh.mono.pdf").unlink()
+        self.assertIsNone(self.cache.load("c" * 64, Path("doc.pdf"), self.tmp))
+        self.assertFalse((self.cache.cache_dir / "cc" / ("c" * 64)).exists())
+
+    def test_least_recently_used_entries_evicted(self):
+        self.cache.max_size = 10**6
+        for i, key in enumerate(("1" * 64, "2" * 64, "3" * 64)):
+            self.store(key)
+            entry_file = self.cache.cache_dir / key[:2] / key / "result.json"
+            os.utime(entry_file, (1000 + i, 1000 + i))
+        # Room for three entries
+        self.cache.max_size = sum(size for _, size, _ in self.cache._entries())
+        # Using the oldest entry makes the second one the least recently used
+        self.cache.load("1" * 64, Path("doc.pdf"), self.tmp / "out")
+        self.store("4" * 64)
+        self.assertIsNotNone(self.cache.load("1" * 64, Path("doc.pdf"), self.tmp))
+        self.assertIsNone(self.cache.load("2" * 64, Path("doc.pdf"), self.tmp))
+        self.assertIsNotNone(self.cache.load("3" * 64, Path("doc.pdf"), self.tmp))
+        self.assertIsNotNone(self.cache.load("4" * 64, Path("doc.pdf"), self.tmp))
+
+    async def fake_translate(self, settings, file):
+        self.translate_count += 1
+        output = Path(settings.translation.output)
+        output.mkdir(parents=True, exist_ok=True)
+        mono = output / f"{file.stem}.zh.mono.pdf"
+        mono.write_bytes(b"translated")
+        yield {
+            "type": "finish",
+            "translate_result": TranslateResult(mono, None),
+            "token_usage": {},
+        }
+
+    def translate(self, settings: SettingsModel, file: Path) -> dict:
+        async def collect():
+            return [
+                event
+                async for event in high_level.do_translate_async_stream(settings, file)
+            ]
+
+        with (
+            mock.patch.object(
+                high_level, "_translate_in_subprocess", self.fake_translate
+            ),
+            mock.patch(
+                "pdf2zh_next.result_cache.DEFAULT_RESULT_CACHE_DIR",
+                self.tmp / "cache",
+            ),
+        ):
+            return asyncio.run(collect())[-1]
+
+    def test_resubmitted_document_not_translated_again(self):
+        file = self.tmp / "doc.pdf"
+        file.write_bytes(b"%PDF-1.7 document")
+        settings = create_settings()
+        settings.translation.output = str(self.tmp / "first")
+        self.assertNotIn("result_cache_hit", self.translate(settings, file))
+
+        settings.translation.output = str(self.tmp / "second")
+        event = self.translate(settings, file)
+        self.assertTrue(event["result_cache_hit"])
+        self.assertEqual(self.translate_count, 1)
+        self.assertEqual(
+            event["translate_result"].mono_pdf_path.read_bytes(), b"translated"
+        )
+
+        settings.translation.ignore_cache = True
+        self.assertNotIn("result_cache_hit", self.translate(settings, file))
+        settings.translation.ignore_cache = False
+        settings.translation.no_result_cache = True
+        self.assertNotIn("result_cache_hit", self.translate(settings, file))
+        self.assertEqual(self.translate_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import DeepLSettings
+from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.segment_classifier import SegmentClassifier
+from pdf2zh_next.translator.segment_classifier import estimate_tokens
+
+PLACEHOLDERS = [
+    r"{\s*v\s*\d+\s*}",
+    r"<\s*style\s*id\s*=\s*'\s*\d+\s*'\s*>",
+    r"<\s*\/\s*style\s*>",
+]
+
+
+class TestSegmentClassifier(unittest.TestCase):
+    def setUp(self):
+        self.en_zh = SegmentClassifier("en", "zh", PLACEHOLDERS)
+
+    def test_untranslatable(self):
+        cases = {
+            "{v1}{v2} {v3}": "placeholder",
+            "<style id='1'>{v4}</style>": "placeholder",
+            "3.14159 ± 0.002 (2019)": "number",
+            "https://example.com/a/b?c=d": "reference",
+            "john.doe@example.org": "reference",
+            "10.1145/3292500.3330701": "reference",
+            "for (i = 0; i < n; i++) { a[i] = b[i]; }": "code",
+            "if (a == b) return c->d;": "code",
+            "int main() { return 0; }": "code",
+            "这是一个已经翻译好的句子。": "target_language",
+        }
+        for text, reason in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(self.en_zh.classify(text), reason)
+
+    def test_translatable(self):
+        for text in [
+            "The model converges after {v1} iterations.",
+            "Figure 3 shows the results of f(x) for small x.",
+            "使用GPU和CUDA进行加速",
+            "Résumé of the method",
+            "It's the author's 'best' work (see [12]).",
+            "Let f(x) = (a+b)*c where x is real",
+            'The "fast" variant [3, 4] uses x_i + y_i = 1; see Eq. (2).',
+            "We check a == b; otherwise, the loop runs until it converges.",
+            "Keywords: machine translation; large language models; PDF layout",
+            "Smith, J.; Doe, K.; Lee, M. Deep learning for documents.",
+            "[12] Vaswani, A.; Shazeer, N. Attention is all you need. In: NIPS; 2017.",
+        ]:
+            with self.subTest(text=text):
+                self.assertIsNone(self.en_zh.classify(text))
+
+    def test_target_language_needs_distinct_scripts(self):
+        """Test that French is not taken for English, nor Chinese for Japanese"""
+        self.assertIsNone(SegmentClassifier("fr", "en").classify("Bonjour le monde"))
+        self.assertIsNone(SegmentClassifier("zh", "ja").classify("机器学习方法"))
+        self.assertEqual(
+            SegmentClassifier("zh", "en").classify("Deep learning methods"),
+            "target_language",
+        )
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens("abcdefgh"), 2)
+        self.assertEqual(estimate_tokens("机器学习"), 4)
+
+
+class EchoTranslator(BaseTranslator):
+    name = "echo"
+
+    def __init__(self, settings, rate_limiter):
+        super().__init__(settings, rate_limiter)
+        self.requests = []
+
+    def do_translate(self, text, rate_limit_params: dict = None):
+        self.requests.append(text)
+        return f"[{text}]"
+
+
+class CountingRateLimiter(QPSRateLimiter):
+    def __init__(self):
+        super().__init__(1000)
+        self.wait_count = 0
+
+    def wait(self, rate_limit_params: dict = None):
+        self.wait_count += 1
+        super().wait(rate_limit_params)
+
+
+class TestSkipUntranslatable(unittest.TestCase):
+    def create_translator(self, **translation_settings):
+        settings = SettingsModel(
+            translate_engine_settings=DeepLSettings(deepl_auth_key="key")
+        )
+        settings.translation.ignore_cache = True
+        settings.translation.lang_out = "zh"
+        for k, v in translation_settings.items():
+            setattr(settings.translation, k, v)
+        return EchoTranslator(settings, CountingRateLimiter())
+
+    def test_skipped_without_request(self):
+        translator = self.create_translator()
+        self.assertEqual(translator.translate("{v1} 42"), "{v1} 42")
+        self.assertEqual(translator.translate("Hello world"), "[Hello world]")
+        self.assertEqual(translator.requests, ["Hello world"])
+        self.assertEqual(translator.rate_limiter.wait_count, 1)
+        self.assertEqual(translator.skipped_segments, {"number": 1})
+        self.assertGreater(translator.skipped_token_count.value, 0)
+        translator.reset_job_counters()
+        self.assertEqual(translator.skipped_segments, {})
+
+    def test_prose_with_symbols_translated(self):
+        """Test that prose with quotes, citations, formulas and lists is not taken for code"""
+        translator = self.create_translator()
+        for text in [
+            "It's the author's 'best' work (see [12]).",
+            "Let f(x) = (a+b)*c where x is real",
+            "Keywords: machine translation; large language models; PDF layout",
+            "Smith, J.; Doe, K.; Lee, M. Deep learning for documents.",
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(translator.translate(text), f"[{text}]")
+        self.assertEqual(translator.skipped_segments, {})
+
+    def test_disabled_per_job(self):
+        translator = self.create_translator(no_skip_untranslatable_segments=True)
+        self.assertEqual(translator.translate("{v1} 42"), "[{v1} 42]")
+
+
+if __name__ == "__main__":
+    unittest.main()
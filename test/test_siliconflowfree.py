@@ -0,0 +1,155 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import SiliconFlowFreeSettings
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.translator_impl.siliconflowfree import EndpointRouter
+from pdf2zh_next.translator.translator_impl.siliconflowfree import (
+    SiliconFlowFreeTranslator,
+)
+
+
+class StandInServer:
+    """Local stand-in for a chatproxy endpoint, answering after a fixed delay."""
+
+    def __init__(self, delay: float, qps: int = 7):
+        self.delay = delay
+        self.qps = qps
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def reply(self, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                stand_in.requests.append(self.path)
+                self.reply({"status": "ok", "qps": stand_in.qps, "max_pool_size": 30})
+
+            def do_POST(self):
+                stand_in.requests.append(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                time.sleep(stand_in.delay)
+                if self.path.endswith("/check"):
+                    self.reply({"status": "ok"})
+                else:
+                    self.reply({"content": f"translated {body['text']}"})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/chatproxy"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestSiliconFlowFreeEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self.temp_dir.name) / "siliconflowfree.json"
+        self.fast = StandInServer(delay=0.01)
+        self.slow = StandInServer(delay=0.2)
+
+    def tearDown(self):
+        self.fast.close()
+        self.slow.close()
+        self.temp_dir.cleanup()
+
+    def create_translator(self, endpoints):
+        class StandInTranslator(SiliconFlowFreeTranslator):
+            server_endpoints = endpoints
+            endpoint_cache_path = self.cache_path
+
+        settings = SettingsModel(translate_engine_settings=SiliconFlowFreeSettings())
+        settings.translation.ignore_cache = True
+        return StandInTranslator(settings, QPSRateLimiter(1))
+
+    def test_selection_cached_on_disk(self):
+        """Test that a second job reuses the endpoint and limits without probing"""
+        endpoints = [self.slow.url, self.fast.url]
+        first = self.create_translator(endpoints)
+        self.assertEqual(first.url, self.fast.url)
+        self.assertEqual(first.rate_limiter.max_qps, 7)
+        self.assertIn("/chatproxy/check", self.slow.requests)
+
+        self.fast.requests.clear()
+        self.slow.requests.clear()
+        second = self.create_translator(endpoints)
+        self.assertEqual(second.url, self.fast.url)
+        self.assertEqual(second.pdf2zh_next_recommended_pool_max_workers, 30)
+        self.assertEqual(second.rate_limiter.max_qps, 7)
+        self.assertEqual(self.fast.requests + self.slow.requests, [])
+
+    def test_cache_invalidated_by_other_endpoints(self):
+        """Test that the cache is only used for the same endpoint list"""
+        self.create_translator([self.slow.url, self.fast.url])
+        self.slow.requests.clear()
+        self.create_translator([self.slow.url])
+        self.assertIn("/chatproxy/check", self.slow.requests)
+
+    def test_route_by_observed_latency(self):
+        """Test that real traffic shifts load to the faster endpoint"""
+        # A stale cache pointing at the slow endpoint
+        self.cache_path.write_text(
+            json.dumps(
+                {
+                    "endpoints": [self.slow.url, self.fast.url],
+                    "url": self.slow.url,
+                    "qps": 7,
+                    "max_pool_size": 30,
+                    "updated_at": time.time(),
+                }
+            )
+        )
+        translator = self.create_translator([self.slow.url, self.fast.url])
+        translator.router.explore_interval = 4
+        for i in range(10):
+            self.assertEqual(translator.do_llm_translate(str(i)), f"translated {i}")
+        self.assertEqual(translator.router.best, self.fast.url)
+        self.assertGreater(
+            self.fast.requests.count("/chatproxy"),
+            self.slow.requests.count("/chatproxy"),
+        )
+        self.assertEqual(json.loads(self.cache_path.read_text())["url"], self.slow.url)
+        translator.end_job()
+        self.assertEqual(json.loads(self.cache_path.read_text())["url"], self.fast.url)
+
+
+class TestEndpointRouter(unittest.TestCase):
+    def test_failing_endpoint_skipped(self):
+        router = EndpointRouter(["a", "b"], cooldown=60)
+        router.record_success("a", 0.1)
+        router.record_success("b", 0.5)
+        self.assertEqual(router.select(), "a")
+        router.record_failure("a")
+        self.assertEqual(router.select(), "b")
+
+    def test_exploration(self):
+        """Test that the slower endpoint still gets occasional requests"""
+        router = EndpointRouter(["a", "b"], explore_interval=5)
+        router.record_success("a", 0.1)
+        router.record_success("b", 0.5)
+        picked = [router.select() for _ in range(20)]
+        self.assertEqual(picked.count("b"), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
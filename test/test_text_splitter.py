@@ -0,0 +1,91 @@
+import threading
+import unittest
+
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import DeepLSettings
+from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.text_splitter import split_text
+
+FORMULAR = r"{\s*v\s*\d+\s*}"
+LEFT = r"<\s*style\s*id\s*=\s*'\s*\d+\s*'\s*>"
+RIGHT = r"<\s*\/\s*style\s*>"
+
+
+def join(chunks):
+    return "".join(chunk + separator for chunk, separator in chunks)
+
+
+class TestSplitText(unittest.TestCase):
+    def test_short_text_unchanged(self):
+        self.assertEqual(split_text("Short.", 10), [("Short.", "")])
+
+    def test_sentence_boundaries(self):
+        text = "First sentence here. Second one follows. Third is last."
+        chunks = split_text(text, 25)
+        self.assertEqual(
+            chunks,
+            [
+                ("First sentence here.", " "),
+                ("Second one follows.", " "),
+                ("Third is last.", ""),
+            ],
+        )
+
+    def test_cjk_sentences(self):
+        text = "这是第一句。这是第二句。这是第三句。"
+        chunks = split_text(text, 8)
+        self.assertEqual(join(chunks), text)
+        self.assertEqual(
+            [c for c, _ in chunks], ["这是第一句。", "这是第二句。", "这是第三句。"]
+        )
+
+    def test_placeholders_kept_whole(self):
+        text = "Value {v12} and <style id='3'>bold text here</style> end of the text"
+        for max_chars in range(12, 40):
+            chunks = split_text(
+                text, max_chars, [FORMULAR, LEFT, RIGHT], [(LEFT, RIGHT)]
+            )
+            self.assertEqual(join(chunks), text)
+            for chunk, _ in chunks:
+                self.assertEqual(chunk.count("{"), chunk.count("}"))
+                self.assertEqual(chunk.count("<"), chunk.count(">"))
+                if max_chars >= len("<style id='3'>bold text here</style>"):
+                    self.assertEqual(chunk.count("<style"), chunk.count("</style>"))
+
+    def test_hard_cut_without_boundaries(self):
+        chunks = split_text("x" * 25, 10)
+        self.assertEqual([c for c, _ in chunks], ["x" * 10, "x" * 10, "x" * 5])
+
+
+class ChunkedTranslator(BaseTranslator):
+    name = "chunked"
+    max_chars_per_request = 30
+
+    def __init__(self, settings, rate_limiter):
+        super().__init__(settings, rate_limiter)
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def do_translate(self, text, rate_limit_params: dict = None):
+        assert len(text) <= self.max_chars_per_request
+        with self.lock:
+            self.requests.append(text)
+        return text.upper()
+
+
+class TestChunkedTranslation(unittest.TestCase):
+    def test_long_text_translated_in_chunks(self):
+        """Test that a long text is translated in full instead of truncated"""
+        settings = SettingsModel(
+            translate_engine_settings=DeepLSettings(deepl_auth_key="key")
+        )
+        settings.translation.ignore_cache = True
+        translator = ChunkedTranslator(settings, QPSRateLimiter(100))
+        text = " ".join(f"Sentence number {i} with {{v{i}}}." for i in range(10))
+        self.assertEqual(translator.translate(text), text.upper())
+        self.assertEqual(len(translator.requests), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import threading
+import time
+import unittest
+
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.translator.base_translator import HEDGE_MIN_SAMPLES
+from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.circuit_breaker import CircuitOpenError
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+
+
+class StubTranslator(BaseTranslator):
+    name = "stub"
+
+    def __init__(self, api_key, delays=None, fail=False, **translation_settings):
+        settings = SettingsModel(
+            translate_engine_settings=OpenAISettings(openai_api_key=api_key)
+        )
+        settings.translation.ignore_cache = True
+        settings.translation.circuit_breaker_threshold = 2
+        settings.translation.circuit_breaker_cooldown = 60
+        for k, v in translation_settings.items():
+            setattr(settings.translation, k, v)
+        super().__init__(settings, QPSRateLimiter(1000))
+        self.delays = list(delays or [])
+        self.fail = fail
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def do_translate(self, text, rate_limit_params: dict = None):
+        with self.lock:
+            self.calls += 1
+            delay = self.delays.pop(0) if self.delays else 0
+        time.sleep(delay)
+        if self.fail:
+            raise ConnectionError
+        return f"{self.api_key_tag}:{text}"
+
+    @property
+    def api_key_tag(self):
+        return self.circuit_breaker.endpoint_key.rsplit("|", 1)[1][:4]
+
+
+class TestFailover(unittest.TestCase):
+    def test_failover_after_circuit_opens(self):
+        """Test that requests continue on the failover engine once the circuit opens"""
+        primary = StubTranslator("failover-primary", fail=True)
+        secondary = StubTranslator("failover-secondary")
+        primary.failover_translators = [secondary]
+
+        with self.assertRaises(ConnectionError):
+            primary.translate("Hello")
+        # The request that opens the circuit is already served by the failover engine
+        self.assertEqual(primary.translate("Hello"), secondary.translate("Hello"))
+        self.assertTrue(primary.circuit_breaker.is_open)
+        self.assertTrue(primary.is_available())
+
+        self.assertEqual(primary.translate("Hello"), secondary.translate("Hello"))
+        self.assertEqual(primary.calls, 2)
+        self.assertEqual(primary.failover_request_count, 2)
+
+    def test_no_failover_configured(self):
+        """Test that an open circuit is reported when there is no failover engine"""
+        primary = StubTranslator("failover-alone", fail=True)
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                primary.translate("Hello")
+        self.assertFalse(primary.is_available())
+        with self.assertRaises(CircuitOpenError):
+            primary.translate("Hello")
+
+
+class TestHedging(unittest.TestCase):
+    def test_slow_request_is_hedged(self):
+        """Test that a request slower than p95 is duplicated and the first result wins"""
+        delays = [0.01] * HEDGE_MIN_SAMPLES + [2]
+        primary = StubTranslator("hedge-primary", delays=delays, hedge_requests=True)
+        for _ in range(HEDGE_MIN_SAMPLES):
+            primary.translate("Hello")
+
+        start = time.monotonic()
+        primary.translate("Hello")
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(primary.hedged_request_count, 1)
+        self.assertEqual(primary.calls, HEDGE_MIN_SAMPLES + 2)
+
+    def test_hedge_goes_to_failover_engine(self):
+        """Test that the duplicate request goes to the failover engine if configured"""
+        delays = [0.01] * HEDGE_MIN_SAMPLES + [2]
+        primary = StubTranslator("hedge-main", delays=delays, hedge_requests=True)
+        secondary = StubTranslator("hedge-secondary")
+        primary.failover_translators = [secondary]
+        for _ in range(HEDGE_MIN_SAMPLES):
+            primary.translate("Hello")
+
+        self.assertEqual(primary.translate("Hello"), secondary.translate("Hello"))
+        self.assertEqual(primary.hedged_request_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
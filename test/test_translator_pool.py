@@ -0,0 +1,126 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from babeldoc.utils.atomic_integer import AtomicInteger
+from pdf2zh_next.config.model import SettingsModel
+from pdf2zh_next.config.translate_engine_model import OpenAISettings
+from pdf2zh_next.result_cache import get_settings_digest
+from pdf2zh_next.translator.base_translator import BaseTranslator
+from pdf2zh_next.translator.fingerprint import get_translator_fingerprint
+from pdf2zh_next.translator.rate_limiter.qps_rate_limiter import QPSRateLimiter
+from pdf2zh_next.translator.translator_pool import TranslatorPool
+
+
+class CountingTranslator(BaseTranslator):
+    name = "counting"
+
+    def __init__(self, settings):
+        super().__init__(settings, QPSRateLimiter(100))
+        self.token_count = AtomicInteger()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+    def do_translate(self, text, rate_limit_params: dict = None):
+        self.token_count.inc(len(text))
+        return text
+
+
+def create_settings(**translation):
+    settings = SettingsModel(
+        translate_engine_settings=OpenAISettings(openai_api_key="pool")
+    )
+    for k, v in translation.items():
+        setattr(settings.translation, k, v)
+    return settings
+
+
+class TestTranslatorFingerprint(unittest.TestCase):
+    def test_job_only_settings_ignored(self):
+        """Test that job-only settings do not change the fingerprint"""
+        with tempfile.TemporaryDirectory() as tmp:
+            a = create_settings(output=str(Path(tmp) / "a"), glossaries="a.csv")
+            b = create_settings(output=str(Path(tmp) / "b"), glossaries="b.csv")
+        self.assertEqual(
+            get_translator_fingerprint(a, a.translate_engine_settings),
+            get_translator_fingerprint(b, b.translate_engine_settings),
+        )
+
+    def test_translator_settings_respected(self):
+        """Test that languages, engine settings and role change the fingerprint"""
+        a = create_settings()
+        b = create_settings(lang_out="ja")
+        c = create_settings()
+        c.translate_engine_settings.openai_model = "other"
+        fingerprints = {
+            get_translator_fingerprint(a, a.translate_engine_settings),
+            get_translator_fingerprint(b, b.translate_engine_settings),
+            get_translator_fingerprint(c, c.translate_engine_settings),
+            get_translator_fingerprint(a, a.translate_engine_settings, "term"),
+        }
+        self.assertEqual(len(fingerprints), 4)
+
+    def test_performance_settings_respected(self):
+        """Test that settings of the requests change the fingerprint, not the result cache"""
+        a = create_settings()
+        b = create_settings(qps=16)
+        self.assertNotEqual(
+            get_translator_fingerprint(a, a.translate_engine_settings),
+            get_translator_fingerprint(b, b.translate_engine_settings),
+        )
+        self.assertEqual(get_settings_digest(a), get_settings_digest(b))
+
+
+class TestTranslatorPool(unittest.TestCase):
+    def test_reuse_with_fresh_counters(self):
+        """Test that a released translator is reused with its job counters reset"""
+        pool = TranslatorPool()
+        settings = create_settings(ignore_cache=True)
+
+        translator, reused = pool.checkout("fp", lambda: CountingTranslator(settings))
+        self.assertFalse(reused)
+        translator.translate("Hello")
+        self.assertEqual(translator.token_count.value, 5)
+
+        # Checked out translators are never handed out twice
+        other, reused = pool.checkout("fp", lambda: CountingTranslator(settings))
+        self.assertFalse(reused)
+        self.assertIsNot(other, translator)
+
+        pool.release(translator, ttl=60)
+        again, reused = pool.checkout("fp", lambda: CountingTranslator(settings))
+        self.assertTrue(reused)
+        self.assertIs(again, translator)
+        self.assertEqual(again.token_count.value, 0)
+        self.assertEqual(again.translate_call_count, 0)
+
+    def test_idle_translator_evicted(self):
+        """Test that idle translators are evicted after their TTL"""
+        pool = TranslatorPool()
+        settings = create_settings()
+        translator, _ = pool.checkout("fp", lambda: CountingTranslator(settings))
+        pool.release(translator, ttl=0.05)
+        time.sleep(0.06)
+        again, reused = pool.checkout("fp", lambda: CountingTranslator(settings))
+        self.assertFalse(reused)
+        self.assertIsNot(again, translator)
+        self.assertTrue(translator.closed)
+        self.assertFalse(again.closed)
+
+    def test_cleared_translators_closed(self):
+        """Test that clearing the pool closes the idle translators"""
+        pool = TranslatorPool()
+        settings = create_settings()
+        translator, _ = pool.checkout("fp", lambda: CountingTranslator(settings))
+        pool.release(translator, ttl=60)
+        self.assertFalse(translator.closed)
+        pool.clear()
+        self.assertTrue(translator.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import logging
+import os
+import queue
+import time
+import unittest
+
+from pdf2zh_next.worker_pool import WorkerExitedError
+from pdf2zh_next.worker_pool import WorkerPool
+
+
+def send_pid(channel):
+    logging.getLogger("pdf2zh_next.test").warning("running in %d", os.getpid())
+    channel.send({"type": "pid", "pid": os.getpid()})
+    channel.send(None)
+
+
+def crash(_channel, code):
+    os._exit(code)
+
+
+def hang(_channel, seconds):
+    time.sleep(seconds)
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = WorkerPool()
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def run_job(self) -> int:
+        """Run a job on a worker of the pool, return the pid it ran in."""
+        worker = self.pool.acquire()
+        messages = queue.Queue()
+        worker.submit(send_pid, on_message=messages.put)
+        pid = messages.get(timeout=5)["pid"]
+        self.assertIsNone(messages.get(timeout=5))
+        self.assertTrue(worker.wait_job(timeout=5))
+        self.pool.release(worker, reusable=True)
+        return pid
+
+    def test_worker_reused(self):
+        self.pool.configure(size=1, max_tasks=None)
+        pids = {self.run_job() for _ in range(3)}
+        self.assertEqual(len(pids), 1)
+        self.assertEqual(self.pool.started_count, 1)
+        self.assertEqual(self.pool.reused_count, 2)
+
+    def test_worker_replaced_after_max_tasks(self):
+        self.pool.configure(size=1, max_tasks=2)
+        pids = [self.run_job() for _ in range(3)]
+        self.assertEqual(pids[0], pids[1])
+        self.assertNotEqual(pids[1], pids[2])
+        self.assertEqual(self.pool.started_count, 2)
+
+    def test_new_process_per_job_without_idle_workers(self):
+        self.pool.configure(size=0, max_tasks=None)
+        self.assertNotEqual(self.run_job(), self.run_job())
+        self.assertEqual(self.pool.idle, [])
+
+    def test_concurrent_jobs_get_own_workers(self):
+        self.pool.configure(size=1, max_tasks=None)
+        first = self.pool.acquire()
+        second = self.pool.acquire()
+        self.assertNotEqual(first.pid, second.pid)
+        self.pool.release(first, reusable=True)
+        self.pool.release(second, reusable=True)
+        # Only one worker is kept idle
+        self.assertEqual(len(self.pool.idle), 1)
+        self.assertFalse(second.is_alive())
+
+    def test_worker_logs_forwarded(self):
+        self.pool.configure(size=1, max_tasks=None)
+        with self.assertLogs("pdf2zh_next.worker_pool", level="WARNING") as logs:
+            pid = self.run_job()
+        self.assertIn(f"running in {pid}", logs.output[0])
+
+    def test_crashed_worker_not_reused(self):
+        self.pool.configure(size=1, max_tasks=None)
+        worker = self.pool.acquire()
+        messages = queue.Queue()
+        worker.submit(crash, 3, on_message=messages.put)
+        error = messages.get(timeout=5)
+        self.assertIsInstance(error, WorkerExitedError)
+        self.assertEqual(error.exit_code, 3)
+        self.assertFalse(worker.wait_job(timeout=1))
+        self.assertEqual(worker.exitcode, 3)
+        self.pool.release(worker, reusable=False)
+        self.assertEqual(self.pool.idle, [])
+        self.assertNotEqual(self.run_job(), worker.pid)
+
+    def test_unfinished_job_killed(self):
+        self.pool.configure(size=1, max_tasks=None)
+        worker = self.pool.acquire()
+        worker.submit(hang, 60)
+        self.assertFalse(worker.wait_job(timeout=0.2))
+        self.pool.release(worker, reusable=False)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(self.pool.idle, [])
+
+
+if __name__ == "__main__":
+    unittest.main()